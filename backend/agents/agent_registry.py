@@ -0,0 +1,143 @@
+"""
+Agent and LLM client registry for the Social CM Orchestrator Suite
+Building an agent creates its ChatOpenAI client, prompt template and
+AgentExecutor, and every ChatOpenAI client opens its own HTTP connections.
+The API keeps one registry for the application lifespan: agents are built
+once, on first use, and every LLM client shares one pooled HTTP client.
+The shared agents keep no per-request state; startup context is passed to
+their methods.
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from agents.logger_config import setup_logger
+from agents.strategy_agent_v2 import StrategyAgentV2
+from agents.orchestrator_agent_v2 import OrchestratorAgentV2
+from landing_page_analyzer import LandingPageAnalyzer
+
+logger = setup_logger("agents.agent_registry", "INFO")
+
+DEFAULT_BASE_URL = "https://api.blackbox.ai/v1"
+DEFAULT_MODEL = "blackboxai/openai/gpt-4o"
+
+
+def create_llm(temperature: float, http_client: Optional[httpx.Client] = None) -> ChatOpenAI:
+    """
+    Create an LLM client for the configured model
+
+    Args:
+        temperature: Sampling temperature
+        http_client: HTTP client to send requests with (a new one per client if None)
+
+    Returns:
+        ChatOpenAI client
+    """
+    return ChatOpenAI(
+        api_key=os.getenv("BLACKBOX_API_KEY"),
+        base_url=os.getenv("BLACKBOX_BASE_URL", DEFAULT_BASE_URL),
+        model=os.getenv("BLACKBOX_MODEL", DEFAULT_MODEL),
+        temperature=temperature,
+        http_client=http_client,
+    )
+
+
+class AgentRegistry:
+    """Reusable, thread-safe agents and LLM clients"""
+
+    def __init__(self, max_connections: int = 20):
+        """
+        Initialize the registry (agents are built on first use)
+
+        Args:
+            max_connections: Size of the HTTP connection pool shared by the LLM clients
+        """
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(120.0, connect=10.0)
+        )
+        self._lock = threading.Lock()
+        self._llms: Dict[float, ChatOpenAI] = {}
+        self._strategy_agent: Optional[StrategyAgentV2] = None
+        self._orchestrator_agent: Optional[OrchestratorAgentV2] = None
+        self._landing_page_analyzer: Optional[LandingPageAnalyzer] = None
+
+    def llm(self, temperature: float) -> ChatOpenAI:
+        """
+        Get the shared LLM client for a temperature
+
+        Args:
+            temperature: Sampling temperature
+
+        Returns:
+            ChatOpenAI client using the shared HTTP connection pool
+        """
+        with self._lock:
+            if temperature not in self._llms:
+                self._llms[temperature] = create_llm(temperature, self.http_client)
+            return self._llms[temperature]
+
+    @property
+    def landing_page_analyzer(self) -> LandingPageAnalyzer:
+        """Shared landing page analyzer"""
+        if self._landing_page_analyzer is None:
+            llm = self.llm(0.3)
+            with self._lock:
+                if self._landing_page_analyzer is None:
+                    self._landing_page_analyzer = LandingPageAnalyzer(llm=llm)
+        return self._landing_page_analyzer
+
+    @property
+    def strategy_agent(self) -> StrategyAgentV2:
+        """Shared strategy agent"""
+        if self._strategy_agent is None:
+            llm = self.llm(0.7)
+            analyzer = self.landing_page_analyzer
+            with self._lock:
+                if self._strategy_agent is None:
+                    self._strategy_agent = StrategyAgentV2(llm=llm, landing_page_analyzer=analyzer)
+        return self._strategy_agent
+
+    @property
+    def orchestrator_agent(self) -> OrchestratorAgentV2:
+        """Shared orchestrator agent"""
+        if self._orchestrator_agent is None:
+            with self._lock:
+                if self._orchestrator_agent is None:
+                    self._orchestrator_agent = OrchestratorAgentV2()
+        return self._orchestrator_agent
+
+    def warm(self) -> bool:
+        """
+        Build the agents now, off the request path
+
+        Returns:
+            True if every agent was built (failures, e.g. a missing API key, are
+            logged and retried on first use)
+        """
+        try:
+            self.orchestrator_agent
+            self.strategy_agent
+            return True
+        except Exception as e:
+            logger.warning(f"Could not build the agents at startup: {str(e)}")
+            return False
+
+    def close(self):
+        """Close the pooled HTTP connections"""
+        self.http_client.close()
+
+
+# Singleton instance
+_registry_instance = None
+
+def get_agent_registry() -> AgentRegistry:
+    """Get agent registry singleton instance"""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = AgentRegistry(max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", 20)))
+    return _registry_instance
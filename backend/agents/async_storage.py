@@ -0,0 +1,88 @@
+"""
+Async facade over the storage backend for the FastAPI endpoints
+Runs blocking database and file I/O on a bounded executor instead of the event loop
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+
+from agents.storage_backend import StorageBackend
+
+# Calls that scan many rows or files (analytics, maintenance). They run on
+# their own small pool so they cannot hold every worker of the main one.
+SLOW_METHODS = frozenset({
+    'aggregate_performance', 'get_metrics_series', 'cleanup_old_data', 'rebuild_mirrors'
+})
+
+
+class AsyncStorage:
+    """Awaitable wrapper around a storage backend (see agents.storage_backend)
+
+    Every public backend method is available as a coroutine with the
+    same signature, e.g. ``await async_storage.get_active_plan(brand)``.
+    Calls run on a dedicated thread pool, so at most ``max_workers`` storage
+    operations (and pooled database connections) are active at once and the
+    event loop stays free for other requests. Slow calls (SLOW_METHODS) queue
+    on a separate pool of ``slow_workers`` threads instead, so light reads do
+    not wait behind a burst of analytics requests.
+    """
+
+    def __init__(self, storage: StorageBackend, max_workers: int = 8, slow_workers: int = 2,
+                 slow_methods: Iterable[str] = SLOW_METHODS):
+        """
+        Initialize the facade
+
+        Args:
+            storage: Storage backend to wrap
+            max_workers: Maximum number of concurrent storage calls
+            slow_workers: Maximum number of concurrent slow calls (on top of max_workers)
+            slow_methods: Names of the backend methods run on the slow pool
+        """
+        self.storage = storage
+        self.max_workers = max_workers
+        self.slow_methods = frozenset(slow_methods)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="storage"
+        )
+        self._slow_executor = ThreadPoolExecutor(
+            max_workers=slow_workers,
+            thread_name_prefix="storage-slow"
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the storage executor
+
+        Args:
+            func: Callable to run
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            The callable's return value
+        """
+        return await self._submit(self._executor, func, *args, **kwargs)
+
+    async def _submit(self, executor: ThreadPoolExecutor, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.storage, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        executor = self._slow_executor if name in self.slow_methods else self._executor
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self._submit(executor, attr, *args, **kwargs)
+
+        return method
+
+    def shutdown(self, wait: bool = True):
+        """Stop the executors, waiting for in-flight calls by default"""
+        self._slow_executor.shutdown(wait=wait)
+        self._executor.shutdown(wait=wait)
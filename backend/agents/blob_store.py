@@ -0,0 +1,130 @@
+"""
+Content-addressed blob store for generated images
+Blobs are keyed by SHA-256 and sharded into ab/cd/ subdirectories
+"""
+
+import os
+import base64
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple, Union
+
+# Base64 characters decoded per step (multiple of 4, ~192 KB of output)
+DECODE_CHUNK_CHARS = 256 * 1024
+
+
+def iter_base64_chunks(data: Union[str, Iterable[str]],
+                       chunk_chars: int = DECODE_CHUNK_CHARS) -> Iterator[bytes]:
+    """
+    Decode base64 incrementally
+
+    Args:
+        data: Base64 string (optionally a data: URL) or an iterable of string chunks
+        chunk_chars: Slice size used when data is a single string
+
+    Yields:
+        Decoded byte chunks
+    """
+    if isinstance(data, str):
+        text = data.split(',', 1)[1] if data.startswith('data:') else data
+        chunks = (text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars))
+    else:
+        chunks = data
+
+    carry = ''
+    for chunk in chunks:
+        chunk = carry + ''.join(chunk.split())
+        usable = len(chunk) - len(chunk) % 4
+        if usable:
+            yield base64.b64decode(chunk[:usable])
+        carry = chunk[usable:]
+
+    if carry:
+        yield base64.b64decode(carry + '=' * (-len(carry) % 4))
+
+
+class BlobStore:
+    """Filesystem store where a blob's path is derived from its SHA-256
+
+    Identical content is stored once. Writes go to a temporary file while the
+    digest is computed and are then atomically moved into place. Reference
+    counts live in the database (see StorageManager), not here.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Initialize the blob store
+
+        Args:
+            root: Root directory of the store
+        """
+        self.root = Path(root)
+        self.tmp_path = self.root / "tmp"
+        self.tmp_path.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, digest: str, ext: str = ".png") -> Path:
+        """Get the sharded path of a blob (root/ab/cd/abcd....ext)"""
+        return self.root / digest[:2] / digest[2:4] / f"{digest}{ext}"
+
+    def put_stream(self, chunks: Iterable[bytes], ext: str = ".png") -> Tuple[str, int, Path]:
+        """
+        Store a blob from a stream of byte chunks
+
+        Args:
+            chunks: Byte chunks of the blob
+            ext: File extension
+
+        Returns:
+            Tuple of (sha256 hex digest, size in bytes, blob path)
+        """
+        digest = hashlib.sha256()
+        size = 0
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_path, suffix=ext)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+
+            path = self.path_for(digest.hexdigest(), ext)
+            if path.exists() and path.stat().st_size == size:
+                # Already stored, keep the existing copy
+                os.unlink(tmp_name)
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        return digest.hexdigest(), size, path
+
+    def put_base64(self, data: Union[str, Iterable[str]], ext: str = ".png") -> Tuple[str, int, Path]:
+        """
+        Store a base64-encoded blob, decoding it chunk by chunk
+
+        Args:
+            data: Base64 string or iterable of string chunks
+            ext: File extension
+
+        Returns:
+            Tuple of (sha256 hex digest, size in bytes, blob path)
+        """
+        return self.put_stream(iter_base64_chunks(data), ext)
+
+    def delete(self, digest: str, ext: str = ".png") -> bool:
+        """
+        Delete a blob file
+
+        Returns:
+            True if a file was removed
+        """
+        try:
+            self.path_for(digest, ext).unlink()
+            return True
+        except FileNotFoundError:
+            return False
@@ -0,0 +1,299 @@
+"""
+Streaming bulk export of posts, metrics and calendar posts
+Reads rows in keyset-paginated chunks and encodes them to NDJSON or Parquet
+chunk by chunk, so memory use does not grow with the size of the history
+"""
+
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+class ExportTable(BaseModel):
+    """Exported columns of a table and the cursor incremental exports resume from"""
+    name: str = Field(description="Table name")
+    cursor: str = Field(description="Column that only grows for new rows (keyset and watermark)")
+    columns: Dict[str, str] = Field(description="Exported columns and their types (string, int64, float64, bool)")
+
+
+EXPORT_TABLES: Dict[str, ExportTable] = {
+    table.name: table for table in [
+        # Replaced posts get a new export_seq: keep the row with the highest one per id
+        ExportTable(name="posted_content", cursor="export_seq", columns={
+            "export_seq": "int64", "id": "string", "date": "string", "platform": "string",
+            "post_id": "string", "content_hash": "string", "content": "string",
+            "posted_at": "string", "success": "bool", "error": "string", "brand_name": "string",
+        }),
+        ExportTable(name="performance_metrics", cursor="id", columns={
+            "id": "int64", "post_id": "string", "platform": "string", "measured_at": "string",
+            "impressions": "int64", "engagements": "int64", "clicks": "int64", "shares": "int64",
+            "comments": "int64", "likes": "int64", "engagement_rate": "float64",
+        }),
+        ExportTable(name="calendar_posts", cursor="id", columns={
+            "id": "int64", "plan_id": "string", "brand_name": "string", "date": "string",
+            "platform": "string", "position": "int64", "pillar": "string", "topic": "string",
+            "post_json": "string",
+        }),
+    ]
+}
+
+EXPORT_FORMATS = {
+    "ndjson": {"extension": ".ndjson", "media_type": "application/x-ndjson"},
+    "parquet": {"extension": ".parquet", "media_type": "application/vnd.apache.parquet"},
+}
+
+
+def parse_watermark(token: Optional[str]) -> Dict[str, int]:
+    """
+    Parse a watermark token ('<shard>:<cursor>,...', empty for a full export)
+
+    Returns:
+        Last exported cursor value per shard
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    marks = {}
+    for part in filter(None, (token or "").split(",")):
+        shard, _, value = part.strip().rpartition(":")
+        if not shard or not value.isdigit():
+            raise ValueError(f"Invalid watermark '{token}', expected <shard>:<cursor>[,...]")
+        marks[shard] = int(value)
+    return marks
+
+
+def format_watermark(marks: Dict[str, int]) -> str:
+    """Format per-shard cursor values as a watermark token"""
+    return ",".join(f"{shard}:{value}" for shard, value in sorted(marks.items()))
+
+
+class _ByteSink:
+    """Write-only file object whose bytes are handed out between Parquet row groups"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class StreamingExporter:
+    """Exports storage tables in chunks, optionally only rows after a watermark
+
+    Every export first records the current maximum cursor of each shard; rows
+    are then read in cursor order up to that snapshot, one short read per
+    chunk, so concurrent writes neither block nor get half-exported. The
+    snapshot is the watermark to pass as ``since`` to the next export.
+    """
+
+    def __init__(self, storage, chunk_size: int = 1000):
+        """
+        Initialize the exporter
+
+        Args:
+            storage: StorageManager to read (every shard is exported)
+            chunk_size: Rows read, encoded and emitted at a time
+        """
+        self.storage = storage
+        self.chunk_size = chunk_size
+
+    def get_table(self, table: str) -> ExportTable:
+        """Get an exportable table by name"""
+        try:
+            return EXPORT_TABLES[table]
+        except KeyError:
+            raise ValueError(f"Invalid export table '{table}', expected one of {list(EXPORT_TABLES)}")
+
+    def snapshot(self, table: str) -> Dict[str, int]:
+        """
+        Get the highest cursor value of a table in every shard
+
+        Returns:
+            Cursor value per shard (0 for empty shards)
+        """
+        spec = self.get_table(table)
+        marks = {}
+        for shard in self.storage.shards.keys():
+            with self.storage._get_db(shard=shard) as conn:
+                marks[shard] = conn.execute(
+                    f"SELECT COALESCE(MAX({spec.cursor}), 0) FROM {spec.name}"
+                ).fetchone()[0]
+        return marks
+
+    def iter_chunks(self, table: str, since: Dict[str, int], until: Dict[str, int],
+                    select: str) -> Iterator[List[tuple]]:
+        """
+        Read the rows of a table between two watermarks
+
+        Args:
+            table: Table name
+            since: Last cursor already exported per shard (missing shards start at 0)
+            until: Highest cursor to export per shard (see snapshot)
+            select: Result columns after the cursor, which is always selected first
+
+        Yields:
+            Lists of at most chunk_size row tuples, in cursor order per shard
+        """
+        spec = self.get_table(table)
+        for shard, last in until.items():
+            position = since.get(shard, 0)
+            while position < last:
+                # A connection is only held while one chunk is read
+                with self.storage._get_db(shard=shard) as conn:
+                    rows = conn.execute(f"""
+                        SELECT {spec.cursor}, {select} FROM {spec.name}
+                        WHERE {spec.cursor} > ? AND {spec.cursor} <= ?
+                        ORDER BY {spec.cursor} LIMIT ?
+                    """, (position, last, self.chunk_size)).fetchall()
+                if not rows:
+                    break
+                position = rows[-1][0]
+                yield rows
+
+    def export(self, table: str, export_format: str = "ndjson", since: Optional[str] = None,
+               stats: Optional[Dict[str, int]] = None) -> Tuple[Dict[str, int], Iterator[bytes]]:
+        """
+        Start an export (arguments are validated before any data is read)
+
+        Args:
+            table: One of EXPORT_TABLES
+            export_format: One of EXPORT_FORMATS
+            since: Watermark of the previous export (None exports every row)
+            stats: Optional dict whose 'rows' count is updated as chunks are read
+
+        Returns:
+            Tuple of (watermark of this export, iterator of encoded byte chunks)
+
+        Raises:
+            ValueError: If the table, format or watermark is invalid
+            ImportError: If Parquet is requested and pyarrow is not installed
+        """
+        self.get_table(table)
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Invalid export format '{export_format}', expected one of {list(EXPORT_FORMATS)}")
+        if export_format == "parquet" and pa is None:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+
+        marks = parse_watermark(since)
+        # Shards with nothing past their mark (including emptied ones) keep the old mark
+        until = {shard: value for shard, value in self.snapshot(table).items()
+                 if value > marks.get(shard, 0)}
+        watermark = {**marks, **until}
+
+        if stats is not None:
+            stats.setdefault('rows', 0)
+        if export_format == "parquet":
+            return watermark, self._iter_parquet(table, marks, until, stats)
+        return watermark, self._iter_ndjson(table, marks, until, stats)
+
+    def _iter_ndjson(self, table: str, since: Dict[str, int], until: Dict[str, int],
+                     stats: Optional[Dict[str, int]]) -> Iterator[bytes]:
+        """Encode chunks as newline-delimited JSON (each line is built by SQLite)"""
+        fields = []
+        for name, kind in self.get_table(table).columns.items():
+            value = name
+            if kind == "bool":
+                value = f"json(CASE WHEN {name} IS NULL THEN 'null' WHEN {name} THEN 'true' ELSE 'false' END)"
+            fields.append(f"'{name}', {value}")
+
+        for rows in self.iter_chunks(table, since, until, f"json_object({', '.join(fields)})"):
+            if stats is not None:
+                stats['rows'] += len(rows)
+            yield ("\n".join(row[1] for row in rows) + "\n").encode("utf-8")
+
+    def _iter_parquet(self, table: str, since: Dict[str, int], until: Dict[str, int],
+                      stats: Optional[Dict[str, int]]) -> Iterator[bytes]:
+        """Encode chunks as row groups of one Parquet file"""
+        columns = self.get_table(table).columns
+        types = {"string": pa.string(), "int64": pa.int64(), "float64": pa.float64(), "bool": pa.bool_()}
+        schema = pa.schema([(name, types[kind]) for name, kind in columns.items()])
+
+        sink = _ByteSink()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+        try:
+            for rows in self.iter_chunks(table, since, until, ", ".join(columns)):
+                if stats is not None:
+                    stats['rows'] += len(rows)
+                arrays = []
+                for index, (name, kind) in enumerate(columns.items(), start=1):
+                    values = [row[index] for row in rows]
+                    if kind == "bool":
+                        values = [None if value is None else bool(value) for value in values]
+                    arrays.append(pa.array(values, type=types[kind]))
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    def export_to_file(self, table: str, output_dir: Path, export_format: str = "ndjson",
+                       since: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Export a table to a new file in a directory
+
+        The file is written under a temporary name and renamed when complete.
+
+        Args:
+            table: One of EXPORT_TABLES
+            output_dir: Directory receiving <table>_<timestamp><extension>
+            export_format: One of EXPORT_FORMATS
+            since: Watermark of the previous export (None exports every row)
+
+        Returns:
+            Path (None when there were no new rows), rows, bytes and the new watermark
+        """
+        stats = {'rows': 0}
+        watermark, chunks = self.export(table, export_format, since, stats=stats)
+        if watermark == parse_watermark(since):
+            return {'path': None, 'rows': 0, 'bytes': 0, 'watermark': format_watermark(watermark)}
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        extension = EXPORT_FORMATS[export_format]['extension']
+        path = output_dir / f"{table}_{datetime.now().strftime('%Y%m%dT%H%M%S')}{extension}"
+
+        fd, tmp_name = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for data in chunks:
+                    f.write(data)
+                    size += len(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        return {'path': str(path), 'rows': stats['rows'], 'bytes': size,
+                'watermark': format_watermark(watermark)}
@@ -23,6 +23,8 @@ from agents.models import (
     Platform
 )
 from agents.image_utils import generate_and_incorporate_image
+from agents.storage import get_storage
+from agents.near_duplicates import check_near_duplicate
 
 load_dotenv()
 
@@ -270,6 +272,19 @@ class FacebookAgent:
         # Create the post
         generated_post = self.create_post(content_package)
 
+        # Do not publish a near-repeat of a recent post of this brand
+        posting_result, duplicates = check_near_duplicate(
+            get_storage(), generated_post.content, Platform.FACEBOOK,
+            content_package.brand_name, content_package.date
+        )
+        if posting_result:
+            return {
+                "generated_post": generated_post.dict(),
+                "posting_result": posting_result.dict(),
+                "success": False,
+                "near_duplicates": duplicates
+            }
+
         # Post to Facebook
         posting_result = self.post_to_facebook(generated_post)
 
@@ -0,0 +1,238 @@
+"""
+Background jobs for the Social CM Orchestrator Suite
+Long tasks (strategy generation, daily orchestration runs) are stored as job
+records, then run on a bounded worker pool, optionally with a per-key limit
+(e.g. one orchestration run per brand) enforced by the storage when a worker
+claims a job, so it holds across processes and hosts. Handlers report their stage and
+progress to the record, which clients poll, and stop at their next progress
+report once cancelled. Records survive a restart: jobs that were running when
+a worker stopped sending heartbeats are queued again and re-run.
+"""
+
+import os
+import uuid
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from agents.models import Job, JobStatus
+from agents.logger_config import setup_logger
+
+logger = setup_logger("agents.jobs", "INFO")
+
+# Reports the current stage, completion percentage and optional details of a running job;
+# raises JobCancelled once the job was cancelled
+ProgressCallback = Callable[..., None]
+# Runs a job: takes the job request and a progress callback, returns the job result
+JobHandler = Callable[[Dict[str, Any], ProgressCallback], Dict[str, Any]]
+# Gives the concurrency key of a job request (e.g. its brand)
+ConcurrencyKey = Callable[[Dict[str, Any]], str]
+
+FINISHED_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised by the progress callback of a job whose cancellation was requested"""
+
+
+class JobManager:
+    """Runs stored jobs on a bounded thread pool"""
+
+    def __init__(self, storage, max_workers: int = 2, heartbeat_seconds: float = 10.0):
+        """
+        Initialize the job manager
+
+        Args:
+            storage: Storage backend holding the job records
+            max_workers: Maximum number of jobs running at once in this process
+            heartbeat_seconds: Time between heartbeats; running jobs without a heartbeat
+                for three intervals are considered abandoned and queued again
+        """
+        self.storage = storage
+        self.max_workers = max_workers
+        self.heartbeat_seconds = heartbeat_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._limits: Dict[str, Tuple[ConcurrencyKey, int]] = {}
+        # Running jobs: ID -> (future, concurrency key or None)
+        self._running: Dict[str, Tuple[Any, Optional[str]]] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, kind: str, handler: JobHandler, concurrency_key: Optional[ConcurrencyKey] = None,
+                 max_per_key: int = 1):
+        """
+        Register the handler of a job type
+
+        Args:
+            kind: Job type
+            handler: Function running jobs of this type
+            concurrency_key: Gives the key of a job request; at most max_per_key jobs of
+                this type with the same key run at once, across all workers sharing the
+                storage (optional)
+            max_per_key: Maximum number of running jobs per key
+        """
+        self._handlers[kind] = handler
+        if concurrency_key:
+            self._limits[kind] = (concurrency_key, max_per_key)
+        else:
+            self._limits.pop(kind, None)
+
+    def submit(self, kind: str, request: Dict[str, Any]) -> Job:
+        """
+        Store a new job and start it if a worker is free
+
+        Args:
+            kind: Job type (must be registered)
+            request: Job input (JSON-serializable)
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If no handler is registered for the job type
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job type: {kind}")
+        now = datetime.now().isoformat()
+        key = self._limits[kind][0](request) if kind in self._limits else None
+        job = Job(id=uuid.uuid4().hex, kind=kind, request=request, concurrency_key=key,
+                  created_at=now, updated_at=now)
+        self.storage.create_job(job)
+        logger.info(f"Job {job.id} ({kind}) queued")
+        self.dispatch()
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job: a queued job never runs, a running one stops at its next progress report
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            The job after the request, or None if it does not exist
+        """
+        job = self.storage.cancel_job(job_id)
+        if job and job.cancel_requested:
+            logger.info(f"Job {job_id} cancellation requested ({job.status.value})")
+        return job
+
+    def start(self):
+        """Start the worker pool and the maintenance thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self._thread = threading.Thread(target=self._loop, name="jobs", daemon=True)
+        self._thread.start()
+        logger.info(f"Job manager started ({self.max_workers} workers, owner {self.owner})")
+
+    def stop(self, timeout: float = 30.0):
+        """
+        Stop taking new jobs and wait for running ones to finish
+
+        Jobs still running after the timeout keep their record and are queued again
+        once their heartbeats are stale.
+
+        Args:
+            timeout: Maximum time to wait for running jobs
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        if self._executor:
+            with self._lock:
+                running = [future for future, _ in self._running.values()]
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            wait(running, timeout)
+
+    def dispatch(self) -> int:
+        """
+        Claim queued jobs while workers are free
+
+        Returns:
+            Number of jobs started
+        """
+        if not self._executor or self._stop.is_set():
+            return 0
+        started = 0
+        with self._lock:
+            free = self.max_workers - len(self._running)
+            if free <= 0:
+                return 0
+            per_key: Dict[Tuple[str, str], int] = {}
+            for _, key in self._running.values():
+                if key:
+                    per_key[key] = per_key.get(key, 0) + 1
+            # Jobs held back by their key limit are skipped, so look further than the free slots
+            for job in self.storage.list_jobs(status=JobStatus.QUEUED, limit=free + 100):
+                if started >= free:
+                    break
+                if job.kind not in self._handlers:
+                    continue
+                max_per_key = self._limits[job.kind][1] if job.kind in self._limits else 1
+                key = (job.kind, job.concurrency_key) if job.concurrency_key else None
+                if key and per_key.get(key, 0) >= max_per_key:
+                    # At the limit in this process already, no need to ask the storage
+                    continue
+                claimed = self.storage.claim_job(job.id, self.owner, max_per_key)
+                if not claimed:
+                    # Claimed by another worker in the meantime, or its key is at the
+                    # limit with jobs running on other workers
+                    continue
+                self._running[claimed.id] = (self._executor.submit(self._run, claimed), key)
+                if key:
+                    per_key[key] = per_key.get(key, 0) + 1
+                started += 1
+        return started
+
+    def _run(self, job: Job):
+        """Run one claimed job and record its outcome"""
+        logger.info(f"Job {job.id} ({job.kind}) started, attempt {job.attempts}")
+
+        def progress(stage: str, percent: int, details: Optional[Dict[str, Any]] = None):
+            self.storage.update_job(job.id, stage=stage, progress=percent, details=details, owner=self.owner)
+            if percent >= 100:
+                # The work is done, too late to cancel it
+                return
+            current = self.storage.get_job(job.id)
+            if current and current.cancel_requested:
+                raise JobCancelled(f"Job {job.id} was cancelled")
+
+        try:
+            result = self._handlers[job.kind](job.request, progress)
+            self.storage.update_job(job.id, status=JobStatus.SUCCEEDED, stage="done", progress=100,
+                                    result=result or {}, owner=self.owner)
+            logger.info(f"Job {job.id} succeeded")
+        except JobCancelled:
+            logger.info(f"Job {job.id} cancelled")
+            self.storage.update_job(job.id, status=JobStatus.CANCELLED, owner=self.owner)
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {str(e)}", exc_info=True)
+            self.storage.update_job(job.id, status=JobStatus.FAILED, error=str(e), owner=self.owner)
+        finally:
+            with self._lock:
+                self._running.pop(job.id, None)
+            self.dispatch()
+
+    def _loop(self):
+        while True:
+            try:
+                with self._lock:
+                    running = list(self._running)
+                if running:
+                    self.storage.heartbeat_jobs(running, self.owner)
+                stale_before = datetime.now() - timedelta(seconds=3 * self.heartbeat_seconds)
+                requeued = self.storage.requeue_stale_jobs(stale_before.isoformat())
+                if requeued:
+                    logger.warning(f"Requeued {requeued} abandoned job(s)")
+                self.dispatch()
+            except Exception as e:
+                logger.error(f"Job maintenance failed: {str(e)}", exc_info=True)
+            if self._stop.wait(self.heartbeat_seconds):
+                return
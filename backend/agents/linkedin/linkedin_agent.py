@@ -23,6 +23,9 @@ from .linkedin_tools import (
     save_linkedin_post
 )
 from ..image_utils import generate_and_incorporate_image
+from ..models import Platform
+from ..storage import get_storage
+from ..near_duplicates import check_near_duplicate
 
 load_dotenv()
 
@@ -271,7 +274,9 @@ class LinkedinAgent:
         post_type: str = "transformation",
         auto_post: bool = False,
         startup_name: Optional[str] = None,
-        startup_url: Optional[str] = None
+        startup_url: Optional[str] = None,
+        brand_name: Optional[str] = None,
+        post_date: Optional[str] = None
     ) -> Dict:
         """
         Create a viral post and optionally post it to LinkedIn
@@ -282,6 +287,8 @@ class LinkedinAgent:
             auto_post: Whether to automatically post to LinkedIn
             startup_name: Override startup name for this post
             startup_url: Override startup URL for this post
+            brand_name: Brand the post is published for (near-duplicate check scope)
+            post_date: Date the post is published for, YYYY-MM-DD (defaults to today)
 
         Returns:
             Dictionary with complete results
@@ -300,10 +307,18 @@ class LinkedinAgent:
         # Add hashtags to the post content
         final_content = post_result["post_content"] + "\n\n" + " ".join(post_result["hashtags"])
 
-        # Post to LinkedIn if requested
+        # Post to LinkedIn if requested, unless it repeats a recent post of the brand
         if auto_post:
-            posting_result = self.post_to_linkedin_platform(final_content)
-            post_result["posting_result"] = posting_result
+            blocked, duplicates = check_near_duplicate(
+                get_storage(), final_content, Platform.LINKEDIN, brand_name,
+                post_date or datetime.now().strftime("%Y-%m-%d")
+            )
+            if blocked:
+                post_result["near_duplicates"] = duplicates
+                post_result["posting_result"] = blocked.dict()
+            else:
+                posting_result = self.post_to_linkedin_platform(final_content)
+                post_result["posting_result"] = posting_result
 
         # Display results
         print("\n" + "="*60)
@@ -0,0 +1,71 @@
+"""
+Bloom filter for fast negative answers to idempotency checks
+A negative is definitive; a positive must be confirmed against the database
+"""
+
+import math
+import hashlib
+import threading
+from typing import Dict, Any, Iterable
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys
+
+    Keys cannot be removed. When more keys than ``capacity`` are added the
+    false-positive rate degrades (``is_saturated``) and the owner should
+    rebuild it from the database with a larger capacity.
+    """
+
+    def __init__(self, capacity: int = 10000, error_rate: float = 0.01):
+        """
+        Initialize the filter
+
+        Args:
+            capacity: Expected number of keys
+            error_rate: Target false-positive rate at capacity
+        """
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str):
+        """Add a key"""
+        positions = self._positions(key)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def update(self, keys: Iterable[str]):
+        """Add many keys"""
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def is_saturated(self) -> bool:
+        """Whether more keys than the capacity were added"""
+        return self.count > self.capacity
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size and fill statistics"""
+        return {
+            'keys': self.count,
+            'capacity': self.capacity,
+            'bits': self.num_bits,
+            'hashes': self.num_hashes
+        }
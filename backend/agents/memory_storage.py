@@ -0,0 +1,990 @@
+"""
+In-memory storage backend for the Social CM Orchestrator Suite
+Keeps every table in process dictionaries; meant for tests, benchmarks and
+local runs where nothing has to survive a restart
+"""
+
+import json
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import List, Dict, Optional, Any, Iterable, Tuple
+
+from agents.blob_store import iter_base64_chunks
+from agents.model_loading import load_json
+from agents.metric_rollups import COUNTERS, merge_series
+from agents.near_duplicates import minhash, similarity
+from agents.storage_backend import summarize_checkpoints, summarize_performance, yesterday_performance
+from agents.models import (
+    MonthlyPlan,
+    PostRecord,
+    PerformanceMetrics,
+    OrchestratorState,
+    CheckpointStatus,
+    PostCheckpoint,
+    Job,
+    JobStatus,
+    Platform,
+    DailyPost
+)
+
+
+class InMemoryStorage:
+    """StorageBackend holding plans, posts, metrics, runs, state and images in memory
+
+    Follows the same semantics as StorageManager with sharding and mirrors
+    off. One lock serializes all operations. Returned plans are shared with
+    the store and must be treated as read-only.
+    """
+
+    def __init__(self):
+        """Initialize empty tables"""
+        self._lock = threading.RLock()
+
+        # Plans: every version is kept, the brand's latest one is active
+        self._plans: Dict[str, Dict[str, Any]] = {}
+        self._brand_versions: Dict[str, List[str]] = {}
+
+        # Posts, keyed by record ID, with the unique (date, platform) and content hash lookups
+        self._posts: Dict[str, Dict[str, Any]] = {}
+        self._by_slot: Dict[tuple, str] = {}
+        self._by_hash: Dict[str, str] = {}
+
+        # Metrics samples, unique per (post_id, measured_at)
+        self._metrics: Dict[tuple, PerformanceMetrics] = {}
+        self._latest_metrics: Dict[str, PerformanceMetrics] = {}
+
+        self._runs: Dict[str, Dict[str, Any]] = {}
+        self._states: Dict[str, str] = {}
+        # Post checkpoints by (run_date, brand_name), then (platform, slot)
+        self._checkpoints: Dict[tuple, Dict[tuple, PostCheckpoint]] = {}
+        # Jobs by ID, with the worker owning each running job and its last heartbeat
+        self._jobs: Dict[str, Job] = {}
+        self._job_owners: Dict[str, Optional[str]] = {}
+        self._job_heartbeats: Dict[str, str] = {}
+
+        # Image bytes by SHA-256 and the records referencing them
+        self._images: Dict[str, Dict[str, Any]] = {}
+        self._post_images: Dict[str, set] = {}
+
+    def close(self):
+        """Nothing to release"""
+
+    # Strategy Management
+    def save_monthly_plan(self, plan: MonthlyPlan) -> str:
+        """
+        Save a monthly plan as the brand's new active version
+
+        Args:
+            plan: Monthly plan to save
+
+        Returns:
+            Plan ID
+        """
+        plan_id = f"plan_{plan.brand_name}_{plan.calendar.start_date}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+        with self._lock:
+            versions = self._brand_versions.setdefault(plan.brand_name, [])
+            versions.append(plan_id)
+            self._plans[plan_id] = {
+                'plan': plan.model_copy(deep=True),
+                'version': len(versions),
+                'created_at': datetime.now().isoformat()
+            }
+
+        return plan_id
+
+    def get_active_plan(self, brand_name: str) -> Optional[MonthlyPlan]:
+        """
+        Get the active monthly plan for a brand
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            Active monthly plan or None
+        """
+        plan_id = self.get_active_plan_id(brand_name)
+        return self.get_plan(plan_id) if plan_id else None
+
+    def get_active_plan_version(self, brand_name: str) -> Tuple[int, Optional[str]]:
+        """
+        Get the version of a brand's active plan without loading it (changes whenever a plan is saved)
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            (version, plan ID), or (0, None) if the brand has no versioned plan
+        """
+        with self._lock:
+            versions = self._brand_versions.get(brand_name)
+            return (len(versions), versions[-1]) if versions else (0, None)
+
+    def get_active_plan_id(self, brand_name: str) -> Optional[str]:
+        """
+        Get the ID of the active monthly plan for a brand
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            Active plan ID or None
+        """
+        with self._lock:
+            versions = self._brand_versions.get(brand_name)
+            return versions[-1] if versions else None
+
+    def get_daily_posts(self, brand_name: str, target_date: str,
+                        platforms: Optional[List[Platform]] = None) -> List[DailyPost]:
+        """
+        Get posts scheduled for a specific date
+
+        Args:
+            brand_name: Brand name
+            target_date: Target date (YYYY-MM-DD)
+            platforms: Optional platform filter
+
+        Returns:
+            List of daily posts
+        """
+        plan = self.get_active_plan(brand_name)
+        if plan is None:
+            return []
+
+        wanted = {platform.value for platform in platforms} if platforms else None
+        return [
+            post.model_copy(deep=True) for post in plan.calendar.posts
+            if post.date == target_date and (wanted is None or post.platform.value in wanted)
+        ]
+
+    def get_plan(self, plan_id: str) -> Optional[MonthlyPlan]:
+        """
+        Get a monthly plan by ID, active or superseded
+
+        Args:
+            plan_id: Plan ID
+
+        Returns:
+            Monthly plan or None
+        """
+        with self._lock:
+            entry = self._plans.get(plan_id)
+        return entry['plan'].model_copy(deep=True) if entry else None
+
+    def get_plan_at_version(self, brand_name: str, version: int) -> Optional[MonthlyPlan]:
+        """
+        Get a brand's plan as it was at a given version
+
+        Args:
+            brand_name: Brand name
+            version: Plan version (see list_plan_versions)
+
+        Returns:
+            Monthly plan or None if the version does not exist
+        """
+        with self._lock:
+            versions = self._brand_versions.get(brand_name, [])
+            if not 1 <= version <= len(versions):
+                return None
+            return self._plans[versions[version - 1]]['plan'].model_copy(deep=True)
+
+    def list_plan_versions(self, brand_name: str) -> List[Dict[str, Any]]:
+        """
+        List the plan versions of a brand
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            Versions, newest first (every version is a full snapshot)
+        """
+        with self._lock:
+            versions = self._brand_versions.get(brand_name, [])
+            return [
+                {
+                    'version': self._plans[plan_id]['version'],
+                    'plan_id': plan_id,
+                    'kind': 'snapshot',
+                    'base_version': self._plans[plan_id]['version'],
+                    'plan_format': None,
+                    'size': None,
+                    'created_at': self._plans[plan_id]['created_at']
+                }
+                for plan_id in reversed(versions)
+            ]
+
+    def warm_plan_cache(self) -> int:
+        """
+        Plans are never evicted; returns the number of active plans
+
+        Returns:
+            Number of brands with an active plan
+        """
+        with self._lock:
+            return len(self._brand_versions)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get the number of stored rows per table"""
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'plans': len(self._plans),
+                'posts': len(self._posts),
+                'metrics': len(self._metrics),
+                'runs': len(self._runs),
+                'states': len(self._states),
+                'images': len(self._images)
+            }
+
+    # Idempotency and Deduplication
+    def has_been_posted(self, date: str, platform: Platform) -> bool:
+        """
+        Check if content has already been posted for a date/platform (by any brand)
+
+        Args:
+            date: Date (YYYY-MM-DD)
+            platform: Platform
+
+        Returns:
+            True if already posted
+        """
+        with self._lock:
+            record_id = self._by_slot.get((date, platform.value))
+            return record_id is not None and self._posts[record_id]['record'].posting_result.success
+
+    def get_content_hash(self, content: str) -> str:
+        """
+        Generate hash for content deduplication
+
+        Args:
+            content: Content to hash
+
+        Returns:
+            Content hash
+        """
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def is_duplicate_content(self, content: str) -> bool:
+        """
+        Check if content is duplicate
+
+        Args:
+            content: Content to check
+
+        Returns:
+            True if duplicate
+        """
+        with self._lock:
+            return self.get_content_hash(content) in self._by_hash
+
+    def find_near_duplicates(self, content: str, brand_name: Optional[str] = None,
+                             platform: Optional[Platform] = None, days: int = 30,
+                             threshold: float = 0.5, limit: int = 5,
+                             reference_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find recently posted content similar to a text
+
+        Compares the MinHash signature with every post of the brand in the
+        look-back window (brand_name=None only matches posts recorded without
+        a brand).
+
+        Args:
+            content: Text about to be posted
+            brand_name: Brand the post belongs to
+            platform: Restrict matches to one platform (optional)
+            days: Look-back window in days
+            threshold: Minimum estimated Jaccard similarity of character 4-grams (0-1)
+            limit: Maximum number of matches
+            reference_date: End of the look-back window (defaults to today)
+
+        Returns:
+            Matches (record_id, post_id, platform, date, similarity), most similar first
+        """
+        signature = minhash(content)
+        end = datetime.strptime(reference_date, '%Y-%m-%d') if reference_date else datetime.now()
+        since = (end - timedelta(days=days)).strftime('%Y-%m-%d')
+
+        with self._lock:
+            candidates = [entry for entry in self._posts.values()
+                          if entry['signature'] and entry['brand_name'] == brand_name
+                          and entry['record'].date >= since]
+
+        matches = []
+        for entry in candidates:
+            record = entry['record']
+            if platform and record.platform != platform:
+                continue
+            score = similarity(signature, entry['signature'])
+            if score >= threshold:
+                matches.append({
+                    'record_id': record.id,
+                    'post_id': record.post_id,
+                    'platform': record.platform.value,
+                    'date': record.date,
+                    'similarity': score
+                })
+
+        matches.sort(key=lambda match: match['similarity'], reverse=True)
+        return matches[:limit]
+
+    # Post Recording
+    def record_post(self, record: PostRecord, brand_name: Optional[str] = None) -> bool:
+        """
+        Record a posted content, replacing posts with the same ID, date/platform or content hash
+
+        Args:
+            record: Post record
+            brand_name: Brand the post was published for (scopes near-duplicate lookups)
+
+        Returns:
+            Success status
+        """
+        content = record.generated_post.content
+        slot = (record.date, record.platform.value)
+
+        with self._lock:
+            for replaced in {record.id, self._by_slot.get(slot), self._by_hash.get(record.content_hash)}:
+                if replaced in self._posts:
+                    self._delete_post(replaced, keep_images=replaced == record.id)
+
+            self._posts[record.id] = {
+                'record': record.model_copy(deep=True),
+                'brand_name': brand_name,
+                'signature': minhash(content) if content else None
+            }
+            self._by_slot[slot] = record.id
+            self._by_hash[record.content_hash] = record.id
+
+        # Reference the post's image so it is kept until the post is deleted
+        if record.generated_post.image_base64:
+            self.save_image(record.generated_post.image_base64, record.platform,
+                            record.date, record_id=record.id, brand_name=brand_name)
+
+        return True
+
+    def _delete_post(self, record_id: str, keep_images: bool = False):
+        """Remove a post and its lookups (caller holds the lock)"""
+        record = self._posts.pop(record_id)['record']
+        self._by_slot.pop((record.date, record.platform.value), None)
+        self._by_hash.pop(record.content_hash, None)
+        if not keep_images:
+            self._post_images.pop(record_id, None)
+
+    def get_posted_content(self, start_date: str, end_date: str,
+                           platform: Optional[Platform] = None) -> List[PostRecord]:
+        """
+        Get posted content for a date range
+
+        Args:
+            start_date: Start date
+            end_date: End date
+            platform: Optional platform filter
+
+        Returns:
+            List of post records, newest first
+        """
+        with self._lock:
+            records = [entry['record'] for entry in self._posts.values()
+                       if start_date <= entry['record'].date <= end_date
+                       and (platform is None or entry['record'].platform == platform)]
+
+        records.sort(key=lambda record: (record.date, record.posting_result.timestamp or ''), reverse=True)
+        return [record.model_copy(deep=True) for record in records]
+
+    # Performance Metrics
+    def save_metrics(self, metrics: PerformanceMetrics) -> bool:
+        """
+        Save performance metrics
+
+        Args:
+            metrics: Performance metrics
+
+        Returns:
+            Success status
+        """
+        self.save_metrics_bulk([metrics])
+        return True
+
+    def save_metrics_bulk(self, metrics: Iterable[PerformanceMetrics],
+                          batch_size: int = 500,
+                          write_files: Optional[bool] = None) -> Dict[str, int]:
+        """
+        Save many performance metrics
+
+        Samples already stored for the same (post_id, measured_at) are skipped.
+
+        Args:
+            metrics: Performance metrics to save
+            batch_size: Number of samples stored per lock acquisition
+            write_files: Ignored (there are no mirror files)
+
+        Returns:
+            Counts of received, inserted and duplicate samples
+        """
+        stats = {'received': 0, 'inserted': 0, 'duplicates': 0}
+        iterator = iter(metrics)
+
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            stats['received'] += len(batch)
+
+            with self._lock:
+                for sample in batch:
+                    key = (sample.post_id, sample.measured_at)
+                    if key in self._metrics:
+                        continue
+                    self._metrics[key] = sample.model_copy()
+                    latest = self._latest_metrics.get(sample.post_id)
+                    if latest is None or sample.measured_at > latest.measured_at:
+                        self._latest_metrics[sample.post_id] = self._metrics[key]
+                    stats['inserted'] += 1
+
+        stats['duplicates'] = stats['received'] - stats['inserted']
+        return stats
+
+    def get_metrics(self, post_id: str) -> List[PerformanceMetrics]:
+        """
+        Get metrics for a post
+
+        Args:
+            post_id: Post ID
+
+        Returns:
+            List of performance metrics, newest first
+        """
+        with self._lock:
+            samples = [sample.model_copy() for (sample_post_id, _), sample in self._metrics.items()
+                       if sample_post_id == post_id]
+        samples.sort(key=lambda sample: sample.measured_at, reverse=True)
+        return samples
+
+    def aggregate_performance(self, start_date: str, end_date: str,
+                              platforms: Optional[List[Platform]] = None) -> Dict[str, Any]:
+        """
+        Aggregate post counts and the latest metrics sample of each post for a date range
+
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            platforms: Optional platform filter
+
+        Returns:
+            Totals and per-platform breakdown
+        """
+        wanted = set(platforms) if platforms else None
+        rows: Dict[str, Dict[str, Any]] = {}
+
+        with self._lock:
+            for entry in self._posts.values():
+                record = entry['record']
+                if not start_date <= record.date <= end_date or (wanted and record.platform not in wanted):
+                    continue
+
+                row = rows.setdefault(record.platform.value, {'platform': record.platform.value,
+                                                               'posts': 0, 'successful': 0,
+                                                               'posts_with_metrics': 0,
+                                                               **{counter: 0 for counter in COUNTERS}})
+                row['posts'] += 1
+                row['successful'] += int(record.posting_result.success)
+                latest = self._latest_metrics.get(record.post_id)
+                if latest is not None:
+                    row['posts_with_metrics'] += 1
+                    for counter in COUNTERS:
+                        row[counter] += getattr(latest, counter)
+
+        return summarize_performance(start_date, end_date, rows.values())
+
+    def get_metrics_series(self, start_date: str, end_date: str, interval: str = 'day',
+                           brand_name: Optional[str] = None,
+                           platform: Optional[Platform] = None) -> Dict[str, Any]:
+        """
+        Get a metrics time series computed from the stored samples
+
+        Each point sums, over the posts measured in its bucket, the latest
+        sample of every post within the bucket.
+
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), inclusive
+            interval: Point spacing: 'hour', 'day' or 'week'
+            brand_name: Optional brand filter
+            platform: Optional platform filter
+
+        Returns:
+            Interval, resolution read ('raw') and the series points
+        """
+        end = f"{end_date}T23:59:59"
+
+        with self._lock:
+            brands = {entry['record'].post_id: entry['brand_name'] for entry in self._posts.values()}
+            rows = [
+                {
+                    'post_id': sample.post_id,
+                    'bucket_start': sample.measured_at,
+                    'last_measured_at': sample.measured_at,
+                    'samples': 1,
+                    **{counter: getattr(sample, counter) for counter in COUNTERS}
+                }
+                for sample in self._metrics.values()
+                if start_date <= sample.measured_at <= end
+                and (not brand_name or brands.get(sample.post_id) == brand_name)
+                and (platform is None or sample.platform == platform)
+            ]
+
+        return {
+            'start_date': start_date,
+            'end_date': end_date,
+            'interval': interval,
+            'resolution': 'raw',
+            'points': merge_series(rows, interval)
+        }
+
+    def get_yesterday_performance(self, brand_name: str) -> Dict[str, Any]:
+        """
+        Get yesterday's performance summary
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            Performance summary
+        """
+        return yesterday_performance(self)
+
+    # Orchestrator State
+    def save_orchestrator_state(self, state: OrchestratorState) -> bool:
+        """
+        Save orchestrator state
+
+        Args:
+            state: Orchestrator state
+
+        Returns:
+            Success status
+        """
+        with self._lock:
+            self._states[state.current_date] = state.model_dump_json()
+        return True
+
+    def get_orchestrator_state(self, date: str) -> Optional[OrchestratorState]:
+        """
+        Get orchestrator state for a date
+
+        Args:
+            date: Date (YYYY-MM-DD)
+
+        Returns:
+            Orchestrator state or None
+        """
+        with self._lock:
+            state_json = self._states.get(date)
+        return load_json(OrchestratorState, state_json) if state_json else None
+
+    def record_orchestrator_run(self, date: str, posts_attempted: int,
+                               posts_succeeded: int, posts_failed: int,
+                               errors: Optional[List[str]] = None) -> bool:
+        """
+        Record an orchestrator run
+
+        Args:
+            date: Run date
+            posts_attempted: Number of posts attempted
+            posts_succeeded: Number of successful posts
+            posts_failed: Number of failed posts
+            errors: List of errors
+
+        Returns:
+            Success status
+        """
+        with self._lock:
+            self._runs[date] = {
+                'run_date': date,
+                'completed_at': datetime.now().isoformat(),
+                'posts_attempted': posts_attempted,
+                'posts_succeeded': posts_succeeded,
+                'posts_failed': posts_failed,
+                'errors': json.dumps(errors) if errors else None
+            }
+        return True
+
+    def has_run_today(self, date: str) -> bool:
+        """
+        Check if orchestrator has run today
+
+        Args:
+            date: Date to check
+
+        Returns:
+            True if already run
+        """
+        with self._lock:
+            return date in self._runs
+
+    # Post Checkpoints
+    def start_checkpoints(self, brand_name: str, run_date: str,
+                          slots: Iterable[Tuple[Platform, int]],
+                          reset: bool = False) -> List[PostCheckpoint]:
+        """
+        Create pending checkpoints for a brand's scheduled posts of a day
+
+        Args:
+            brand_name: Brand name
+            run_date: Execution date (YYYY-MM-DD)
+            slots: (platform, index among the platform's posts of the day) of each post
+            reset: Set the given slots back to pending, even posted ones (forced re-run)
+
+        Returns:
+            Every checkpoint of the brand for the day, ordered by platform and slot
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            day = self._checkpoints.setdefault((run_date, brand_name), {})
+            for platform, slot in slots:
+                existing = day.get((platform.value, slot))
+                if existing is None or reset:
+                    day[(platform.value, slot)] = PostCheckpoint(
+                        run_date=run_date, brand_name=brand_name, platform=platform, slot=slot,
+                        attempts=existing.attempts if existing else 0, updated_at=now
+                    )
+            return [checkpoint.model_copy() for _, checkpoint in sorted(day.items())]
+
+    def update_checkpoint(self, brand_name: str, run_date: str, platform: Platform, slot: int,
+                          status: CheckpointStatus, post_id: Optional[str] = None,
+                          post_url: Optional[str] = None, error: Optional[str] = None) -> bool:
+        """
+        Move a scheduled post to another pipeline stage
+
+        Args:
+            brand_name: Brand name
+            run_date: Execution date (YYYY-MM-DD)
+            platform: Platform of the post
+            slot: Index among the platform's posts of the day
+            status: New status (moving to generating counts an attempt)
+            post_id: Platform post ID (kept when None)
+            post_url: URL of the posted content (kept when None)
+            error: Error of a failed attempt (cleared otherwise)
+
+        Returns:
+            True if the checkpoint exists
+        """
+        with self._lock:
+            day = self._checkpoints.get((run_date, brand_name), {})
+            checkpoint = day.get((platform.value, slot))
+            if checkpoint is None:
+                return False
+            day[(platform.value, slot)] = checkpoint.model_copy(update={
+                'status': status,
+                'attempts': checkpoint.attempts + int(status == CheckpointStatus.GENERATING),
+                'post_id': post_id or checkpoint.post_id,
+                'post_url': post_url or checkpoint.post_url,
+                'error': error,
+                'updated_at': datetime.now().isoformat()
+            })
+        return True
+
+    def get_checkpoint_summary(self, brand_name: str, run_date: str) -> Dict[str, Any]:
+        """
+        Count a brand's scheduled posts of a day per status
+
+        Args:
+            brand_name: Brand name
+            run_date: Execution date (YYYY-MM-DD)
+
+        Returns:
+            Total and per-status counts (0 everywhere before the first run) and last_update
+        """
+        with self._lock:
+            checkpoints = list(self._checkpoints.get((run_date, brand_name), {}).values())
+        return summarize_checkpoints((checkpoint.status.value, 1, checkpoint.updated_at)
+                                     for checkpoint in checkpoints)
+
+    # Jobs
+    def create_job(self, job: Job) -> bool:
+        """
+        Store a new job
+
+        Args:
+            job: Job to store (usually queued)
+
+        Returns:
+            Success status
+        """
+        with self._lock:
+            self._jobs[job.id] = job.model_copy(deep=True)
+            self._job_owners[job.id] = None
+        return True
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        Get a job by ID
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job or None
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy(deep=True) if job else None
+
+    def list_jobs(self, status: Optional[JobStatus] = None, limit: int = 100) -> List[Job]:
+        """
+        List jobs, oldest first
+
+        Args:
+            status: Only jobs with this status (optional)
+            limit: Maximum number of jobs
+
+        Returns:
+            Jobs ordered by submission time
+        """
+        with self._lock:
+            jobs = sorted((job for job in self._jobs.values() if status is None or job.status == status),
+                          key=lambda job: job.created_at)
+            return [job.model_copy(deep=True) for job in jobs[:limit]]
+
+    def claim_job(self, job_id: str, owner: str, max_per_key: int = 1) -> Optional[Job]:
+        """
+        Atomically move a queued job to running for one worker
+
+        Args:
+            job_id: Job ID
+            owner: Worker identifier, required by later updates and heartbeats
+            max_per_key: Maximum number of running jobs of the same type and
+                concurrency key, across all workers (jobs without a key are not limited)
+
+        Returns:
+            The claimed job, or None if it was not queued (e.g. claimed by another
+            worker) or its key is at the limit
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != JobStatus.QUEUED:
+                return None
+            if job.concurrency_key is not None:
+                running = sum(1 for other in self._jobs.values()
+                              if other.kind == job.kind and other.concurrency_key == job.concurrency_key
+                              and other.status == JobStatus.RUNNING)
+                if running >= max_per_key:
+                    return None
+            job = self._jobs[job_id] = job.model_copy(update={
+                'status': JobStatus.RUNNING, 'attempts': job.attempts + 1, 'updated_at': now
+            })
+            self._job_owners[job_id] = owner
+            self._job_heartbeats[job_id] = now
+            return job.model_copy(deep=True)
+
+    def update_job(self, job_id: str, status: Optional[JobStatus] = None, stage: Optional[str] = None,
+                   progress: Optional[int] = None, result: Optional[Dict[str, Any]] = None,
+                   error: Optional[str] = None, owner: Optional[str] = None,
+                   details: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Update a job (fields left to None keep their value)
+
+        Args:
+            job_id: Job ID
+            status: New status
+            stage: Current stage
+            progress: Completion percentage
+            result: Result of a succeeded job
+            error: Error of a failed job
+            owner: Only update if the job is still claimed by this worker (optional)
+            details: Live progress details (replace the previous ones)
+
+        Returns:
+            True if the job was updated
+        """
+        changes = {'status': status, 'stage': stage, 'progress': progress,
+                   'result': json.loads(json.dumps(result)) if result is not None else None, 'error': error,
+                   'details': json.loads(json.dumps(details)) if details is not None else None}
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or (owner is not None and self._job_owners.get(job_id) != owner):
+                return False
+            self._jobs[job_id] = job.model_copy(update={
+                **{key: value for key, value in changes.items() if value is not None},
+                'updated_at': datetime.now().isoformat()
+            })
+        return True
+
+    def heartbeat_jobs(self, job_ids: List[str], owner: str) -> int:
+        """
+        Record that a worker is still running its jobs
+
+        Args:
+            job_ids: IDs of the jobs the worker runs
+            owner: Worker identifier
+
+        Returns:
+            Number of jobs still claimed by the worker
+        """
+        now = datetime.now().isoformat()
+        touched = 0
+        with self._lock:
+            for job_id in job_ids:
+                job = self._jobs.get(job_id)
+                if job and job.status == JobStatus.RUNNING and self._job_owners.get(job_id) == owner:
+                    self._job_heartbeats[job_id] = now
+                    touched += 1
+        return touched
+
+    def requeue_stale_jobs(self, heartbeat_before: str) -> int:
+        """
+        Queue again running jobs whose worker stopped sending heartbeats (e.g. after a crash)
+
+        Jobs whose cancellation was requested are cancelled instead.
+
+        Args:
+            heartbeat_before: Jobs whose last heartbeat is older than this timestamp are requeued
+
+        Returns:
+            Number of jobs requeued or cancelled
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            stale = [job_id for job_id, job in self._jobs.items()
+                     if job.status == JobStatus.RUNNING
+                     and self._job_heartbeats.get(job_id, '') < heartbeat_before]
+            for job_id in stale:
+                job = self._jobs[job_id]
+                self._jobs[job_id] = job.model_copy(update={
+                    'status': JobStatus.CANCELLED if job.cancel_requested else JobStatus.QUEUED,
+                    'stage': None, 'progress': 0, 'details': None, 'updated_at': now
+                })
+                self._job_owners[job_id] = None
+        return len(stale)
+
+    def cancel_job(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job
+
+        A queued job is cancelled at once. A running job is flagged, and its worker
+        stops it at the next progress report. Finished jobs are left unchanged.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            The job after the request, or None if it does not exist
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+                job = self._jobs[job_id] = job.model_copy(update={
+                    'status': JobStatus.CANCELLED if job.status == JobStatus.QUEUED else job.status,
+                    'cancel_requested': True,
+                    'updated_at': datetime.now().isoformat()
+                })
+            return job
+
+    # Image Management
+    def save_image(self, image_base64: str, platform: Platform, date: str,
+                   record_id: Optional[str] = None, brand_name: Optional[str] = None) -> str:
+        """
+        Save generated image (identical images are stored once)
+
+        Args:
+            image_base64: Base64 encoded image
+            platform: Platform
+            date: Date
+            record_id: Post record referencing the image (optional)
+            brand_name: Brand of the post (unused)
+
+        Returns:
+            memory:// URI of the image
+        """
+        data = b''.join(iter_base64_chunks(image_base64))
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            self._images.setdefault(digest, {'data': data})['touched_at'] = datetime.now()
+            if record_id:
+                self._post_images.setdefault(record_id, set()).add(digest)
+
+        return f"memory://images/{digest}.png"
+
+    def gc_images(self, grace_seconds: int = 3600) -> int:
+        """
+        Delete images no post references anymore
+
+        Args:
+            grace_seconds: Minimum time since the image was last saved
+
+        Returns:
+            Number of images deleted
+        """
+        cutoff = datetime.now() - timedelta(seconds=grace_seconds)
+        with self._lock:
+            referenced = set().union(*self._post_images.values())
+            unused = [digest for digest, image in self._images.items()
+                      if digest not in referenced and image['touched_at'] < cutoff]
+            for digest in unused:
+                del self._images[digest]
+        return len(unused)
+
+    # Cleanup and Maintenance
+    def rebuild_mirrors(self, batch_size: int = 500) -> Dict[str, int]:
+        """There are no mirror files to rebuild"""
+        return {}
+
+    def cleanup_old_data(self, days_to_keep: int = 90) -> Dict[str, int]:
+        """
+        Clean up old data
+
+        Args:
+            days_to_keep: Number of days of posts, metrics, state and runs to keep
+
+        Returns:
+            Cleanup statistics
+        """
+        cutoff = (datetime.now() - timedelta(days=days_to_keep)).strftime('%Y-%m-%d')
+
+        with self._lock:
+            expired_posts = [record_id for record_id, entry in self._posts.items()
+                             if entry['record'].date < cutoff]
+            for record_id in expired_posts:
+                self._delete_post(record_id)
+
+            expired_metrics = [key for key, sample in self._metrics.items() if sample.measured_at < cutoff]
+            for key in expired_metrics:
+                del self._metrics[key]
+            self._latest_metrics = {}
+            for sample in self._metrics.values():
+                latest = self._latest_metrics.get(sample.post_id)
+                if latest is None or sample.measured_at > latest.measured_at:
+                    self._latest_metrics[sample.post_id] = sample
+
+            expired_states = [date for date in self._states if date < cutoff]
+            for date in expired_states:
+                del self._states[date]
+            expired_runs = [date for date in self._runs if date < cutoff]
+            for date in expired_runs:
+                del self._runs[date]
+            for key in [key for key in self._checkpoints if key[0] < cutoff]:
+                del self._checkpoints[key]
+            # Finished jobs are kept 30 days whatever the requested retention, as in StorageManager
+            job_cutoff = (datetime.now() - timedelta(days=30)).isoformat()
+            finished = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job.created_at < job_cutoff and job.status in finished]:
+                del self._jobs[job_id]
+                self._job_owners.pop(job_id, None)
+                self._job_heartbeats.pop(job_id, None)
+
+        return {
+            'posts_deleted': len(expired_posts),
+            'metrics_deleted': len(expired_metrics),
+            'metrics_downsampled': 0,
+            'files_deleted': 0,
+            'images_deleted': self.gc_images(),
+            'runs_deleted': len(expired_runs),
+            'pages_vacuumed': 0
+        }
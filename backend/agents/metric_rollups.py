@@ -0,0 +1,103 @@
+"""
+Time buckets for the performance metrics rollups
+Samples are cumulative counters, so a post's rollup row for a bucket holds the
+values of its latest sample in that bucket (plus sample count and time span)
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+# Finest to coarsest
+RESOLUTIONS = ("hour", "day", "week")
+
+# SQL bucket of a measured_at column, kept equivalent to bucket_start()
+BUCKET_SQL = {
+    "hour": "substr({col}, 1, 10) || 'T' || COALESCE(NULLIF(substr({col}, 12, 2), ''), '00') || ':00:00'",
+    "day": "substr({col}, 1, 10)",
+    "week": "date(substr({col}, 1, 10), '-6 days', 'weekday 1')",
+}
+
+COUNTERS = ("impressions", "engagements", "clicks", "shares", "comments", "likes")
+
+
+def bucket_start(resolution: str, measured_at: str) -> str:
+    """
+    Start of the bucket containing a timestamp
+
+    Args:
+        resolution: One of RESOLUTIONS
+        measured_at: ISO timestamp or date
+
+    Returns:
+        Hour ('YYYY-MM-DDTHH:00:00'), day or week (Monday) start
+    """
+    if resolution == "hour":
+        return f"{measured_at[:10]}T{measured_at[11:13] or '00'}:00:00"
+    if resolution == "day":
+        return measured_at[:10]
+    if resolution == "week":
+        day = date.fromisoformat(measured_at[:10])
+        return (day - timedelta(days=day.weekday())).isoformat()
+    raise ValueError(f"Invalid resolution '{resolution}', expected one of {RESOLUTIONS}")
+
+
+def choose_resolution(interval: str, start_date: str, end_date: str) -> str:
+    """
+    Coarsest stored resolution that answers a series query exactly
+
+    This is the interval itself, unless weekly buckets would straddle the range
+    boundaries (weeks run Monday to Sunday); daily rollups are then regrouped.
+
+    Args:
+        interval: Requested step, one of RESOLUTIONS
+        start_date: First day of the range (YYYY-MM-DD)
+        end_date: Last day of the range (YYYY-MM-DD)
+
+    Returns:
+        Resolution to read
+    """
+    if interval not in RESOLUTIONS:
+        raise ValueError(f"Invalid interval '{interval}', expected one of {RESOLUTIONS}")
+
+    if interval == "week" and not (date.fromisoformat(start_date).weekday() == 0
+                                   and date.fromisoformat(end_date).weekday() == 6):
+        return "day"
+    return interval
+
+
+def merge_series(rows: List[Any], interval: str) -> List[Dict[str, Any]]:
+    """
+    Sum per-post rollup rows into series points of an interval
+
+    Rows of a finer resolution are regrouped: each post contributes the values
+    of its latest sample within the interval bucket.
+
+    Args:
+        rows: metric_rollups rows (any resolution not coarser than interval)
+        interval: Series step, one of RESOLUTIONS
+
+    Returns:
+        Points ordered by bucket
+    """
+    latest: Dict[tuple, Any] = {}
+    samples: Dict[tuple, int] = {}
+    for row in rows:
+        key = (bucket_start(interval, row['bucket_start']), row['post_id'])
+        samples[key] = samples.get(key, 0) + row['samples']
+        if key not in latest or row['last_measured_at'] >= latest[key]['last_measured_at']:
+            latest[key] = row
+
+    points: Dict[str, Dict[str, Any]] = {}
+    for (bucket, _), row in latest.items():
+        point = points.setdefault(bucket, {'bucket': bucket, 'posts': 0, 'samples': 0,
+                                           **{counter: 0 for counter in COUNTERS}})
+        point['posts'] += 1
+        point['samples'] += samples[(bucket, row['post_id'])]
+        for counter in COUNTERS:
+            point[counter] += row[counter]
+
+    for point in points.values():
+        point['engagement_rate'] = (
+            point['engagements'] / point['impressions'] * 100 if point['impressions'] > 0 else 0
+        )
+    return [points[bucket] for bucket in sorted(points)]
@@ -0,0 +1,950 @@
+"""
+Versioned schema migrations for the orchestrator SQLite database
+Each migration runs once, in order, and is recorded in the schema_version table
+"""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Dict, Tuple
+
+from pydantic import ValidationError
+
+from agents.models import PostRecord
+from agents.metric_rollups import RESOLUTIONS, BUCKET_SQL
+from agents.logger_config import setup_logger
+
+logger = setup_logger("agents.migrations", "INFO")
+
+
+def _ensure_column(conn, table: str, column: str, declaration: str):
+    """Add a column to an existing table if it is missing"""
+    columns = {row['name'] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
+def _is_default_database(conn, storage) -> bool:
+    """Whether conn is the storage's orchestrator.db (legacy JSON files are never imported into shards)"""
+    main = next(row['file'] for row in conn.execute("PRAGMA database_list") if row['name'] == 'main')
+    return Path(main).resolve() == Path(storage.db_path).resolve()
+
+
+# ---------- Migrations ----------
+# Migrations must stay idempotent: databases created before this framework
+# existed start at version 0 and replay every step over their current schema.
+
+def _initial_schema(conn, storage):
+    """Original tracking tables"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS posted_content (
+            id TEXT PRIMARY KEY,
+            date TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            post_id TEXT,
+            content_hash TEXT UNIQUE,
+            content TEXT,
+            posted_at TEXT,
+            success BOOLEAN,
+            error TEXT,
+            UNIQUE(date, platform)
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS monthly_plans (
+            id TEXT PRIMARY KEY,
+            brand_name TEXT,
+            start_date TEXT,
+            end_date TEXT,
+            created_at TEXT,
+            is_active BOOLEAN,
+            plan_json TEXT
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS performance_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            post_id TEXT,
+            platform TEXT,
+            measured_at TEXT,
+            impressions INTEGER,
+            engagements INTEGER,
+            clicks INTEGER,
+            shares INTEGER,
+            comments INTEGER,
+            likes INTEGER,
+            engagement_rate REAL,
+            FOREIGN KEY (post_id) REFERENCES posted_content(post_id)
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS orchestrator_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_date TEXT UNIQUE,
+            started_at TEXT,
+            completed_at TEXT,
+            posts_attempted INTEGER,
+            posts_succeeded INTEGER,
+            posts_failed INTEGER,
+            errors TEXT
+        )
+    """)
+
+
+def _calendar_posts(conn, storage):
+    """One row per calendar post so daily lookups avoid loading whole plans"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS calendar_posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            plan_id TEXT NOT NULL,
+            brand_name TEXT NOT NULL,
+            date TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            pillar TEXT,
+            topic TEXT,
+            post_json TEXT NOT NULL,
+            FOREIGN KEY (plan_id) REFERENCES monthly_plans(id)
+        )
+    """)
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_calendar_posts_plan_date
+        ON calendar_posts(plan_id, date, position)
+    """)
+
+    # Backfill plans saved before the table existed
+    rows = conn.execute("""
+        SELECT id, brand_name, plan_json FROM monthly_plans mp
+        WHERE NOT EXISTS (
+            SELECT 1 FROM calendar_posts cp WHERE cp.plan_id = mp.id
+        )
+    """).fetchall()
+
+    for row in rows:
+        try:
+            posts = json.loads(row['plan_json'])['calendar']['posts']
+        except (TypeError, ValueError, KeyError):
+            continue
+        storage._insert_calendar_posts(conn, row['id'], row['brand_name'], posts)
+
+
+def _brand_plan_versions(conn, storage):
+    """Plan version counter bumped on every save, used for cache invalidation"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS brand_plan_versions (
+            brand_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            plan_id TEXT,
+            updated_at TEXT
+        )
+    """)
+
+
+def _posted_content_records(conn, storage):
+    """Store full post records in SQLite and import legacy JSON files"""
+    _ensure_column(conn, 'posted_content', 'record_json', 'TEXT')
+
+    rows = conn.execute("""
+        SELECT id, date, platform FROM posted_content
+        WHERE record_json IS NULL
+    """).fetchall()
+
+    updates = []
+    for row in rows:
+        post_file = storage.posts_path / f"{row['date']}_{row['platform']}_{row['id']}.json"
+        if not post_file.exists():
+            continue
+        try:
+            with open(post_file, 'r', encoding='utf-8') as f:
+                record = PostRecord(**json.load(f))
+        except (json.JSONDecodeError, UnicodeDecodeError, TypeError, ValidationError) as e:
+            # Leave record_json empty: the row keeps its columns, only the full record is lost
+            logger.warning(f"Skipping unreadable post file {post_file}: {e}")
+            continue
+        updates.append((record.model_dump_json(), row['id']))
+
+    conn.executemany("""
+        UPDATE posted_content SET record_json = ? WHERE id = ?
+    """, updates)
+
+
+def _unique_metric_samples(conn, storage):
+    """Deduplicate (post_id, measured_at) samples and enforce uniqueness"""
+    exists = conn.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'index' AND name = 'idx_metrics_post_measured'
+    """).fetchone()
+    if exists:
+        return
+
+    conn.execute("""
+        DELETE FROM performance_metrics
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM performance_metrics GROUP BY post_id, measured_at
+        )
+    """)
+    conn.execute("""
+        CREATE UNIQUE INDEX idx_metrics_post_measured
+        ON performance_metrics(post_id, measured_at)
+    """)
+
+
+def _hot_path_indexes(conn, storage):
+    """Covering indexes for the active plan lookup, metrics retention and post joins"""
+    # get_active_plan_id / get_daily_posts: brand + active flag, newest first
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_monthly_plans_active
+        ON monthly_plans(brand_name, is_active, created_at, id)
+    """)
+    # cleanup_old_data deletes metrics by measurement time
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_metrics_measured_at
+        ON performance_metrics(measured_at)
+    """)
+    # aggregate_performance joins metrics to posts by platform post ID
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_posted_content_post_id
+        ON posted_content(post_id)
+    """)
+
+
+def _image_blobs(conn, storage):
+    """Content-addressed image blobs with reference counts maintained by triggers"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS image_blobs (
+            sha256 TEXT PRIMARY KEY,
+            ext TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            touched_at TEXT NOT NULL
+        )
+    """)
+    # Garbage collection only looks at unreferenced blobs
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_image_blobs_unreferenced
+        ON image_blobs(touched_at) WHERE refcount <= 0
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS post_images (
+            record_id TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            platform TEXT,
+            date TEXT,
+            PRIMARY KEY (record_id, sha256)
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_post_images_sha256
+        ON post_images(sha256)
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_post_images_ref
+        AFTER INSERT ON post_images
+        BEGIN
+            UPDATE image_blobs SET refcount = refcount + 1 WHERE sha256 = NEW.sha256;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_post_images_unref
+        AFTER DELETE ON post_images
+        BEGIN
+            UPDATE image_blobs
+            SET refcount = refcount - 1, touched_at = strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')
+            WHERE sha256 = OLD.sha256;
+        END
+    """)
+    # Deleting a post releases its images (INSERT OR REPLACE does not fire this
+    # trigger because recursive_triggers is off, so re-recording keeps references)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_posted_content_release_images
+        AFTER DELETE ON posted_content
+        BEGIN
+            DELETE FROM post_images WHERE record_id = OLD.id;
+        END
+    """)
+
+
+def _mirror_files(conn, storage):
+    """Registry of JSON mirror files so retention never has to scan directories"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS mirror_files (
+            path TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            ref_date TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_mirror_files_kind_date
+        ON mirror_files(kind, ref_date)
+    """)
+
+    # Register files written before the registry existed (one directory scan, once)
+    if not _is_default_database(conn, storage):
+        return
+    now = datetime.now().isoformat()
+    rows = []
+    for file in storage.posts_path.glob('*.json'):
+        # {date}_{platform}_{id}.json
+        rows.append((str(file), 'post', file.stem.split('_')[0], now))
+    for file in storage.metrics_path.glob('*.json'):
+        # {post_id}_{YYYYmmddHHMMSS}.json, the post ID may itself contain underscores
+        stamp = file.stem.rsplit('_', 1)[-1]
+        if len(stamp) >= 8 and stamp.isdigit():
+            rows.append((str(file), 'metrics', f"{stamp[:4]}-{stamp[4:6]}-{stamp[6:8]}", now))
+    for file in storage.state_path.glob('state_*.json'):
+        rows.append((str(file), 'state', file.stem[len('state_'):], now))
+    for file in storage.strategies_path.glob('*.json'):
+        rows.append((str(file), 'plan', datetime.fromtimestamp(file.stat().st_mtime).strftime('%Y-%m-%d'), now))
+
+    conn.executemany("""
+        INSERT OR IGNORE INTO mirror_files (path, kind, ref_date, created_at)
+        VALUES (?, ?, ?, ?)
+    """, rows)
+
+
+def _incremental_vacuum(conn, storage):
+    """Report databases created before incremental auto-vacuum was enabled"""
+    # New databases get auto_vacuum = INCREMENTAL from the pool pragmas. An existing
+    # one only changes through a full VACUUM, which rewrites the whole file under an
+    # exclusive lock, so it is left to an explicit maintenance command
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        main = next(row['file'] for row in conn.execute("PRAGMA database_list") if row['name'] == 'main')
+        logger.warning(f"{main}: auto_vacuum is not incremental, retention cannot return freed "
+                       f"pages until run_retention.py --convert-auto-vacuum is run")
+
+
+def _mirror_sources(conn, storage):
+    """Link mirror files to their source rows and keep orchestrator state in the DB"""
+    # Mirrors are written behind the commit, so the DB must hold everything
+    # needed to recreate them; state previously lived only in its JSON files
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS orchestrator_states (
+            date TEXT PRIMARY KEY,
+            state_json TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+    now = datetime.now().isoformat()
+    state_files = storage.state_path.glob('state_*.json') if _is_default_database(conn, storage) else []
+    for file in state_files:
+        conn.execute("""
+            INSERT OR IGNORE INTO orchestrator_states (date, state_json, updated_at)
+            VALUES (?, ?, ?)
+        """, (file.stem[len('state_'):], file.read_text(encoding='utf-8'), now))
+
+    # ref_id identifies the source row: plan ID, post record ID, state date or
+    # "{post_id}|{measured_at}" for metrics samples
+    _ensure_column(conn, "mirror_files", "ref_id", "TEXT")
+    rows = conn.execute("SELECT path, kind FROM mirror_files WHERE ref_id IS NULL").fetchall()
+    updates = []
+    for row in rows:
+        stem = Path(row['path']).stem
+        if row['kind'] == 'plan':
+            updates.append((stem, row['path']))
+        elif row['kind'] == 'state':
+            updates.append((stem[len('state_'):], row['path']))
+        elif row['kind'] == 'post':
+            # {date}_{platform}_{id}, platform values contain no underscores
+            parts = stem.split('_', 2)
+            if len(parts) == 3:
+                updates.append((parts[2], row['path']))
+        # Legacy metrics file names do not keep the full measured_at
+    conn.executemany("UPDATE mirror_files SET ref_id = ? WHERE path = ?", updates)
+
+
+def _plan_blobs(conn, storage):
+    """Encoded plan storage tagged with its codec (rows without a tag keep plan_json)"""
+    _ensure_column(conn, "monthly_plans", "plan_format", "TEXT")
+    _ensure_column(conn, "monthly_plans", "plan_blob", "BLOB")
+
+
+def _plan_history(conn, storage):
+    """Per-brand plan versions stored as snapshots or calendar-post deltas"""
+    # base_version is the snapshot a version is rebuilt from; the rows from
+    # base_version to version are read with one range scan of the primary key
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS plan_history (
+            brand_name TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            plan_id TEXT NOT NULL,
+            kind TEXT NOT NULL CHECK (kind IN ('snapshot', 'delta')),
+            base_version INTEGER NOT NULL,
+            plan_format TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (brand_name, version)
+        )
+    """)
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_plan_history_plan_id
+        ON plan_history(plan_id)
+    """)
+
+
+def _near_duplicate_index(conn, storage):
+    """MinHash signatures and LSH buckets of posted content, scoped by brand"""
+    _ensure_column(conn, "posted_content", "brand_name", "TEXT")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS content_signatures (
+            record_id TEXT PRIMARY KEY,
+            brand_name TEXT,
+            platform TEXT NOT NULL,
+            date TEXT NOT NULL,
+            signature BLOB NOT NULL
+        )
+    """)
+    # One row per band; a lookup reads one key range per band of the query
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS content_lsh (
+            bucket INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            record_id TEXT NOT NULL,
+            PRIMARY KEY (bucket, date, record_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_content_lsh_record
+        ON content_lsh(record_id)
+    """)
+
+    # Deleting a post (retention, cleanup) drops its signature and buckets
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_posted_content_drop_signature
+        AFTER DELETE ON posted_content
+        BEGIN
+            DELETE FROM content_signatures WHERE record_id = OLD.id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_content_signatures_drop_buckets
+        AFTER DELETE ON content_signatures
+        BEGIN
+            DELETE FROM content_lsh WHERE record_id = OLD.record_id;
+        END
+    """)
+
+    # Index recent posts (older ones are outside any useful lookup window)
+    since = (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d')
+    rows = conn.execute("""
+        SELECT id, brand_name, platform, date, content FROM posted_content
+        WHERE date >= ? AND content IS NOT NULL
+        AND id NOT IN (SELECT record_id FROM content_signatures)
+    """, (since,)).fetchall()
+    for row in rows:
+        storage._index_content(conn, row['id'], row['brand_name'], row['platform'],
+                               row['date'], row['content'])
+
+
+def _metric_rollup_upsert(resolution: str, source: str) -> str:
+    """Upsert of metric_rollups from performance_metrics rows ``m`` selected by ``source``"""
+    bucket = BUCKET_SQL[resolution].format(col="m.measured_at")
+    return f"""
+        INSERT INTO metric_rollups
+        (resolution, bucket_start, post_id, platform, brand_name, samples,
+         first_measured_at, last_measured_at, impressions, engagements,
+         clicks, shares, comments, likes, engagement_rate)
+        SELECT '{resolution}', {bucket}, m.post_id, m.platform,
+               (SELECT p.brand_name FROM posted_content p WHERE p.post_id = m.post_id),
+               1, m.measured_at, m.measured_at, m.impressions, m.engagements,
+               m.clicks, m.shares, m.comments, m.likes, m.engagement_rate
+        FROM performance_metrics m
+        {source}
+        ON CONFLICT (post_id, resolution, bucket_start) DO UPDATE SET
+            samples = samples + 1,
+            brand_name = COALESCE(brand_name, excluded.brand_name),
+            first_measured_at = MIN(first_measured_at, excluded.first_measured_at),
+            impressions = CASE WHEN excluded.last_measured_at >= last_measured_at
+                          THEN excluded.impressions ELSE impressions END,
+            engagements = CASE WHEN excluded.last_measured_at >= last_measured_at
+                          THEN excluded.engagements ELSE engagements END,
+            clicks = CASE WHEN excluded.last_measured_at >= last_measured_at
+                     THEN excluded.clicks ELSE clicks END,
+            shares = CASE WHEN excluded.last_measured_at >= last_measured_at
+                     THEN excluded.shares ELSE shares END,
+            comments = CASE WHEN excluded.last_measured_at >= last_measured_at
+                       THEN excluded.comments ELSE comments END,
+            likes = CASE WHEN excluded.last_measured_at >= last_measured_at
+                    THEN excluded.likes ELSE likes END,
+            engagement_rate = CASE WHEN excluded.last_measured_at >= last_measured_at
+                              THEN excluded.engagement_rate ELSE engagement_rate END,
+            last_measured_at = MAX(last_measured_at, excluded.last_measured_at)
+    """
+
+
+def _metric_rollups(conn, storage):
+    """Hourly, daily and weekly per-post rollups of performance metrics"""
+    # Each row holds the latest sample of a post in the bucket (counters are cumulative)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS metric_rollups (
+            resolution TEXT NOT NULL,
+            bucket_start TEXT NOT NULL,
+            post_id TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            brand_name TEXT,
+            samples INTEGER NOT NULL,
+            first_measured_at TEXT NOT NULL,
+            last_measured_at TEXT NOT NULL,
+            impressions INTEGER,
+            engagements INTEGER,
+            clicks INTEGER,
+            shares INTEGER,
+            comments INTEGER,
+            likes INTEGER,
+            engagement_rate REAL,
+            UNIQUE (post_id, resolution, bucket_start)
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_metric_rollups_range
+        ON metric_rollups(resolution, bucket_start)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_metric_rollups_bucket
+        ON metric_rollups(bucket_start)
+    """)
+
+    # Samples skipped by INSERT OR IGNORE fire no trigger, so duplicates are not counted.
+    # Deleting raw samples (downsampling, retention) leaves the rollups in place.
+    for resolution in RESOLUTIONS:
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_performance_metrics_rollup_{resolution}
+            AFTER INSERT ON performance_metrics
+            BEGIN
+                {_metric_rollup_upsert(resolution, "WHERE m.id = NEW.id")};
+            END
+        """)
+
+    # Replay stored samples in insertion order
+    if conn.execute("SELECT 1 FROM metric_rollups LIMIT 1").fetchone() is None:
+        for resolution in RESOLUTIONS:
+            conn.execute(_metric_rollup_upsert(resolution, "WHERE true ORDER BY m.id"))
+
+
+def _export_sequence(conn, storage):
+    """Monotonic export cursor for posted_content (incremental exports read rows after a watermark)"""
+    # rowid is reused when the newest row is replaced, so a counter that only
+    # grows numbers every inserted or replaced post instead
+    _ensure_column(conn, "posted_content", "export_seq", "INTEGER")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS export_sequences (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+
+    conn.execute("UPDATE posted_content SET export_seq = rowid WHERE export_seq IS NULL")
+    conn.execute("""
+        INSERT OR IGNORE INTO export_sequences (name, value)
+        SELECT 'posted_content', COALESCE(MAX(export_seq), 0) FROM posted_content
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_posted_content_export_seq
+        ON posted_content(export_seq)
+    """)
+
+    # INSERT OR REPLACE fires insert triggers, so re-recorded posts are exported again
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_posted_content_export_seq
+        AFTER INSERT ON posted_content
+        BEGIN
+            UPDATE export_sequences SET value = value + 1 WHERE name = 'posted_content';
+            UPDATE posted_content
+            SET export_seq = (SELECT value FROM export_sequences WHERE name = 'posted_content')
+            WHERE rowid = NEW.rowid;
+        END
+    """)
+
+
+def _post_checkpoints(conn, storage):
+    """Per-post execution state, so an interrupted daily run resumes with the unfinished posts"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS post_checkpoints (
+            run_date TEXT NOT NULL,
+            brand_name TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            slot INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            post_id TEXT,
+            post_url TEXT,
+            error TEXT,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (run_date, brand_name, platform, slot)
+        )
+    """)
+    # Execution status counts a brand's day by status from this index alone
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_post_checkpoints_status
+        ON post_checkpoints(run_date, brand_name, status, updated_at)
+    """)
+
+
+def _jobs(conn, storage):
+    """Background job records, so queued and interrupted jobs survive a restart"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL,
+            stage TEXT,
+            progress INTEGER NOT NULL DEFAULT 0,
+            request_json TEXT NOT NULL,
+            result_json TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            owner TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            heartbeat_at TEXT
+        )
+    """)
+    # Workers pick the oldest queued jobs and look for running ones without heartbeat
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_jobs_status
+        ON jobs(status, created_at)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_jobs_created_at
+        ON jobs(created_at)
+    """)
+
+
+def _job_cancellation(conn, storage):
+    """Live progress details and cooperative cancellation of running jobs"""
+    _ensure_column(conn, "jobs", "details_json", "TEXT")
+    _ensure_column(conn, "jobs", "cancel_requested", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _job_concurrency_keys(conn, storage):
+    """Concurrency key of each job, so every worker sees the per-key limits when claiming"""
+    _ensure_column(conn, "jobs", "concurrency_key", "TEXT")
+    # Claims count the running jobs of the same type and key
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_jobs_concurrency_key
+        ON jobs(kind, concurrency_key, status)
+    """)
+
+
+# Ordered list of (version, name, function, transactional). Append only, never renumber.
+MIGRATIONS: List[Tuple[int, str, Callable, bool]] = [
+    (1, "initial_schema", _initial_schema, True),
+    (2, "calendar_posts", _calendar_posts, True),
+    (3, "brand_plan_versions", _brand_plan_versions, True),
+    (4, "posted_content_records", _posted_content_records, True),
+    (5, "unique_metric_samples", _unique_metric_samples, True),
+    (6, "hot_path_indexes", _hot_path_indexes, True),
+    (7, "image_blobs", _image_blobs, True),
+    (8, "mirror_files", _mirror_files, True),
+    (9, "incremental_vacuum", _incremental_vacuum, True),
+    (10, "mirror_sources", _mirror_sources, True),
+    (11, "plan_blobs", _plan_blobs, True),
+    (12, "plan_history", _plan_history, True),
+    (13, "near_duplicate_index", _near_duplicate_index, True),
+    (14, "metric_rollups", _metric_rollups, True),
+    (15, "export_sequence", _export_sequence, True),
+    (16, "post_checkpoints", _post_checkpoints, True),
+    (17, "jobs", _jobs, True),
+    (18, "job_cancellation", _job_cancellation, True),
+    (19, "job_concurrency_keys", _job_concurrency_keys, True),
+]
+
+
+def get_schema_version(conn) -> int:
+    """Get the highest applied migration version (0 for a fresh database)"""
+    row = conn.execute("SELECT MAX(version) AS version FROM schema_version").fetchone()
+    return row['version'] or 0
+
+
+def run_migrations(conn, storage) -> List[int]:
+    """
+    Apply pending migrations
+
+    Each migration runs in its own BEGIN IMMEDIATE transaction and the version
+    is re-read after the write lock is taken, so several workers starting at
+    once apply every migration exactly once. Non-transactional migrations
+    run before the lock is taken and must be idempotent.
+
+    Args:
+        conn: SQLite connection
+        storage: StorageManager the migrations operate for (paths, helpers)
+
+    Returns:
+        Versions applied by this call
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    conn.commit()
+
+    applied = []
+    for version, name, migration, transactional in MIGRATIONS:
+        if get_schema_version(conn) >= version:
+            continue
+
+        if not transactional:
+            migration(conn, storage)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another worker may have applied it while we waited for the lock
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+
+            if transactional:
+                migration(conn, storage)
+            conn.execute("""
+                INSERT INTO schema_version (version, name, applied_at)
+                VALUES (?, ?, ?)
+            """, (version, name, datetime.now().isoformat()))
+            conn.commit()
+            applied.append(version)
+        except Exception:
+            conn.rollback()
+            raise
+
+    return applied
+
+
+# ---------- Query plan checks ----------
+# Queries on the storage hot paths with representative parameters.
+# find_full_scans() reports any of them that SQLite would answer with a table scan.
+HOT_QUERIES: Dict[str, Tuple[str, tuple]] = {
+    "active_plan_id": ("""
+        SELECT id FROM monthly_plans
+        WHERE brand_name = ? AND is_active = 1
+        ORDER BY created_at DESC LIMIT 1
+    """, ("Brand",)),
+    "active_plan": ("""
+        SELECT plan_format, plan_blob, plan_json FROM monthly_plans
+        WHERE brand_name = ? AND is_active = 1
+        ORDER BY created_at DESC LIMIT 1
+    """, ("Brand",)),
+    "deactivate_plans": ("""
+        UPDATE monthly_plans SET is_active = 0
+        WHERE brand_name = ? AND is_active = 1
+    """, ("Brand",)),
+    "plan_history_range": ("""
+        SELECT kind, plan_format, payload FROM plan_history
+        WHERE brand_name = ? AND version BETWEEN ? AND ?
+        ORDER BY version
+    """, ("Brand", 1, 5)),
+    "plan_history_by_id": ("""
+        SELECT brand_name, version FROM plan_history WHERE plan_id = ?
+    """, ("plan_Brand",)),
+    "plan_version": ("""
+        SELECT version FROM brand_plan_versions WHERE brand_name = ?
+    """, ("Brand",)),
+    "daily_posts": ("""
+        SELECT post_json FROM calendar_posts
+        WHERE plan_id = (
+            SELECT id FROM monthly_plans
+            WHERE brand_name = ? AND is_active = 1
+            ORDER BY created_at DESC LIMIT 1
+        ) AND date = ? AND platform IN (?, ?)
+        ORDER BY position
+    """, ("Brand", "2024-01-01", "LinkedIn", "Twitter")),
+    "has_been_posted": ("""
+        SELECT id FROM posted_content
+        WHERE date = ? AND platform = ? AND success = 1
+    """, ("2024-01-01", "LinkedIn")),
+    "is_duplicate_content": ("""
+        SELECT id FROM posted_content
+        WHERE content_hash = ?
+    """, ("hash",)),
+    "posted_content_range": ("""
+        SELECT record_json FROM posted_content
+        WHERE date >= ? AND date <= ?
+        AND record_json IS NOT NULL
+        ORDER BY date DESC, posted_at DESC
+    """, ("2024-01-01", "2024-03-31")),
+    "metrics_for_post": ("""
+        SELECT * FROM performance_metrics
+        WHERE post_id = ?
+        ORDER BY measured_at DESC
+    """, ("post",)),
+    "aggregate_performance": ("""
+        WITH posts AS (
+            SELECT platform, post_id, success FROM posted_content
+            WHERE date >= ? AND date <= ?
+        ),
+        latest AS (
+            SELECT post_id, impressions, engagements,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY post_id ORDER BY last_measured_at DESC
+                   ) AS rn
+            FROM metric_rollups
+            WHERE resolution = 'week' AND post_id IN (SELECT post_id FROM posts)
+        )
+        SELECT p.platform, COUNT(*), SUM(l.impressions)
+        FROM posts p
+        LEFT JOIN latest l ON l.post_id = p.post_id AND l.rn = 1
+        GROUP BY p.platform
+    """, ("2024-01-01", "2024-03-31")),
+    "metrics_series": ("""
+        SELECT * FROM metric_rollups
+        WHERE resolution = ? AND bucket_start >= ? AND bucket_start <= ?
+        AND brand_name = ?
+    """, ("day", "2024-01-01", "2024-03-31T23:59:59", "Brand")),
+    "downsample_metrics": ("""
+        SELECT m.id, m.post_id, m.measured_at FROM performance_metrics m
+        WHERE m.measured_at < ? AND EXISTS (
+            SELECT 1 FROM performance_metrics n
+            WHERE n.post_id = m.post_id AND n.measured_at > m.measured_at
+        )
+        LIMIT ?
+    """, ("2024-01-01", 500)),
+    "prune_hourly_rollups": ("""
+        DELETE FROM metric_rollups WHERE rowid IN (
+            SELECT rowid FROM metric_rollups
+            WHERE resolution = 'hour' AND bucket_start < ?
+            LIMIT ?
+        )
+    """, ("2024-01-01", 500)),
+    "gc_images": ("""
+        SELECT sha256, ext FROM image_blobs
+        WHERE refcount <= 0 AND touched_at < ?
+        LIMIT ?
+    """, ("2024-01-01", 500)),
+    "expired_mirror_files": ("""
+        SELECT path FROM mirror_files
+        WHERE kind = ? AND ref_date < ?
+        LIMIT ?
+    """, ("metrics", "2024-01-01", 500)),
+    "near_duplicate_candidates": ("""
+        SELECT s.record_id, s.platform, s.date, s.signature
+        FROM content_signatures s
+        WHERE s.record_id IN (
+            SELECT record_id FROM content_lsh
+            WHERE bucket IN (?, ?) AND date >= ?
+        )
+    """, (1, 2, "2024-01-01")),
+    "replaced_signatures": ("""
+        DELETE FROM content_signatures WHERE record_id IN (
+            SELECT id FROM posted_content
+            WHERE id = ? OR (date = ? AND platform = ?) OR content_hash = ?
+        )
+    """, ("rec", "2024-01-01", "Twitter", "hash")),
+    "has_run_today": ("""
+        SELECT id FROM orchestrator_runs
+        WHERE run_date = ?
+    """, ("2024-01-01",)),
+    "cleanup_posts": ("""
+        DELETE FROM posted_content
+        WHERE date < ?
+    """, ("2024-01-01",)),
+    "cleanup_metrics": ("""
+        DELETE FROM performance_metrics
+        WHERE measured_at < ?
+    """, ("2024-01-01",)),
+    "export_posts": ("""
+        SELECT * FROM posted_content
+        WHERE export_seq > ? AND export_seq <= ?
+        ORDER BY export_seq LIMIT ?
+    """, (0, 1000, 5000)),
+    "export_metrics": ("""
+        SELECT * FROM performance_metrics
+        WHERE id > ? AND id <= ?
+        ORDER BY id LIMIT ?
+    """, (0, 1000, 5000)),
+    "export_calendar_posts": ("""
+        SELECT * FROM calendar_posts
+        WHERE id > ? AND id <= ?
+        ORDER BY id LIMIT ?
+    """, (0, 1000, 5000)),
+    "cleanup_rollups": ("""
+        DELETE FROM metric_rollups
+        WHERE bucket_start < ?
+    """, ("2024-01-01",)),
+    "post_checkpoints": ("""
+        SELECT * FROM post_checkpoints
+        WHERE run_date = ? AND brand_name = ?
+        ORDER BY platform, slot
+    """, ("2024-01-01", "Brand")),
+    "update_checkpoint": ("""
+        UPDATE post_checkpoints SET status = ?, updated_at = ?
+        WHERE run_date = ? AND brand_name = ? AND platform = ? AND slot = ?
+    """, ("posted", "2024-01-01T09:00:00", "2024-01-01", "Brand", "LinkedIn", 0)),
+    "checkpoint_summary": ("""
+        SELECT status, COUNT(*) AS posts, MAX(updated_at) AS updated_at
+        FROM post_checkpoints
+        WHERE run_date = ? AND brand_name = ?
+        GROUP BY status
+    """, ("2024-01-01", "Brand")),
+    "cleanup_checkpoints": ("""
+        DELETE FROM post_checkpoints
+        WHERE run_date < ?
+    """, ("2024-01-01",)),
+    "queued_jobs": ("""
+        SELECT * FROM jobs
+        WHERE status = ?
+        ORDER BY created_at LIMIT ?
+    """, ("queued", 10)),
+    "claim_job": ("""
+        UPDATE jobs SET status = 'running', owner = ?, attempts = attempts + 1,
+                        updated_at = ?, heartbeat_at = ?
+        WHERE id = ? AND status = 'queued'
+          AND (concurrency_key IS NULL OR (
+              SELECT COUNT(*) FROM jobs AS other
+              WHERE other.kind = jobs.kind AND other.concurrency_key = jobs.concurrency_key
+                AND other.status = 'running'
+          ) < ?)
+    """, ("worker", "2024-01-01", "2024-01-01", "job", 1)),
+    "stale_jobs": ("""
+        UPDATE jobs SET status = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'queued' END,
+                        owner = NULL, stage = NULL, progress = 0, details_json = NULL, updated_at = ?
+        WHERE status = 'running' AND heartbeat_at < ?
+    """, ("2024-01-01", "2024-01-01")),
+    "cancel_job": ("""
+        UPDATE jobs SET status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+                        cancel_requested = 1, updated_at = ?
+        WHERE id = ? AND status IN ('queued', 'running')
+    """, ("2024-01-01", "job")),
+    "cleanup_jobs": ("""
+        DELETE FROM jobs
+        WHERE created_at < ? AND status IN ('succeeded', 'failed', 'cancelled')
+    """, ("2024-01-01",)),
+}
+
+
+def find_full_scans(conn) -> Dict[str, List[str]]:
+    """
+    Run EXPLAIN QUERY PLAN on every hot query
+
+    Args:
+        conn: SQLite connection to a migrated database
+
+    Returns:
+        Mapping of query name to the plan lines that scan a whole table
+    """
+    tables = {row['name'] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'"
+    )}
+
+    offenders: Dict[str, List[str]] = {}
+    for name, (sql, params) in HOT_QUERIES.items():
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        # "SCAN t USING [COVERING] INDEX ..." walks an index, and CTE or
+        # subquery materializations are not tables, so neither is flagged
+        scans = [
+            row['detail'] for row in plan
+            if row['detail'].startswith('SCAN ')
+            and row['detail'].split()[1] in tables
+            and ' INDEX ' not in row['detail']
+        ]
+        if scans:
+            offenders[name] = scans
+    return offenders
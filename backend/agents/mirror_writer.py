@@ -0,0 +1,198 @@
+"""
+Write-behind writer for the JSON mirror files
+The SQLite commit is the durable write; mirrors are produced afterwards
+"""
+
+import os
+import json
+import queue
+import atexit
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from pydantic import BaseModel
+
+from agents.logger_config import setup_logger
+
+logger = setup_logger("agents.mirror_writer", "INFO")
+
+# sync: write in the calling thread, async: background writer, off: no mirrors
+MIRROR_MODES = ("sync", "async", "off")
+
+_STOP = object()
+_DELETE = object()
+
+
+def write_json_file(path: Union[str, Path], data: Any, indent: Optional[int] = 2):
+    """
+    Atomically write a JSON file (temporary file, then rename)
+
+    Args:
+        path: Target path
+        data: Pydantic model or JSON-serializable value
+        indent: JSON indentation (None for compact output)
+    """
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode='json')
+
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+class MirrorWriter:
+    """Writes JSON mirror files in sync, async (write-behind) or off mode
+
+    In async mode submitted files go to a bounded queue drained by one
+    background thread in batches. A full queue blocks the submitter for up to
+    ``put_timeout`` seconds (backpressure); if the writer still cannot keep up
+    the file is dropped. Mirror paths are registered in the database with the
+    row they mirror, so dropped or unwritten files are recreated by
+    StorageManager.rebuild_mirrors().
+    """
+
+    def __init__(self, mode: str = "async", max_queue: int = 10000,
+                 batch_size: int = 200, put_timeout: float = 5.0,
+                 indent: Optional[int] = 2):
+        """
+        Initialize the writer
+
+        Args:
+            mode: One of MIRROR_MODES
+            max_queue: Maximum number of pending files in async mode
+            batch_size: Maximum files written per batch
+            put_timeout: Seconds a submitter waits on a full queue before dropping
+            indent: JSON indentation of the mirror files
+        """
+        if mode not in MIRROR_MODES:
+            raise ValueError(f"Invalid mirror mode '{mode}', expected one of {MIRROR_MODES}")
+
+        self.mode = mode
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self.indent = indent
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self._stats = {'submitted': 0, 'written': 0, 'removed': 0, 'failed': 0, 'dropped': 0,
+                       'batches': 0}
+        self._thread: Optional[threading.Thread] = None
+
+        if mode == "async":
+            self._thread = threading.Thread(target=self._loop, name="mirror-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether mirror files are produced at all"""
+        return self.mode != "off"
+
+    def submit(self, path: Union[str, Path], data: Any) -> bool:
+        """
+        Write (sync) or enqueue (async) a mirror file
+
+        Args:
+            path: Target path
+            data: Pydantic model or JSON-serializable value (serialized by the writer)
+
+        Returns:
+            False if the file was dropped or mirrors are off
+        """
+        if self.mode == "off":
+            return False
+
+        self._count('submitted')
+        if self.mode == "sync":
+            return self._write(path, data)
+
+        try:
+            self._queue.put((path, data), timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            self._count('dropped')
+            logger.warning(f"Mirror queue full, dropped {path} (rebuild_mirrors will recreate it)")
+            return False
+
+    def remove(self, path: Union[str, Path]) -> bool:
+        """
+        Delete a mirror file, ordered after any pending write of the same path
+
+        Args:
+            path: Path of the mirror file
+
+        Returns:
+            False if the removal was dropped or mirrors are off
+        """
+        return self.submit(path, _DELETE)
+
+    def flush(self):
+        """Block until every queued file has been written"""
+        if self._thread and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Write pending files and stop the background thread"""
+        if self._thread and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['mode'] = self.mode
+        stats['pending'] = self._queue.qsize()
+        return stats
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _write(self, path: Union[str, Path], data: Any) -> bool:
+        try:
+            if data is _DELETE:
+                Path(path).unlink(missing_ok=True)
+                self._count('removed')
+                return True
+            write_json_file(path, data, indent=self.indent)
+            self._count('written')
+            return True
+        except Exception as e:
+            self._count('failed')
+            logger.error(f"Failed to write mirror file {path}: {str(e)}")
+            return False
+
+    def _loop(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Later submissions for the same path supersede earlier ones
+            latest: Dict[str, Any] = {}
+            stop = False
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                else:
+                    latest[str(item[0])] = item[1]
+
+            for path, data in latest.items():
+                self._write(path, data)
+            self._count('batches')
+
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
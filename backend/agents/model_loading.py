@@ -0,0 +1,75 @@
+"""
+Trusted loading of models read back from storage
+Rows written by this service were validated before they were saved, so they are
+handed straight to the model's compiled pydantic-core validator: JSON columns
+without json.loads, column rows without building keyword arguments. Data from
+the API keeps going through the models' normal (strict) validation.
+
+model_construct is deliberately not used: with pydantic 2 it is implemented in
+Python, does not build nested models or enums, and is slower than the compiled
+validator (see benchmarks/bench_model_loading.py).
+"""
+
+from typing import Any, Iterable, List, Mapping, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def load_json(model: Type[M], data: Union[str, bytes]) -> M:
+    """
+    Load one stored JSON document
+
+    Args:
+        model: Model class the document was dumped from
+        data: JSON text or bytes
+
+    Returns:
+        Model instance
+    """
+    return model.__pydantic_validator__.validate_json(data)
+
+
+def load_json_rows(model: Type[M], documents: Iterable[Union[str, bytes]]) -> List[M]:
+    """
+    Load stored JSON documents (e.g. a JSON column of several rows)
+
+    Args:
+        model: Model class the documents were dumped from
+        documents: JSON texts or bytes
+
+    Returns:
+        Model instances, in order
+    """
+    validate = model.__pydantic_validator__.validate_json
+    return [validate(data) for data in documents]
+
+
+def load_object(model: Type[M], data: Any) -> M:
+    """
+    Load one stored document already decoded to Python values (e.g. msgpack)
+
+    Args:
+        model: Model class the document was dumped from
+        data: Dict of field values
+
+    Returns:
+        Model instance
+    """
+    return model.__pydantic_validator__.validate_python(data)
+
+
+def load_rows(model: Type[M], rows: Iterable[Mapping[str, Any]]) -> List[M]:
+    """
+    Load models from table rows whose columns are named after the fields
+
+    Args:
+        model: Model class
+        rows: sqlite3.Row or dict rows (columns that are not fields are ignored)
+
+    Returns:
+        Model instances, in order
+    """
+    validate = model.__pydantic_validator__.validate_python
+    return [validate(dict(row)) for row in rows]
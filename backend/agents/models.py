@@ -117,6 +117,7 @@ class DailyContentPackage(BaseModel):
     max_retries: int = Field(default=3, description="Maximum retry attempts")
     startup_name: Optional[str] = Field(default=None, description="Startup name for content generation")
     startup_url: Optional[str] = Field(default=None, description="Startup URL for landing page analysis")
+    brand_name: Optional[str] = Field(default=None, description="Brand the content is published for")
 
 # Channel agent output models
 class GeneratedPost(BaseModel):
@@ -175,6 +176,51 @@ class OrchestratorState(BaseModel):
     last_execution: str = Field(description="Last execution timestamp")
     is_running: bool = Field(default=False, description="Whether orchestrator is currently running")
 
+class CheckpointStatus(str, Enum):
+    """Stage of a scheduled post in the daily execution pipeline"""
+    PENDING = "pending"
+    GENERATING = "generating"
+    POSTED = "posted"
+    FAILED = "failed"
+
+class PostCheckpoint(BaseModel):
+    """Persisted execution state of one scheduled post, updated as it moves through the pipeline"""
+    run_date: str = Field(description="Execution date")
+    brand_name: str = Field(description="Brand name")
+    platform: Platform = Field(description="Platform")
+    slot: int = Field(description="Index of the post among the brand's posts for this platform and date")
+    status: CheckpointStatus = Field(default=CheckpointStatus.PENDING, description="Pipeline stage")
+    attempts: int = Field(default=0, description="Number of times generation was started")
+    post_id: Optional[str] = Field(default=None, description="Platform post ID once posted")
+    post_url: Optional[str] = Field(default=None, description="URL of the posted content")
+    error: Optional[str] = Field(default=None, description="Error of the last failed attempt")
+    updated_at: str = Field(description="Last status change timestamp")
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class Job(BaseModel):
+    """Background job record (e.g. a strategy generation), persisted across restarts"""
+    id: str = Field(description="Job ID")
+    kind: str = Field(description="Job type, selects the handler that runs it")
+    status: JobStatus = Field(default=JobStatus.QUEUED, description="Lifecycle status")
+    stage: Optional[str] = Field(default=None, description="Current stage of the running job")
+    progress: int = Field(default=0, description="Completion percentage")
+    request: Dict[str, Any] = Field(description="Job input, kept so the job can be re-run after a restart")
+    concurrency_key: Optional[str] = Field(default=None, description="Key limiting how many jobs of this type run at once (e.g. the brand)")
+    result: Optional[Dict[str, Any]] = Field(default=None, description="Result of a succeeded job")
+    details: Optional[Dict[str, Any]] = Field(default=None, description="Live progress details reported by the handler")
+    cancel_requested: bool = Field(default=False, description="Cancellation asked while the job was running")
+    error: Optional[str] = Field(default=None, description="Error of a failed job")
+    attempts: int = Field(default=0, description="Number of times the job was started")
+    created_at: str = Field(description="Submission timestamp")
+    updated_at: str = Field(description="Last change timestamp")
+
 # API request/response models
 class StrategyRequest(BaseModel):
     """Request model for strategy generation"""
@@ -207,3 +253,8 @@ class AnalyticsRequest(BaseModel):
     end_date: str = Field(description="End date for analytics")
     platforms: Optional[List[Platform]] = Field(default=None, description="Specific platforms to analyze")
     metrics: Optional[List[str]] = Field(default=None, description="Specific metrics to retrieve")
+
+class BulkMetricsRequest(BaseModel):
+    """Request model for bulk metrics ingestion"""
+    metrics: List[PerformanceMetrics] = Field(description="Metrics samples to store")
+    write_files: bool = Field(default=False, description="Also write one JSON file per sample")
@@ -0,0 +1,123 @@
+"""
+MinHash signatures and LSH buckets for near-duplicate post detection
+Similarity is the estimated Jaccard similarity of character 4-gram shingles
+"""
+
+import re
+import hashlib
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from agents.models import Platform, PostingResult
+
+# 20 bands of 3 rows: posts with similarity >= 0.5 share a bucket with
+# probability >= 0.93 (>= 0.99 from 0.6), unrelated posts (~0.05) rarely do
+NUM_BANDS = 20
+ROWS_PER_BAND = 3
+NUM_PERM = NUM_BANDS * ROWS_PER_BAND
+SHINGLE_SIZE = 4
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation (hashtags and mentions kept) and collapse whitespace"""
+    text = re.sub(r"[^\w#@ ]", " ", text.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Character n-grams of the normalized text"""
+    text = normalize(text)
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash(text: str) -> List[int]:
+    """
+    Compute the MinHash signature of a text
+
+    Each shingle is hashed once with SHAKE-128 into NUM_PERM independent
+    32-bit values; the signature is the column-wise minimum.
+
+    Args:
+        text: Post content
+
+    Returns:
+        NUM_PERM 32-bit minimum hash values
+    """
+    rows = []
+    for shingle in shingles(text):
+        values = array('I')
+        values.frombytes(hashlib.shake_128(shingle.encode('utf-8')).digest(4 * NUM_PERM))
+        rows.append(values)
+    return list(map(min, zip(*rows)))
+
+
+def lsh_buckets(signature: List[int], scope: Optional[str] = None) -> List[int]:
+    """
+    Bucket keys of a signature, one per band
+
+    Args:
+        signature: MinHash signature
+        scope: Partition key (e.g. brand name); only equal scopes share buckets
+
+    Returns:
+        Signed 64-bit bucket keys (SQLite INTEGER)
+    """
+    buckets = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        key = f"{scope or ''}|{band}|{','.join(map(str, rows))}".encode('utf-8')
+        digest = hashlib.blake2b(key, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+
+def similarity(first: List[int], second: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(first, second) if x == y) / NUM_PERM
+
+
+def signature_to_bytes(signature: List[int]) -> bytes:
+    """Pack a signature for storage"""
+    return array('I', signature).tobytes()
+
+
+def signature_from_bytes(data: bytes) -> List[int]:
+    """Unpack a stored signature"""
+    values = array('I')
+    values.frombytes(data)
+    return values.tolist()
+
+
+def check_near_duplicate(storage, content: str, platform: Platform, brand_name: Optional[str],
+                         post_date: str) -> Tuple[Optional[PostingResult], List[Dict[str, Any]]]:
+    """
+    Check a post against the brand's recent posts before publishing it
+
+    Args:
+        storage: Storage backend holding the posted content
+        content: Text about to be posted
+        platform: Platform the post is for
+        brand_name: Brand the post is published for
+        post_date: Date the post is published for (end of the look-back window)
+
+    Returns:
+        (failed posting result to return instead of posting, or None if the post
+        is not a near-duplicate; the matches, most similar first)
+    """
+    duplicates = storage.find_near_duplicates(content, brand_name=brand_name, platform=platform,
+                                              reference_date=post_date)
+    if not duplicates:
+        return None, []
+
+    match = duplicates[0]
+    print(f"⚠️ Near-duplicate of post {match['post_id']} from {match['date']} "
+          f"({match['similarity']:.0%} similar), not posting to {platform.value}")
+    return PostingResult(
+        success=False,
+        platform=platform,
+        error=f"Near-duplicate of post {match['post_id']} from {match['date']}",
+        timestamp=datetime.now().isoformat()
+    ), duplicates
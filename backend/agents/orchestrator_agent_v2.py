@@ -5,7 +5,7 @@ This agent handles daily execution of content posting across all platforms
 
 from dotenv import load_dotenv
 import os
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable
 from datetime import datetime, timedelta
 import json
 
@@ -20,7 +20,8 @@ from agents.models import (
     PostingResult,
     PostRecord,
     OrchestratorState,
-    PerformanceMetrics
+    PerformanceMetrics,
+    CheckpointStatus
 )
 from agents.storage import get_storage
 
@@ -32,6 +33,10 @@ class OrchestratorAgentV2:
     def __init__(self, startup_name: Optional[str] = None, startup_url: Optional[str] = None, startup_context: Optional[str] = None):
         """Initialize the Orchestrator Agent V2
 
+        The startup parameters are defaults for execute_daily, which also takes them
+        per call; an instance built without them can be shared by concurrent requests
+        (see agents.agent_registry).
+
         Args:
             startup_name: Name of the startup for content generation
             startup_url: URL of the startup's landing page for analysis
@@ -93,7 +98,8 @@ class OrchestratorAgentV2:
         execution_date: str,
         startup_name: Optional[str] = None,
         startup_url: Optional[str] = None,
-        startup_context: Optional[str] = None
+        startup_context: Optional[str] = None,
+        brand_name: Optional[str] = None
     ) -> DailyContentPackage:
         """Create a content package for channel agents"""
         # Determine optimal posting time based on platform
@@ -112,7 +118,8 @@ class OrchestratorAgentV2:
             posting_time=posting_times.get(post.platform, "10:00"),
             max_retries=3,
             startup_name=startup_name or self.startup_name,
-            startup_url=startup_url or self.startup_url
+            startup_url=startup_url or self.startup_url,
+            brand_name=brand_name
         )
 
         return package
@@ -120,9 +127,11 @@ class OrchestratorAgentV2:
     def dispatch_to_channel(
         self,
         package: DailyContentPackage,
-        dry_run: bool = False
+        dry_run: bool = False,
+        startup_context: Optional[str] = None
     ) -> PostingResult:
         """Dispatch content package to appropriate channel agent"""
+        startup_context = startup_context or self.startup_context
         print(f"Dispatching content to {package.platform.value} with startup context")
 
         try:
@@ -131,7 +140,7 @@ class OrchestratorAgentV2:
                 print(f"[DRY RUN] Simulating post to {package.platform.value}:")
                 print(f"  Topic: {package.base_content.topic}")
                 print(f"  Startup: {package.startup_name}")
-                print(f"  Startup Context: {self.startup_context[:100] if self.startup_context else 'None'}...")
+                print(f"  Startup Context: {startup_context[:100] if startup_context else 'None'}...")
                 print(f"  Time: {package.posting_time}")
 
                 return PostingResult(
@@ -174,9 +183,20 @@ class OrchestratorAgentV2:
         platforms: Optional[List[Platform]] = None,
         startup_name: Optional[str] = None,
         startup_url: Optional[str] = None,
-        startup_context: Optional[str] = None
+        startup_context: Optional[str] = None,
+        progress: Optional[Callable[..., None]] = None
     ) -> Dict[str, Any]:
-        """Execute daily content posting with startup context"""
+        """Execute daily content posting with startup context
+
+        Each post's progress is checkpointed in storage, so running again after
+        an interruption only processes the posts that were not posted yet. A dry
+        run previews every post without writing checkpoints or a run record.
+        progress (optional) is called before each post and at the end with the
+        stage, the completion percentage and the per-platform progress and
+        timings; an exception it raises (e.g. a cancelled job) stops the run
+        between two posts.
+        """
+        report = progress or (lambda stage, percent, details=None: None)
         # Set execution date
         if not execution_date:
             execution_date = datetime.now().strftime("%Y-%m-%d")
@@ -187,18 +207,9 @@ class OrchestratorAgentV2:
         print(f"Startup Context: {'Available' if (startup_context or self.startup_context) else 'None'}")
         print(f"Mode: {'DRY RUN' if dry_run else 'LIVE'}")
 
-        # Check idempotency
-        if not force and self.storage.has_run_today(execution_date):
-            print("⚠️ Already executed today. Use force=True to override.")
-            return {
-                "success": False,
-                "message": "Already executed today",
-                "date": execution_date
-            }
-
-        # Get active monthly plan
-        plan = self.storage.get_active_plan(brand_name)
-        if not plan:
+        # Check for an active monthly plan (ID only, the plan itself is not needed)
+        plan_id = self.storage.get_active_plan_id(brand_name)
+        if not plan_id:
             print("❌ No active monthly plan found")
             return {
                 "success": False,
@@ -206,8 +217,8 @@ class OrchestratorAgentV2:
                 "date": execution_date
             }
 
-        # Get today's posts
-        daily_posts = self.storage.get_daily_posts(brand_name, execution_date)
+        # Get today's posts, filtered by platforms if specified
+        daily_posts = self.storage.get_daily_posts(brand_name, execution_date, platforms=platforms)
         if not daily_posts:
             print(f"❌ No posts scheduled for {execution_date}")
             return {
@@ -216,11 +227,48 @@ class OrchestratorAgentV2:
                 "date": execution_date
             }
 
-        # Filter by platforms if specified
-        if platforms:
-            daily_posts = [p for p in daily_posts if p.platform in platforms]
+        # Checkpoint every post (slot = index among the platform's posts of the day, which
+        # the platform filter does not change). Posts already posted by an earlier,
+        # possibly interrupted run are skipped unless forced. A dry run previews every
+        # post and writes no checkpoint, so it never makes a later live run skip a post.
+        slots = []
+        per_platform: Dict[Platform, int] = {}
+        for post in daily_posts:
+            slots.append((post.platform, per_platform.get(post.platform, 0)))
+            per_platform[post.platform] = slots[-1][1] + 1
+        posted = set() if dry_run else {
+            (checkpoint.platform, checkpoint.slot)
+            for checkpoint in self.storage.start_checkpoints(brand_name, execution_date, slots, reset=force)
+            if checkpoint.status == CheckpointStatus.POSTED
+        }
+        remaining = [(post, slot) for post, slot in zip(daily_posts, slots) if slot not in posted]
+
+        def checkpoint(platform: Platform, slot: int, status: CheckpointStatus, **fields: Any) -> None:
+            if not dry_run:
+                self.storage.update_checkpoint(brand_name, execution_date, platform, slot, status, **fields)
+        if not remaining:
+            print("⚠️ Already executed today. Use force=True to override.")
+            return {
+                "success": False,
+                "message": "Already executed today",
+                "date": execution_date
+            }
 
-        print(f"📋 Found {len(daily_posts)} posts to execute")
+        print(f"📋 Found {len(daily_posts)} posts, {len(remaining)} to execute")
+
+        # Per-platform progress and timings, reported while the run advances
+        platform_progress: Dict[str, Dict[str, Any]] = {}
+        for post, slot in zip(daily_posts, slots):
+            entry = platform_progress.setdefault(post.platform.value, {
+                "status": CheckpointStatus.PENDING.value, "scheduled": 0, "already_posted": 0,
+                "posted": 0, "failed": 0, "started_at": None, "finished_at": None, "duration_seconds": 0.0
+            })
+            entry["scheduled"] += 1
+            if slot in posted:
+                entry["already_posted"] += 1
+        for entry in platform_progress.values():
+            if entry["already_posted"] == entry["scheduled"]:
+                entry["status"] = CheckpointStatus.POSTED.value
 
         # Gather signals
         signals = self.gather_signals(brand_name)
@@ -232,9 +280,17 @@ class OrchestratorAgentV2:
         posts_failed = 0
         errors = []
 
-        for post in daily_posts:
+        for index, (post, (platform, slot)) in enumerate(remaining):
+            report(f"posting_{platform.value.lower()}", 5 + 90 * index // len(remaining),
+                   {"platforms": platform_progress})
+            entry = platform_progress[platform.value]
+            entry["status"] = CheckpointStatus.GENERATING.value
+            started = datetime.now()
+            entry["started_at"] = entry["started_at"] or started.isoformat()
+
             posts_attempted += 1
             print(f"🔄 Processing {post.platform.value} post with startup context...")
+            checkpoint(platform, slot, CheckpointStatus.GENERATING)
 
             # Create content package with startup info
             package = self.create_content_package(
@@ -243,20 +299,36 @@ class OrchestratorAgentV2:
                 execution_date,
                 startup_name=startup_name or self.startup_name,
                 startup_url=startup_url or self.startup_url,
-                startup_context=startup_context or self.startup_context
+                startup_context=startup_context or self.startup_context,
+                brand_name=brand_name
             )
 
             # Dispatch to channel agent
-            result = self.dispatch_to_channel(package, dry_run)
+            result = self.dispatch_to_channel(package, dry_run, startup_context=startup_context)
 
             if result.success:
                 posts_succeeded += 1
+                checkpoint(platform, slot, CheckpointStatus.POSTED, post_id=result.post_id,
+                           post_url=result.post_url)
                 print(f"  ✅ Successfully posted to {post.platform.value} with startup context")
             else:
                 posts_failed += 1
+                checkpoint(platform, slot, CheckpointStatus.FAILED, error=result.error)
                 print(f"  ❌ Failed to post to {post.platform.value}: {result.error}")
                 errors.append(f"{post.platform.value}: {result.error}")
 
+            finished = datetime.now()
+            entry["posted" if result.success else "failed"] += 1
+            entry["finished_at"] = finished.isoformat()
+            entry["duration_seconds"] = round(entry["duration_seconds"] + (finished - started).total_seconds(), 3)
+            if entry["already_posted"] + entry["posted"] + entry["failed"] == entry["scheduled"]:
+                entry["status"] = (CheckpointStatus.FAILED if entry["failed"] else CheckpointStatus.POSTED).value
+
+        if not dry_run:
+            self.storage.record_orchestrator_run(execution_date, posts_attempted, posts_succeeded,
+                                                 posts_failed, errors)
+        report("done", 100, {"platforms": platform_progress})
+
         # Generate summary
         print(f"EXECUTION SUMMARY")
         print(f"Posts Attempted: {posts_attempted}")
@@ -270,10 +342,13 @@ class OrchestratorAgentV2:
             "success": posts_failed == 0,
             "date": execution_date,
             "stats": {
+                "scheduled": len(daily_posts),
+                "already_posted": len(daily_posts) - len(remaining),
                 "attempted": posts_attempted,
                 "succeeded": posts_succeeded,
                 "failed": posts_failed
             },
+            "platforms": platform_progress,
             "startup_info": {
                 "name": startup_name or self.startup_name,
                 "url": startup_url or self.startup_url,
@@ -283,20 +358,21 @@ class OrchestratorAgentV2:
         }
 
     def get_execution_status(self, brand_name: str, date: Optional[str] = None) -> Dict[str, Any]:
-        """Get execution status for a date"""
+        """Get execution status for a date (one grouped query over the brand's post checkpoints)"""
         if not date:
             date = datetime.now().strftime("%Y-%m-%d")
 
-        # Get orchestrator state
-        state = self.storage.get_orchestrator_state(date)
+        summary = self.storage.get_checkpoint_summary(brand_name, date)
 
         return {
             "date": date,
-            "has_run": state is not None,
-            "is_running": state.is_running if state else False,
-            "posts_completed": len(state.posts_completed_today) if state else 0,
-            "posts_failed": len(state.failed_posts) if state else 0,
-            "last_execution": state.last_execution if state else None
+            "has_run": summary["total"] > summary[CheckpointStatus.PENDING.value],
+            "is_running": summary[CheckpointStatus.GENERATING.value] > 0,
+            "posts_scheduled": summary["total"],
+            "posts_pending": summary[CheckpointStatus.PENDING.value],
+            "posts_completed": summary[CheckpointStatus.POSTED.value],
+            "posts_failed": summary[CheckpointStatus.FAILED.value],
+            "last_execution": summary["last_update"]
         }
 
 
@@ -309,10 +385,15 @@ def execute_daily_orchestration(
     platforms: Optional[List[str]] = None,
     startup_name: Optional[str] = None,
     startup_url: Optional[str] = None,
-    startup_context: Optional[str] = None
+    startup_context: Optional[str] = None,
+    progress: Optional[Callable[..., None]] = None,
+    agent: Optional[OrchestratorAgentV2] = None
 ) -> Dict[str, Any]:
-    """Execute daily orchestration with startup context"""
-    orchestrator = OrchestratorAgentV2(
+    """Execute daily orchestration with startup context (progress: see OrchestratorAgentV2.execute_daily)
+
+    agent: shared orchestrator (e.g. from the agent registry); a new one is built if None
+    """
+    orchestrator = agent or OrchestratorAgentV2(
         startup_name=startup_name,
         startup_url=startup_url,
         startup_context=startup_context
@@ -331,7 +412,8 @@ def execute_daily_orchestration(
         platforms=platform_enums,
         startup_name=startup_name,
         startup_url=startup_url,
-        startup_context=startup_context
+        startup_context=startup_context,
+        progress=progress
     )
 
 
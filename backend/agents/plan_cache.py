@@ -0,0 +1,208 @@
+"""
+In-process caches of monthly plans for the Social CM Orchestrator Suite
+Avoids re-parsing and re-validating the same plan JSON on every read, and
+re-serializing the same plan on every API response
+"""
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Any
+
+from agents.models import MonthlyPlan
+from agents.model_loading import load_json
+
+
+class PlanCache:
+    """Bounded LRU + TTL cache of monthly plans keyed by brand
+
+    Each entry remembers the plan version it was loaded at. Versions live in
+    SQLite, so a plan saved by another worker process invalidates this
+    process's entry on the next lookup. Entries hold the plan's JSON and every
+    hit builds a new MonthlyPlan from it, so a caller editing its plan never
+    changes what the next caller gets (one validation pass, cheaper than a
+    deep copy and than the database read and decompression it replaces).
+    """
+
+    def __init__(self, max_entries: int = 64, ttl_seconds: float = 300.0):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of brands kept in memory
+            ttl_seconds: Entry lifetime in seconds (0 disables expiry)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get(self, brand_name: str, version: int) -> Optional[MonthlyPlan]:
+        """
+        Get a cached plan if it is still at the given version
+
+        Args:
+            brand_name: Brand name
+            version: Current plan version stored in the database
+
+        Returns:
+            Copy of the cached plan, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(brand_name)
+            if entry is not None:
+                cached_version, plan_json, loaded_at = entry
+                expired = self.ttl_seconds and time.monotonic() - loaded_at > self.ttl_seconds
+                if cached_version == version and not expired:
+                    self._entries.move_to_end(brand_name)
+                    self._stats['hits'] += 1
+                else:
+                    # Stale version or expired entry
+                    del self._entries[brand_name]
+                    self._stats['invalidations'] += 1
+                    entry = None
+
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+        # Built outside the lock, so concurrent hits are not serialized
+        return load_json(MonthlyPlan, plan_json)
+
+    def put(self, brand_name: str, version: int, plan: MonthlyPlan):
+        """
+        Store a plan at a given version
+
+        Args:
+            brand_name: Brand name
+            version: Plan version the plan was loaded at
+            plan: Parsed plan (later changes to it are not cached)
+        """
+        plan_json = plan.model_dump_json()
+        with self._lock:
+            existing = self._entries.get(brand_name)
+            if existing is not None and existing[0] > version:
+                # A newer version was cached concurrently, keep it
+                return
+
+            self._entries[brand_name] = (version, plan_json, time.monotonic())
+            self._entries.move_to_end(brand_name)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, brand_name: Optional[str] = None):
+        """
+        Drop one brand's entry, or every entry when no brand is given
+
+        Args:
+            brand_name: Brand name (optional)
+        """
+        with self._lock:
+            if brand_name is None:
+                self._stats['invalidations'] += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(brand_name, None) is not None:
+                self._stats['invalidations'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit, miss and eviction counters"""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0
+            }
+
+
+def plan_etag(brand_name: str, version: int, plan_id: Optional[str]) -> str:
+    """
+    Build the HTTP entity tag of a brand's active plan
+
+    The version changes on every save; the plan ID (which embeds the save time)
+    keeps tags distinct if the version counter ever starts over (e.g. a new database).
+
+    Args:
+        brand_name: Brand name
+        version: Active plan version
+        plan_id: Active plan ID
+
+    Returns:
+        Quoted strong ETag
+    """
+    digest = hashlib.sha256(f"{brand_name}\0{plan_id}".encode()).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+class PlanResponseCache:
+    """Bounded LRU cache of serialized plan responses keyed by ETag
+
+    A tag names one version of one brand's plan, so entries never go stale;
+    bodies of superseded versions are simply evicted as new ones come in.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of bodies kept in memory
+        """
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, etag: str) -> Optional[bytes]:
+        """
+        Get a cached response body
+
+        Args:
+            etag: Entity tag of the plan version
+
+        Returns:
+            Serialized body or None on a miss
+        """
+        with self._lock:
+            body = self._entries.get(etag)
+            if body is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(etag)
+            self._stats['hits'] += 1
+            return body
+
+    def put(self, etag: str, body: bytes):
+        """
+        Store a response body
+
+        Args:
+            etag: Entity tag of the plan version
+            body: Serialized body
+        """
+        with self._lock:
+            self._entries[etag] = body
+            self._entries.move_to_end(etag)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit, miss and eviction counters, and the memory held by the bodies"""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'size': len(self._entries),
+                'bytes': sum(len(body) for body in self._entries.values()),
+                'max_entries': self.max_entries,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0
+            }
@@ -0,0 +1,158 @@
+"""
+Pluggable encodings for stored monthly plans
+Each stored plan carries a format tag so codecs can change without rewriting old rows
+"""
+
+import json
+import zlib
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from agents.models import MonthlyPlan
+from agents.model_loading import load_json, load_object
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class PlanCodec(NamedTuple):
+    """Encoder/decoder pair registered under a format tag"""
+    encode: Callable[[MonthlyPlan], bytes]
+    decode: Callable[[bytes], MonthlyPlan]
+
+
+def _json_encode(plan: MonthlyPlan) -> bytes:
+    return plan.model_dump_json().encode('utf-8')
+
+
+def _json_decode(data: bytes) -> MonthlyPlan:
+    return load_json(MonthlyPlan, data)
+
+
+CODECS: Dict[str, PlanCodec] = {
+    "json": PlanCodec(_json_encode, _json_decode),
+    "json+zlib": PlanCodec(
+        lambda plan: zlib.compress(_json_encode(plan), 6),
+        lambda data: _json_decode(zlib.decompress(data))
+    ),
+}
+
+if zstandard is not None:
+    # Compressor objects are not thread-safe, build them per call (cheap at level 3)
+    def _zstd_compress(data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+
+    def _zstd_decompress(data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+    CODECS["json+zstd"] = PlanCodec(
+        lambda plan: _zstd_compress(_json_encode(plan)),
+        lambda data: _json_decode(_zstd_decompress(data))
+    )
+
+if msgpack is not None:
+    def _msgpack_encode(plan: MonthlyPlan) -> bytes:
+        return msgpack.packb(plan.model_dump(mode='json'))
+
+    def _msgpack_decode(data: bytes) -> MonthlyPlan:
+        return load_object(MonthlyPlan, msgpack.unpackb(data))
+
+    CODECS["msgpack"] = PlanCodec(_msgpack_encode, _msgpack_decode)
+    if zstandard is not None:
+        CODECS["msgpack+zstd"] = PlanCodec(
+            lambda plan: _zstd_compress(_msgpack_encode(plan)),
+            lambda data: _msgpack_decode(_zstd_decompress(data))
+        )
+
+# Best available format for new rows
+DEFAULT_FORMAT = "json+zstd" if "json+zstd" in CODECS else "json+zlib"
+
+
+def available_formats() -> List[str]:
+    """Get the format tags usable in this environment"""
+    return list(CODECS)
+
+
+def get_codec(plan_format: str) -> PlanCodec:
+    """
+    Get the codec registered for a format tag
+
+    Raises:
+        ValueError: If the format is unknown or its optional dependency is missing
+    """
+    try:
+        return CODECS[plan_format]
+    except KeyError:
+        raise ValueError(f"Unsupported plan format '{plan_format}' "
+                         f"(available: {', '.join(CODECS)})") from None
+
+
+def _compression(plan_format: str) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """Get the (compress, decompress) pair named by a format tag's suffix"""
+    get_codec(plan_format)
+    if plan_format.endswith('+zstd'):
+        return _zstd_compress, _zstd_decompress
+    if plan_format.endswith('+zlib'):
+        return (lambda data: zlib.compress(data, 6)), zlib.decompress
+    return (lambda data: data), (lambda data: data)
+
+
+def encode_document(data: Any, plan_format: Optional[str] = None) -> bytes:
+    """
+    Encode a JSON-compatible value (e.g. a plan delta) like plans of a format
+
+    Args:
+        data: Value to encode
+        plan_format: Format tag (defaults to DEFAULT_FORMAT)
+
+    Returns:
+        Encoded bytes
+    """
+    plan_format = plan_format or DEFAULT_FORMAT
+    compress, _ = _compression(plan_format)
+    if plan_format.startswith('msgpack'):
+        return compress(msgpack.packb(data))
+    return compress(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_document(plan_format: str, data: bytes) -> Any:
+    """Decode a value encoded with encode_document"""
+    _, decompress = _compression(plan_format)
+    if plan_format.startswith('msgpack'):
+        return msgpack.unpackb(decompress(data))
+    return json.loads(decompress(data))
+
+
+def encode_plan(plan: MonthlyPlan, plan_format: Optional[str] = None) -> Tuple[str, bytes]:
+    """
+    Encode a plan for storage
+
+    Args:
+        plan: Plan to encode
+        plan_format: Format tag (defaults to DEFAULT_FORMAT)
+
+    Returns:
+        Tuple of (format tag, encoded bytes)
+    """
+    plan_format = plan_format or DEFAULT_FORMAT
+    return plan_format, get_codec(plan_format).encode(plan)
+
+
+def decode_plan(plan_format: str, data: bytes) -> MonthlyPlan:
+    """
+    Decode a stored plan
+
+    Args:
+        plan_format: Format tag stored with the plan
+        data: Encoded bytes
+
+    Returns:
+        Decoded monthly plan
+    """
+    return get_codec(plan_format).decode(data)
@@ -0,0 +1,114 @@
+"""
+Calendar-post level diffs between plan versions
+A plan version is stored either as a full snapshot or as a delta against the previous version
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+def post_key(post: Dict[str, Any], occurrence: int = 0) -> str:
+    """Identity of a calendar post inside a plan: date, platform and repeat index"""
+    return f"{post['date']}|{post['platform']}|{occurrence}"
+
+
+def _keyed_posts(posts: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Map posts by key, preserving calendar order"""
+    seen: Dict[tuple, int] = {}
+    keyed = {}
+    for post in posts:
+        slot = (post['date'], post['platform'])
+        keyed[post_key(post, seen.get(slot, 0))] = post
+        seen[slot] = seen.get(slot, 0) + 1
+    return keyed
+
+
+def _header(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Plan fields other than the calendar posts"""
+    header = {key: value for key, value in plan.items() if key != 'calendar'}
+    header['calendar'] = {key: value for key, value in plan['calendar'].items() if key != 'posts'}
+    return header
+
+
+def diff_plans(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute the delta turning one plan into another
+
+    Args:
+        old: Previous plan (model_dump(mode='json'))
+        new: New plan (model_dump(mode='json'))
+
+    Returns:
+        Delta with changed header, upserted posts, deleted post keys and,
+        only when it cannot be inferred, the new post order
+    """
+    old_posts = _keyed_posts(old['calendar']['posts'])
+    new_posts = _keyed_posts(new['calendar']['posts'])
+
+    delta: Dict[str, Any] = {
+        'set': {key: post for key, post in new_posts.items() if old_posts.get(key) != post},
+        'del': [key for key in old_posts if key not in new_posts],
+    }
+
+    new_header = _header(new)
+    if _header(old) != new_header:
+        delta['header'] = new_header
+
+    # apply_delta keeps surviving posts in place and appends new ones
+    inferred = [key for key in old_posts if key in new_posts]
+    inferred += [key for key in new_posts if key not in old_posts]
+    if inferred != list(new_posts):
+        delta['order'] = list(new_posts)
+
+    return delta
+
+
+def apply_delta(plan: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a delta produced by diff_plans
+
+    Args:
+        plan: Plan the delta was computed against (not modified)
+        delta: Delta to apply
+
+    Returns:
+        The next plan version
+    """
+    posts = _keyed_posts(plan['calendar']['posts'])
+    for key in delta['del']:
+        posts.pop(key, None)
+    posts.update(delta['set'])
+    if 'order' in delta:
+        posts = {key: posts[key] for key in delta['order']}
+
+    header = delta.get('header') or _header(plan)
+    result = {key: value for key, value in header.items() if key != 'calendar'}
+    result['calendar'] = dict(header['calendar'], posts=list(posts.values()))
+    return result
+
+
+def changed_fraction(delta: Dict[str, Any], post_count: int) -> float:
+    """Share of calendar posts a delta rewrites or removes"""
+    return (len(delta['set']) + len(delta['del'])) / max(post_count, 1)
+
+
+def needs_snapshot(version: int, base_version: Optional[int], delta: Optional[Dict[str, Any]],
+                   post_count: int, snapshot_interval: int, max_changed_fraction: float = 0.5) -> bool:
+    """
+    Decide whether a version is stored as a full snapshot
+
+    Args:
+        version: Version being stored
+        base_version: Snapshot the previous version is rebuilt from (None if no history)
+        delta: Delta against the previous version (None if unavailable)
+        post_count: Number of posts in the new plan
+        snapshot_interval: Maximum versions between snapshots (bounds rebuild cost)
+        max_changed_fraction: Above this share of changed posts a delta is not worth it
+
+    Returns:
+        True to store a snapshot
+    """
+    if base_version is None or delta is None:
+        return True
+    if version - base_version >= snapshot_interval:
+        return True
+    return changed_fraction(delta, post_count) > max_changed_fraction
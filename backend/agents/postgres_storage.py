@@ -0,0 +1,1380 @@
+"""
+PostgreSQL storage backend for the Social CM Orchestrator Suite
+Shares one database between API and orchestrator processes on several nodes,
+with a psycopg connection pool and batched writes
+"""
+
+import os
+import json
+import hashlib
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import List, Dict, Optional, Any, Iterable, Tuple
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    psycopg = None
+
+from agents.blob_store import iter_base64_chunks
+from agents.model_loading import load_json, load_json_rows, load_object, load_rows
+from agents.plan_cache import PlanCache
+from agents.plan_codec import DEFAULT_FORMAT, encode_plan, decode_plan, get_codec
+from agents.metric_rollups import COUNTERS, RESOLUTIONS
+from agents.near_duplicates import minhash, similarity, signature_to_bytes, signature_from_bytes
+from agents.storage_backend import summarize_checkpoints, summarize_performance, yesterday_performance
+from agents.models import (
+    MonthlyPlan,
+    PostRecord,
+    PerformanceMetrics,
+    OrchestratorState,
+    CheckpointStatus,
+    PostCheckpoint,
+    Job,
+    JobStatus,
+    Platform,
+    DailyPost
+)
+
+# Serializes schema creation when several processes start at once
+SCHEMA_LOCK_ID = 0x50435343
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS brand_plan_versions (
+        brand_name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        plan_id TEXT,
+        updated_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS monthly_plans (
+        id TEXT PRIMARY KEY,
+        brand_name TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        start_date TEXT,
+        end_date TEXT,
+        created_at TEXT,
+        is_active BOOLEAN NOT NULL DEFAULT FALSE,
+        plan_format TEXT NOT NULL,
+        plan_blob BYTEA NOT NULL,
+        UNIQUE (brand_name, version)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_monthly_plans_active
+    ON monthly_plans(brand_name) WHERE is_active
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS calendar_posts (
+        plan_id TEXT NOT NULL REFERENCES monthly_plans(id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        platform TEXT NOT NULL,
+        post_json TEXT NOT NULL,
+        PRIMARY KEY (plan_id, position)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_calendar_posts_plan_date ON calendar_posts(plan_id, date)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS posted_content (
+        id TEXT PRIMARY KEY,
+        date TEXT NOT NULL,
+        platform TEXT NOT NULL,
+        post_id TEXT,
+        content_hash TEXT NOT NULL UNIQUE,
+        content TEXT,
+        posted_at TEXT,
+        success BOOLEAN NOT NULL,
+        error TEXT,
+        record_json TEXT NOT NULL,
+        brand_name TEXT,
+        signature BYTEA,
+        UNIQUE (date, platform)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_posted_content_post_id ON posted_content(post_id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_posted_content_brand_date ON posted_content(brand_name, date)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS performance_metrics (
+        id BIGSERIAL PRIMARY KEY,
+        post_id TEXT NOT NULL,
+        platform TEXT NOT NULL,
+        measured_at TEXT NOT NULL,
+        impressions BIGINT NOT NULL DEFAULT 0,
+        engagements BIGINT NOT NULL DEFAULT 0,
+        clicks BIGINT NOT NULL DEFAULT 0,
+        shares BIGINT NOT NULL DEFAULT 0,
+        comments BIGINT NOT NULL DEFAULT 0,
+        likes BIGINT NOT NULL DEFAULT 0,
+        engagement_rate DOUBLE PRECISION NOT NULL DEFAULT 0,
+        UNIQUE (post_id, measured_at)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_performance_metrics_measured_at ON performance_metrics(measured_at)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS orchestrator_runs (
+        run_date TEXT PRIMARY KEY,
+        started_at TEXT,
+        completed_at TEXT,
+        posts_attempted INTEGER,
+        posts_succeeded INTEGER,
+        posts_failed INTEGER,
+        errors TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS orchestrator_states (
+        date TEXT PRIMARY KEY,
+        state_json TEXT NOT NULL,
+        updated_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS post_checkpoints (
+        run_date TEXT NOT NULL,
+        brand_name TEXT NOT NULL,
+        platform TEXT NOT NULL,
+        slot INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        post_id TEXT,
+        post_url TEXT,
+        error TEXT,
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (run_date, brand_name, platform, slot)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_post_checkpoints_status
+    ON post_checkpoints(run_date, brand_name, status, updated_at)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        status TEXT NOT NULL,
+        stage TEXT,
+        progress INTEGER NOT NULL DEFAULT 0,
+        request_json TEXT NOT NULL,
+        result_json TEXT,
+        error TEXT,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        owner TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        heartbeat_at TEXT
+    )
+    """,
+    """
+    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS details_json TEXT
+    """,
+    """
+    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS cancel_requested BOOLEAN NOT NULL DEFAULT FALSE
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at)
+    """,
+    """
+    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS concurrency_key TEXT
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_jobs_concurrency_key ON jobs(kind, concurrency_key, status)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS image_blobs (
+        sha256 TEXT PRIMARY KEY,
+        ext TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        data BYTEA NOT NULL,
+        created_at TEXT NOT NULL,
+        touched_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS post_images (
+        record_id TEXT NOT NULL,
+        sha256 TEXT NOT NULL,
+        platform TEXT,
+        date TEXT,
+        PRIMARY KEY (record_id, sha256)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_post_images_sha256 ON post_images(sha256)
+    """,
+]
+
+# Bucket of a measured_at column, kept equivalent to metric_rollups.bucket_start()
+BUCKET_SQL = {
+    "hour": "substr({col}, 1, 10) || 'T' || COALESCE(NULLIF(substr({col}, 12, 2), ''), '00') || ':00:00'",
+    "day": "substr({col}, 1, 10)",
+    "week": "to_char(date_trunc('week', substr({col}, 1, 10)::date), 'YYYY-MM-DD')",
+}
+
+
+class PostgresStorage:
+    """StorageBackend on PostgreSQL
+
+    Every operation borrows a connection from a psycopg pool and commits
+    before returning it. Plans are stored encoded (see agents.plan_codec),
+    one row per version; metrics are inserted one batch per statement and
+    series are aggregated by the server; images are kept in the database so
+    every node sees them.
+    """
+
+    def __init__(self, dsn: Optional[str] = None, min_size: int = 1,
+                 max_size: Optional[int] = None, plan_format: Optional[str] = None,
+                 plan_cache_size: int = 64, plan_cache_ttl: float = 300.0):
+        """
+        Initialize the backend and create missing tables
+
+        Args:
+            dsn: Connection string (defaults to DATABASE_URL)
+            min_size: Connections kept open by the pool
+            max_size: Maximum pooled connections (defaults to POSTGRES_POOL_SIZE, then 10)
+            plan_format: Codec for newly saved plans, see agents.plan_codec
+                (defaults to STORAGE_PLAN_FORMAT, then the best available codec)
+            plan_cache_size: Maximum number of brands in the active plan cache
+            plan_cache_ttl: Active plan cache entry lifetime in seconds
+
+        Raises:
+            ImportError: If psycopg or psycopg-pool is not installed
+            ValueError: If no connection string is configured
+        """
+        if psycopg is None:
+            raise ImportError("The postgres storage backend requires psycopg and psycopg-pool "
+                              "(pip install 'psycopg[binary]' psycopg-pool)")
+
+        dsn = dsn or os.environ.get('DATABASE_URL')
+        if not dsn:
+            raise ValueError("No PostgreSQL connection string, set DATABASE_URL")
+
+        self.plan_format = plan_format or os.environ.get('STORAGE_PLAN_FORMAT') or DEFAULT_FORMAT
+        get_codec(self.plan_format)
+
+        self.pool = ConnectionPool(
+            dsn,
+            min_size=min_size,
+            max_size=max_size or int(os.environ.get('POSTGRES_POOL_SIZE', 10)),
+            kwargs={'row_factory': dict_row},
+            open=True
+        )
+        self.plan_cache = PlanCache(max_entries=plan_cache_size, ttl_seconds=plan_cache_ttl)
+        self._init_database()
+
+    def _init_database(self):
+        """Create missing tables and indexes"""
+        with self.pool.connection() as conn:
+            conn.execute("SELECT pg_advisory_xact_lock(%s)", (SCHEMA_LOCK_ID,))
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def close(self):
+        """Close all pooled connections"""
+        self.pool.close()
+
+    # Strategy Management
+    def save_monthly_plan(self, plan: MonthlyPlan) -> str:
+        """
+        Save a monthly plan as the brand's new active version
+
+        Args:
+            plan: Monthly plan to save
+
+        Returns:
+            Plan ID
+        """
+        plan_id = f"plan_{plan.brand_name}_{plan.calendar.start_date}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        plan_format, plan_blob = encode_plan(plan, self.plan_format)
+
+        with self.pool.connection() as conn:
+            # Bumping the version row locks it, so saves of one brand are serialized
+            version = conn.execute("""
+                INSERT INTO brand_plan_versions (brand_name, version, plan_id, updated_at)
+                VALUES (%s, 1, %s, %s)
+                ON CONFLICT (brand_name) DO UPDATE SET
+                    version = brand_plan_versions.version + 1,
+                    plan_id = EXCLUDED.plan_id,
+                    updated_at = EXCLUDED.updated_at
+                RETURNING version
+            """, (plan.brand_name, plan_id, datetime.now().isoformat())).fetchone()['version']
+
+            conn.execute("""
+                UPDATE monthly_plans SET is_active = FALSE
+                WHERE brand_name = %s AND is_active
+            """, (plan.brand_name,))
+            conn.execute("""
+                INSERT INTO monthly_plans
+                (id, brand_name, version, start_date, end_date, created_at, is_active,
+                 plan_format, plan_blob)
+                VALUES (%s, %s, %s, %s, %s, %s, TRUE, %s, %s)
+            """, (plan_id, plan.brand_name, version, plan.calendar.start_date,
+                  plan.calendar.end_date, plan.created_at, plan_format, plan_blob))
+
+            with conn.cursor() as cursor:
+                cursor.executemany("""
+                    INSERT INTO calendar_posts (plan_id, position, date, platform, post_json)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, [
+                    (plan_id, position, post.date, post.platform.value, post.model_dump_json())
+                    for position, post in enumerate(plan.calendar.posts)
+                ])
+
+        # Write-through: the saved plan becomes the cached active plan
+        self.plan_cache.put(plan.brand_name, version, plan)
+        return plan_id
+
+    def get_active_plan(self, brand_name: str) -> Optional[MonthlyPlan]:
+        """
+        Get the active monthly plan for a brand
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            Active monthly plan or None
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute("""
+                SELECT version FROM brand_plan_versions WHERE brand_name = %s
+            """, (brand_name,)).fetchone()
+            version = row['version'] if row else 0
+            cached = self.plan_cache.get(brand_name, version)
+            if cached is not None:
+                return cached
+
+            row = conn.execute("""
+                SELECT plan_format, plan_blob FROM monthly_plans
+                WHERE brand_name = %s AND is_active
+                ORDER BY version DESC LIMIT 1
+            """, (brand_name,)).fetchone()
+
+        if row is None:
+            return None
+        plan = decode_plan(row['plan_format'], bytes(row['plan_blob']))
+        self.plan_cache.put(brand_name, version, plan)
+        return plan
+
+    def get_active_plan_version(self, brand_name: str) -> Tuple[int, Optional[str]]:
+        """
+        Get the version of a brand's active plan without loading it (changes whenever a plan is saved)
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            (version, plan ID), or (0, None) if the brand has no versioned plan
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute("""
+                SELECT version, plan_id FROM brand_plan_versions WHERE brand_name = %s
+            """, (brand_name,)).fetchone()
+        return (row['version'], row['plan_id']) if row else (0, None)
+
+    def get_active_plan_id(self, brand_name: str) -> Optional[str]:
+        """
+        Get the ID of the active monthly plan for a brand without loading it
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            Active plan ID or None
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute("""
+                SELECT id FROM monthly_plans
+                WHERE brand_name = %s AND is_active
+                ORDER BY version DESC LIMIT 1
+            """, (brand_name,)).fetchone()
+        return row['id'] if row else None
+
+    def get_daily_posts(self, brand_name: str, target_date: str,
+                        platforms: Optional[List[Platform]] = None) -> List[DailyPost]:
+        """
+        Get posts scheduled for a specific date
+
+        Args:
+            brand_name: Brand name
+            target_date: Target date (YYYY-MM-DD)
+            platforms: Optional platform filter
+
+        Returns:
+            List of daily posts
+        """
+        params: List[Any] = [brand_name, target_date]
+        platform_filter = ""
+        if platforms:
+            platform_filter = "AND platform = ANY(%s)"
+            params.append([platform.value for platform in platforms])
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(f"""
+                SELECT post_json FROM calendar_posts
+                WHERE plan_id = (
+                    SELECT id FROM monthly_plans
+                    WHERE brand_name = %s AND is_active
+                    ORDER BY version DESC LIMIT 1
+                ) AND date = %s {platform_filter}
+                ORDER BY position
+            """, params).fetchall()
+
+        return load_json_rows(DailyPost, (row['post_json'] for row in rows))
+
+    def get_plan(self, plan_id: str) -> Optional[MonthlyPlan]:
+        """
+        Get a monthly plan by ID, active or superseded
+
+        Args:
+            plan_id: Plan ID
+
+        Returns:
+            Monthly plan or None
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute("""
+                SELECT plan_format, plan_blob FROM monthly_plans WHERE id = %s
+            """, (plan_id,)).fetchone()
+        return decode_plan(row['plan_format'], bytes(row['plan_blob'])) if row else None
+
+    def get_plan_at_version(self, brand_name: str, version: int) -> Optional[MonthlyPlan]:
+        """
+        Get a brand's plan as it was at a given version
+
+        Args:
+            brand_name: Brand name
+            version: Plan version (see list_plan_versions)
+
+        Returns:
+            Monthly plan or None if the version does not exist
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute("""
+                SELECT plan_format, plan_blob FROM monthly_plans
+                WHERE brand_name = %s AND version = %s
+            """, (brand_name, version)).fetchone()
+        return decode_plan(row['plan_format'], bytes(row['plan_blob'])) if row else None
+
+    def list_plan_versions(self, brand_name: str) -> List[Dict[str, Any]]:
+        """
+        List the plan versions of a brand
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            Versions, newest first (every version is a full snapshot)
+        """
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                SELECT version, id AS plan_id, 'snapshot' AS kind, version AS base_version,
+                       plan_format, octet_length(plan_blob) AS size, created_at
+                FROM monthly_plans
+                WHERE brand_name = %s
+                ORDER BY version DESC
+            """, (brand_name,)).fetchall()
+
+    def warm_plan_cache(self) -> int:
+        """
+        Load the active plan of every brand into the plan cache
+
+        Returns:
+            Number of plans loaded
+        """
+        with self.pool.connection() as conn:
+            brands = [row['brand_name'] for row in conn.execute("""
+                SELECT brand_name FROM monthly_plans WHERE is_active LIMIT %s
+            """, (self.plan_cache.max_entries,))]
+
+        return sum(1 for brand in brands if self.get_active_plan(brand) is not None)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get plan cache and connection pool counters"""
+        return {
+            'backend': 'postgres',
+            'plan_cache': self.plan_cache.get_stats(),
+            'db_pool': self.pool.get_stats()
+        }
+
+    # Idempotency and Deduplication
+    def has_been_posted(self, date: str, platform: Platform) -> bool:
+        """
+        Check if content has already been posted for a date/platform (by any brand)
+
+        Args:
+            date: Date (YYYY-MM-DD)
+            platform: Platform
+
+        Returns:
+            True if already posted
+        """
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                SELECT 1 FROM posted_content
+                WHERE date = %s AND platform = %s AND success
+            """, (date, platform.value)).fetchone() is not None
+
+    def get_content_hash(self, content: str) -> str:
+        """
+        Generate hash for content deduplication
+
+        Args:
+            content: Content to hash
+
+        Returns:
+            Content hash
+        """
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def is_duplicate_content(self, content: str) -> bool:
+        """
+        Check if content is duplicate
+
+        Args:
+            content: Content to check
+
+        Returns:
+            True if duplicate
+        """
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                SELECT 1 FROM posted_content WHERE content_hash = %s
+            """, (self.get_content_hash(content),)).fetchone() is not None
+
+    def find_near_duplicates(self, content: str, brand_name: Optional[str] = None,
+                             platform: Optional[Platform] = None, days: int = 30,
+                             threshold: float = 0.5, limit: int = 5,
+                             reference_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find recently posted content similar to a text
+
+        Compares the MinHash signature with the signatures of the brand's posts
+        in the look-back window, read through the (brand_name, date) index
+        (brand_name=None only matches posts recorded without a brand).
+
+        Args:
+            content: Text about to be posted
+            brand_name: Brand the post belongs to
+            platform: Restrict matches to one platform (optional)
+            days: Look-back window in days
+            threshold: Minimum estimated Jaccard similarity of character 4-grams (0-1)
+            limit: Maximum number of matches
+            reference_date: End of the look-back window (defaults to today)
+
+        Returns:
+            Matches (record_id, post_id, platform, date, similarity), most similar first
+        """
+        signature = minhash(content)
+        end = datetime.strptime(reference_date, '%Y-%m-%d') if reference_date else datetime.now()
+        since = (end - timedelta(days=days)).strftime('%Y-%m-%d')
+
+        params: List[Any] = []
+        brand_filter = "brand_name IS NULL"
+        if brand_name is not None:
+            brand_filter = "brand_name = %s"
+            params.append(brand_name)
+        params.append(since)
+        platform_filter = ""
+        if platform:
+            platform_filter = "AND platform = %s"
+            params.append(platform.value)
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(f"""
+                SELECT id, post_id, platform, date, signature FROM posted_content
+                WHERE {brand_filter} AND date >= %s AND signature IS NOT NULL {platform_filter}
+            """, params).fetchall()
+
+        matches = []
+        for row in rows:
+            score = similarity(signature, signature_from_bytes(bytes(row['signature'])))
+            if score >= threshold:
+                matches.append({
+                    'record_id': row['id'],
+                    'post_id': row['post_id'],
+                    'platform': row['platform'],
+                    'date': row['date'],
+                    'similarity': score
+                })
+
+        matches.sort(key=lambda match: match['similarity'], reverse=True)
+        return matches[:limit]
+
+    # Post Recording
+    def record_post(self, record: PostRecord, brand_name: Optional[str] = None,
+                    retries: int = 3) -> bool:
+        """
+        Record a posted content, replacing posts with the same ID, date/platform or content hash
+
+        Args:
+            record: Post record
+            brand_name: Brand the post was published for (scopes near-duplicate lookups)
+            retries: Attempts when a concurrent insert takes the same date/platform or hash
+
+        Returns:
+            Success status
+        """
+        content = record.generated_post.content
+        signature = signature_to_bytes(minhash(content)) if content else None
+
+        for attempt in range(retries):
+            try:
+                with self.pool.connection() as conn:
+                    replaced = [row['id'] for row in conn.execute("""
+                        DELETE FROM posted_content
+                        WHERE id = %s OR (date = %s AND platform = %s) OR content_hash = %s
+                        RETURNING id
+                    """, (record.id, record.date, record.platform.value, record.content_hash))]
+
+                    # The record's own image references are kept, see save_image below
+                    released = [record_id for record_id in replaced if record_id != record.id]
+                    if released:
+                        conn.execute("DELETE FROM post_images WHERE record_id = ANY(%s)", (released,))
+
+                    conn.execute("""
+                        INSERT INTO posted_content
+                        (id, date, platform, post_id, content_hash, content, posted_at, success,
+                         error, record_json, brand_name, signature)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """, (
+                        record.id,
+                        record.date,
+                        record.platform.value,
+                        record.post_id,
+                        record.content_hash,
+                        content,
+                        record.posting_result.timestamp,
+                        record.posting_result.success,
+                        record.posting_result.error,
+                        record.model_dump_json(),
+                        brand_name,
+                        signature
+                    ))
+                break
+            except psycopg.errors.UniqueViolation:
+                if attempt == retries - 1:
+                    raise
+                time.sleep(0.01 * (attempt + 1))
+
+        # Reference the post's image so it is kept until the post is deleted
+        if record.generated_post.image_base64:
+            self.save_image(record.generated_post.image_base64, record.platform,
+                            record.date, record_id=record.id, brand_name=brand_name)
+
+        return True
+
+    def get_posted_content(self, start_date: str, end_date: str,
+                           platform: Optional[Platform] = None) -> List[PostRecord]:
+        """
+        Get posted content for a date range
+
+        Args:
+            start_date: Start date
+            end_date: End date
+            platform: Optional platform filter
+
+        Returns:
+            List of post records, newest first
+        """
+        params: List[Any] = [start_date, end_date]
+        platform_filter = ""
+        if platform:
+            platform_filter = "AND platform = %s"
+            params.append(platform.value)
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(f"""
+                SELECT record_json FROM posted_content
+                WHERE date >= %s AND date <= %s {platform_filter}
+                ORDER BY date DESC, posted_at DESC
+            """, params).fetchall()
+
+        return load_json_rows(PostRecord, (row['record_json'] for row in rows))
+
+    # Performance Metrics
+    def save_metrics(self, metrics: PerformanceMetrics) -> bool:
+        """
+        Save performance metrics
+
+        Args:
+            metrics: Performance metrics
+
+        Returns:
+            Success status
+        """
+        self.save_metrics_bulk([metrics])
+        return True
+
+    def save_metrics_bulk(self, metrics: Iterable[PerformanceMetrics],
+                          batch_size: int = 500,
+                          write_files: Optional[bool] = None) -> Dict[str, int]:
+        """
+        Save many performance metrics in a single transaction
+
+        Each batch is sent as one INSERT over unnested column arrays, so the
+        number of round trips does not grow with the batch size. Samples
+        already stored for the same (post_id, measured_at) are skipped.
+
+        Args:
+            metrics: Performance metrics to save
+            batch_size: Number of rows sent per statement
+            write_files: Ignored (there are no mirror files)
+
+        Returns:
+            Counts of received, inserted and duplicate samples
+        """
+        stats = {'received': 0, 'inserted': 0, 'duplicates': 0}
+        iterator = iter(metrics)
+
+        with self.pool.connection() as conn:
+            while True:
+                batch = list(islice(iterator, batch_size))
+                if not batch:
+                    break
+                stats['received'] += len(batch)
+
+                cursor = conn.execute(f"""
+                    INSERT INTO performance_metrics
+                    (post_id, platform, measured_at, {', '.join(COUNTERS)}, engagement_rate)
+                    SELECT * FROM unnest(
+                        %s::text[], %s::text[], %s::text[],
+                        {', '.join('%s::bigint[]' for _ in COUNTERS)}, %s::float8[]
+                    )
+                    ON CONFLICT (post_id, measured_at) DO NOTHING
+                """, [
+                    [sample.post_id for sample in batch],
+                    [sample.platform.value for sample in batch],
+                    [sample.measured_at for sample in batch],
+                    *[[getattr(sample, counter) for sample in batch] for counter in COUNTERS],
+                    [float(sample.engagement_rate) for sample in batch]
+                ])
+                stats['inserted'] += cursor.rowcount
+
+        stats['duplicates'] = stats['received'] - stats['inserted']
+        return stats
+
+    def get_metrics(self, post_id: str) -> List[PerformanceMetrics]:
+        """
+        Get metrics for a post
+
+        Args:
+            post_id: Post ID
+
+        Returns:
+            List of performance metrics, newest first
+        """
+        with self.pool.connection() as conn:
+            rows = conn.execute(f"""
+                SELECT post_id, platform, measured_at, {', '.join(COUNTERS)}, engagement_rate
+                FROM performance_metrics
+                WHERE post_id = %s
+                ORDER BY measured_at DESC
+            """, (post_id,)).fetchall()
+
+        return load_rows(PerformanceMetrics, rows)
+
+    def aggregate_performance(self, start_date: str, end_date: str,
+                              platforms: Optional[List[Platform]] = None) -> Dict[str, Any]:
+        """
+        Aggregate post counts and latest metrics for a date range in one query
+
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            platforms: Optional platform filter
+
+        Returns:
+            Totals and per-platform breakdown
+        """
+        params: List[Any] = [start_date, end_date]
+        platform_filter = ""
+        if platforms:
+            platform_filter = "AND platform = ANY(%s)"
+            params.append([platform.value for platform in platforms])
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(f"""
+                WITH posts AS (
+                    SELECT platform, post_id, success FROM posted_content
+                    WHERE date >= %s AND date <= %s {platform_filter}
+                ),
+                latest AS (
+                    SELECT DISTINCT ON (post_id) post_id, {', '.join(COUNTERS)}
+                    FROM performance_metrics
+                    WHERE post_id IN (SELECT post_id FROM posts)
+                    ORDER BY post_id, measured_at DESC
+                )
+                SELECT p.platform,
+                       COUNT(*) AS posts,
+                       COUNT(*) FILTER (WHERE p.success) AS successful,
+                       COUNT(l.post_id) AS posts_with_metrics,
+                       {', '.join(f'COALESCE(SUM(l.{counter}), 0)::bigint AS {counter}' for counter in COUNTERS)}
+                FROM posts p
+                LEFT JOIN latest l ON l.post_id = p.post_id
+                GROUP BY p.platform
+            """, params).fetchall()
+
+        return summarize_performance(start_date, end_date, rows)
+
+    def get_metrics_series(self, start_date: str, end_date: str, interval: str = 'day',
+                           brand_name: Optional[str] = None,
+                           platform: Optional[Platform] = None) -> Dict[str, Any]:
+        """
+        Get a metrics time series aggregated by the server
+
+        Each point sums, over the posts measured in its bucket, the latest
+        sample of every post within the bucket.
+
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), inclusive
+            interval: Point spacing: 'hour', 'day' or 'week'
+            brand_name: Optional brand filter
+            platform: Optional platform filter
+
+        Returns:
+            Interval, resolution read ('raw') and the series points
+        """
+        if interval not in RESOLUTIONS:
+            raise ValueError(f"Invalid interval '{interval}', expected one of {RESOLUTIONS}")
+
+        params: List[Any] = [start_date, f"{end_date}T23:59:59"]
+        filters = ""
+        if brand_name:
+            filters += " AND post_id IN (SELECT post_id FROM posted_content WHERE brand_name = %s)"
+            params.append(brand_name)
+        if platform:
+            filters += " AND platform = %s"
+            params.append(platform.value)
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(f"""
+                WITH latest AS (
+                    SELECT DISTINCT ON (bucket, post_id)
+                           bucket, post_id, COUNT(*) OVER (PARTITION BY bucket, post_id) AS samples,
+                           {', '.join(COUNTERS)}
+                    FROM (
+                        SELECT *, {BUCKET_SQL[interval].format(col='measured_at')} AS bucket
+                        FROM performance_metrics
+                        WHERE measured_at >= %s AND measured_at <= %s {filters}
+                    ) samples
+                    ORDER BY bucket, post_id, measured_at DESC
+                )
+                SELECT bucket, COUNT(*) AS posts, SUM(samples)::bigint AS samples,
+                       {', '.join(f'SUM({counter})::bigint AS {counter}' for counter in COUNTERS)}
+                FROM latest
+                GROUP BY bucket
+                ORDER BY bucket
+            """, params).fetchall()
+
+        for point in rows:
+            point['engagement_rate'] = (
+                point['engagements'] / point['impressions'] * 100 if point['impressions'] > 0 else 0
+            )
+
+        return {
+            'start_date': start_date,
+            'end_date': end_date,
+            'interval': interval,
+            'resolution': 'raw',
+            'points': rows
+        }
+
+    def get_yesterday_performance(self, brand_name: str) -> Dict[str, Any]:
+        """
+        Get yesterday's performance summary
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            Performance summary
+        """
+        return yesterday_performance(self)
+
+    # Orchestrator State
+    def save_orchestrator_state(self, state: OrchestratorState) -> bool:
+        """
+        Save orchestrator state
+
+        Args:
+            state: Orchestrator state
+
+        Returns:
+            Success status
+        """
+        with self.pool.connection() as conn:
+            conn.execute("""
+                INSERT INTO orchestrator_states (date, state_json, updated_at)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (date) DO UPDATE SET
+                    state_json = EXCLUDED.state_json,
+                    updated_at = EXCLUDED.updated_at
+            """, (state.current_date, state.model_dump_json(), datetime.now().isoformat()))
+        return True
+
+    def get_orchestrator_state(self, date: str) -> Optional[OrchestratorState]:
+        """
+        Get orchestrator state for a date
+
+        Args:
+            date: Date (YYYY-MM-DD)
+
+        Returns:
+            Orchestrator state or None
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute("""
+                SELECT state_json FROM orchestrator_states WHERE date = %s
+            """, (date,)).fetchone()
+        return load_json(OrchestratorState, row['state_json']) if row else None
+
+    def record_orchestrator_run(self, date: str, posts_attempted: int,
+                               posts_succeeded: int, posts_failed: int,
+                               errors: Optional[List[str]] = None) -> bool:
+        """
+        Record an orchestrator run
+
+        Args:
+            date: Run date
+            posts_attempted: Number of posts attempted
+            posts_succeeded: Number of successful posts
+            posts_failed: Number of failed posts
+            errors: List of errors
+
+        Returns:
+            Success status
+        """
+        now = datetime.now().isoformat()
+        with self.pool.connection() as conn:
+            conn.execute("""
+                INSERT INTO orchestrator_runs
+                (run_date, started_at, completed_at, posts_attempted,
+                 posts_succeeded, posts_failed, errors)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (run_date) DO UPDATE SET
+                    started_at = EXCLUDED.started_at,
+                    completed_at = EXCLUDED.completed_at,
+                    posts_attempted = EXCLUDED.posts_attempted,
+                    posts_succeeded = EXCLUDED.posts_succeeded,
+                    posts_failed = EXCLUDED.posts_failed,
+                    errors = EXCLUDED.errors
+            """, (date, now, now, posts_attempted, posts_succeeded, posts_failed,
+                  json.dumps(errors) if errors else None))
+        return True
+
+    def has_run_today(self, date: str) -> bool:
+        """
+        Check if orchestrator has run today
+
+        Args:
+            date: Date to check
+
+        Returns:
+            True if already run
+        """
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                SELECT 1 FROM orchestrator_runs WHERE run_date = %s
+            """, (date,)).fetchone() is not None
+
+    # Post Checkpoints
+    def start_checkpoints(self, brand_name: str, run_date: str,
+                          slots: Iterable[Tuple[Platform, int]],
+                          reset: bool = False) -> List[PostCheckpoint]:
+        """
+        Create pending checkpoints for a brand's scheduled posts of a day
+
+        Args:
+            brand_name: Brand name
+            run_date: Execution date (YYYY-MM-DD)
+            slots: (platform, index among the platform's posts of the day) of each post
+            reset: Set the given slots back to pending, even posted ones (forced re-run)
+
+        Returns:
+            Every checkpoint of the brand for the day, ordered by platform and slot
+        """
+        slots = list(slots)
+        conflict = """
+            DO UPDATE SET status = EXCLUDED.status, post_id = NULL, post_url = NULL,
+                          error = NULL, updated_at = EXCLUDED.updated_at
+        """ if reset else "DO NOTHING"
+
+        with self.pool.connection() as conn:
+            conn.execute(f"""
+                INSERT INTO post_checkpoints
+                (run_date, brand_name, platform, slot, status, attempts, updated_at)
+                SELECT %s, %s, platform, slot, %s, 0, %s
+                FROM unnest(%s::text[], %s::int[]) AS s(platform, slot)
+                ON CONFLICT (run_date, brand_name, platform, slot) {conflict}
+            """, (run_date, brand_name, CheckpointStatus.PENDING.value, datetime.now().isoformat(),
+                  [platform.value for platform, _ in slots], [slot for _, slot in slots]))
+            rows = conn.execute("""
+                SELECT * FROM post_checkpoints
+                WHERE run_date = %s AND brand_name = %s
+                ORDER BY platform, slot
+            """, (run_date, brand_name)).fetchall()
+
+        return load_rows(PostCheckpoint, rows)
+
+    def update_checkpoint(self, brand_name: str, run_date: str, platform: Platform, slot: int,
+                          status: CheckpointStatus, post_id: Optional[str] = None,
+                          post_url: Optional[str] = None, error: Optional[str] = None) -> bool:
+        """
+        Move a scheduled post to another pipeline stage
+
+        Args:
+            brand_name: Brand name
+            run_date: Execution date (YYYY-MM-DD)
+            platform: Platform of the post
+            slot: Index among the platform's posts of the day
+            status: New status (moving to generating counts an attempt)
+            post_id: Platform post ID (kept when None)
+            post_url: URL of the posted content (kept when None)
+            error: Error of a failed attempt (cleared otherwise)
+
+        Returns:
+            True if the checkpoint exists
+        """
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                UPDATE post_checkpoints SET
+                    status = %s,
+                    attempts = attempts + %s,
+                    post_id = COALESCE(%s, post_id),
+                    post_url = COALESCE(%s, post_url),
+                    error = %s,
+                    updated_at = %s
+                WHERE run_date = %s AND brand_name = %s AND platform = %s AND slot = %s
+            """, (status.value, int(status == CheckpointStatus.GENERATING), post_id, post_url, error,
+                  datetime.now().isoformat(), run_date, brand_name, platform.value, slot)).rowcount > 0
+
+    def get_checkpoint_summary(self, brand_name: str, run_date: str) -> Dict[str, Any]:
+        """
+        Count a brand's scheduled posts of a day per status
+
+        Args:
+            brand_name: Brand name
+            run_date: Execution date (YYYY-MM-DD)
+
+        Returns:
+            Total and per-status counts (0 everywhere before the first run) and last_update
+        """
+        with self.pool.connection() as conn:
+            rows = conn.execute("""
+                SELECT status, COUNT(*) AS posts, MAX(updated_at) AS updated_at
+                FROM post_checkpoints
+                WHERE run_date = %s AND brand_name = %s
+                GROUP BY status
+            """, (run_date, brand_name)).fetchall()
+
+        return summarize_checkpoints((row['status'], row['posts'], row['updated_at']) for row in rows)
+
+    # Jobs
+    def _row_to_job(self, row) -> Job:
+        """Build a Job from a jobs row"""
+        data = dict(row)
+        data['request'] = json.loads(data.pop('request_json'))
+        result_json = data.pop('result_json')
+        data['result'] = json.loads(result_json) if result_json else None
+        details_json = data.pop('details_json')
+        data['details'] = json.loads(details_json) if details_json else None
+        return load_object(Job, data)
+
+    def create_job(self, job: Job) -> bool:
+        """
+        Store a new job
+
+        Args:
+            job: Job to store (usually queued)
+
+        Returns:
+            Success status
+        """
+        with self.pool.connection() as conn:
+            conn.execute("""
+                INSERT INTO jobs
+                (id, kind, status, stage, progress, request_json, concurrency_key, result_json,
+                 error, attempts, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (job.id, job.kind, job.status.value, job.stage, job.progress,
+                  json.dumps(job.request, ensure_ascii=False), job.concurrency_key,
+                  json.dumps(job.result, ensure_ascii=False) if job.result is not None else None,
+                  job.error, job.attempts, job.created_at, job.updated_at))
+        return True
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        Get a job by ID
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job or None
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = %s", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, status: Optional[JobStatus] = None, limit: int = 100) -> List[Job]:
+        """
+        List jobs, oldest first
+
+        Args:
+            status: Only jobs with this status (optional)
+            limit: Maximum number of jobs
+
+        Returns:
+            Jobs ordered by submission time
+        """
+        with self.pool.connection() as conn:
+            rows = conn.execute("""
+                SELECT * FROM jobs
+                WHERE %(status)s::text IS NULL OR status = %(status)s
+                ORDER BY created_at LIMIT %(limit)s
+            """, {'status': status.value if status else None, 'limit': limit}).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def claim_job(self, job_id: str, owner: str, max_per_key: int = 1) -> Optional[Job]:
+        """
+        Atomically move a queued job to running for one worker
+
+        Args:
+            job_id: Job ID
+            owner: Worker identifier, required by later updates and heartbeats
+            max_per_key: Maximum number of running jobs of the same type and
+                concurrency key, across all workers (jobs without a key are not limited)
+
+        Returns:
+            The claimed job, or None if it was not queued (e.g. claimed by another
+            worker) or its key is at the limit
+        """
+        now = datetime.now().isoformat()
+        with self.pool.connection() as conn:
+            # Concurrent claims of the same key wait on one transaction lock, so the
+            # count below (a new snapshot under READ COMMITTED) sees the earlier claims
+            conn.execute("""
+                SELECT pg_advisory_xact_lock(hashtext(kind || '|' || concurrency_key))
+                FROM jobs
+                WHERE id = %s AND status = 'queued' AND concurrency_key IS NOT NULL
+            """, (job_id,))
+            row = conn.execute("""
+                UPDATE jobs SET status = 'running', owner = %s, attempts = attempts + 1,
+                                updated_at = %s, heartbeat_at = %s
+                WHERE id = %s AND status = 'queued'
+                  AND (concurrency_key IS NULL OR (
+                      SELECT COUNT(*) FROM jobs AS other
+                      WHERE other.kind = jobs.kind AND other.concurrency_key = jobs.concurrency_key
+                        AND other.status = 'running'
+                  ) < %s)
+                RETURNING *
+            """, (owner, now, now, job_id, max_per_key)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def update_job(self, job_id: str, status: Optional[JobStatus] = None, stage: Optional[str] = None,
+                   progress: Optional[int] = None, result: Optional[Dict[str, Any]] = None,
+                   error: Optional[str] = None, owner: Optional[str] = None,
+                   details: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Update a job (fields left to None keep their value)
+
+        Args:
+            job_id: Job ID
+            status: New status
+            stage: Current stage
+            progress: Completion percentage
+            result: Result of a succeeded job
+            error: Error of a failed job
+            owner: Only update if the job is still claimed by this worker (optional)
+            details: Live progress details (replace the previous ones)
+
+        Returns:
+            True if the job was updated
+        """
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                UPDATE jobs SET
+                    status = COALESCE(%(status)s, status),
+                    stage = COALESCE(%(stage)s, stage),
+                    progress = COALESCE(%(progress)s, progress),
+                    result_json = COALESCE(%(result)s, result_json),
+                    error = COALESCE(%(error)s, error),
+                    details_json = COALESCE(%(details)s, details_json),
+                    updated_at = %(now)s
+                WHERE id = %(id)s AND (%(owner)s::text IS NULL OR owner = %(owner)s)
+            """, {'status': status.value if status else None, 'stage': stage, 'progress': progress,
+                  'result': json.dumps(result, ensure_ascii=False) if result is not None else None,
+                  'error': error, 'now': datetime.now().isoformat(), 'id': job_id,
+                  'details': json.dumps(details, ensure_ascii=False) if details is not None else None,
+                  'owner': owner}).rowcount > 0
+
+    def heartbeat_jobs(self, job_ids: List[str], owner: str) -> int:
+        """
+        Record that a worker is still running its jobs
+
+        Args:
+            job_ids: IDs of the jobs the worker runs
+            owner: Worker identifier
+
+        Returns:
+            Number of jobs still claimed by the worker
+        """
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                UPDATE jobs SET heartbeat_at = %s
+                WHERE id = ANY(%s) AND status = 'running' AND owner = %s
+            """, (datetime.now().isoformat(), list(job_ids), owner)).rowcount
+
+    def requeue_stale_jobs(self, heartbeat_before: str) -> int:
+        """
+        Queue again running jobs whose worker stopped sending heartbeats (e.g. after a crash)
+
+        Jobs whose cancellation was requested are cancelled instead.
+
+        Args:
+            heartbeat_before: Jobs whose last heartbeat is older than this timestamp are requeued
+
+        Returns:
+            Number of jobs requeued or cancelled
+        """
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                UPDATE jobs SET status = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'queued' END,
+                                owner = NULL, stage = NULL, progress = 0, details_json = NULL, updated_at = %s
+                WHERE status = 'running' AND heartbeat_at < %s
+            """, (datetime.now().isoformat(), heartbeat_before)).rowcount
+
+    def cancel_job(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job
+
+        A queued job is cancelled at once. A running job is flagged, and its worker
+        stops it at the next progress report. Finished jobs are left unchanged.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            The job after the request, or None if it does not exist
+        """
+        with self.pool.connection() as conn:
+            conn.execute("""
+                UPDATE jobs SET status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+                                cancel_requested = TRUE, updated_at = %s
+                WHERE id = %s AND status IN ('queued', 'running')
+            """, (datetime.now().isoformat(), job_id))
+            row = conn.execute("SELECT * FROM jobs WHERE id = %s", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    # Image Management
+    def save_image(self, image_base64: str, platform: Platform, date: str,
+                   record_id: Optional[str] = None, brand_name: Optional[str] = None) -> str:
+        """
+        Save generated image in the image_blobs table (identical images are stored once)
+
+        Args:
+            image_base64: Base64 encoded image
+            platform: Platform
+            date: Date
+            record_id: Post record referencing the image (optional)
+            brand_name: Brand of the post (unused, every brand shares the table)
+
+        Returns:
+            postgres:// URI of the image
+        """
+        data = b''.join(iter_base64_chunks(image_base64))
+        digest = hashlib.sha256(data).hexdigest()
+        now = datetime.now().isoformat()
+
+        with self.pool.connection() as conn:
+            conn.execute("""
+                INSERT INTO image_blobs (sha256, ext, size, data, created_at, touched_at)
+                VALUES (%s, '.png', %s, %s, %s, %s)
+                ON CONFLICT (sha256) DO UPDATE SET touched_at = EXCLUDED.touched_at
+            """, (digest, len(data), data, now, now))
+            if record_id:
+                conn.execute("""
+                    INSERT INTO post_images (record_id, sha256, platform, date)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT DO NOTHING
+                """, (record_id, digest, platform.value, date))
+
+        return f"postgres://image_blobs/{digest}.png"
+
+    def gc_images(self, grace_seconds: int = 3600) -> int:
+        """
+        Delete images no post references anymore
+
+        Args:
+            grace_seconds: Minimum time since the image was last saved
+
+        Returns:
+            Number of images deleted
+        """
+        cutoff = (datetime.now() - timedelta(seconds=grace_seconds)).isoformat()
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                DELETE FROM image_blobs b
+                WHERE touched_at < %s
+                  AND NOT EXISTS (SELECT 1 FROM post_images i WHERE i.sha256 = b.sha256)
+            """, (cutoff,)).rowcount
+
+    # Cleanup and Maintenance
+    def rebuild_mirrors(self, batch_size: int = 500) -> Dict[str, int]:
+        """There are no mirror files to rebuild"""
+        return {}
+
+    def cleanup_old_data(self, days_to_keep: int = 90) -> Dict[str, int]:
+        """
+        Clean up old data
+
+        Args:
+            days_to_keep: Number of days of posts, metrics, state and runs to keep
+
+        Returns:
+            Cleanup statistics
+        """
+        cutoff = (datetime.now() - timedelta(days=days_to_keep)).strftime('%Y-%m-%d')
+
+        with self.pool.connection() as conn:
+            posts = [row['id'] for row in conn.execute("""
+                DELETE FROM posted_content WHERE date < %s RETURNING id
+            """, (cutoff,))]
+            conn.execute("DELETE FROM post_images WHERE record_id = ANY(%s)", (posts,))
+            metrics = conn.execute("""
+                DELETE FROM performance_metrics WHERE measured_at < %s
+            """, (cutoff,)).rowcount
+            conn.execute("DELETE FROM orchestrator_states WHERE date < %s", (cutoff,))
+            runs = conn.execute("""
+                DELETE FROM orchestrator_runs WHERE run_date < %s
+            """, (cutoff,)).rowcount
+            conn.execute("DELETE FROM post_checkpoints WHERE run_date < %s", (cutoff,))
+            # Finished jobs are kept 30 days whatever the requested retention, as in StorageManager
+            conn.execute("""
+                DELETE FROM jobs
+                WHERE created_at < %s AND status IN ('succeeded', 'failed', 'cancelled')
+            """, ((datetime.now() - timedelta(days=30)).isoformat(),))
+
+        return {
+            'posts_deleted': len(posts),
+            'metrics_deleted': metrics,
+            'metrics_downsampled': 0,
+            'files_deleted': 0,
+            'images_deleted': self.gc_images(),
+            'runs_deleted': runs,
+            'pages_vacuumed': 0
+        }
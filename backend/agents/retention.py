@@ -0,0 +1,306 @@
+"""
+Retention engine for the Social CM Orchestrator Suite
+Deletes expired rows in small batches by indexed date columns and removes
+the matching JSON mirror files using the paths recorded in the database
+"""
+
+import os
+import time
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+from pydantic import BaseModel, Field
+
+from agents.logger_config import setup_logger
+
+logger = setup_logger("agents.retention", "INFO")
+
+
+class RetentionPolicy(BaseModel):
+    """Retention rule for one table and/or one kind of mirror file"""
+    name: str = Field(description="Policy name, used as the stats key")
+    table: Optional[str] = Field(default=None, description="Table to purge (None for files only)")
+    date_column: Optional[str] = Field(default=None, description="Indexed date column compared to the cutoff")
+    condition: Optional[str] = Field(default=None, description="Extra SQL condition expired rows must also meet")
+    mirror_kind: Optional[str] = Field(default=None, description="Kind of mirror files to purge (mirror_files.kind)")
+    days_to_keep: int = Field(default=90, description="Number of days of data to keep")
+    fixed: bool = Field(default=False, description="Ignore the days_to_keep override of RetentionEngine.run")
+
+
+DEFAULT_POLICIES = [
+    RetentionPolicy(name="posts", table="posted_content", date_column="date",
+                    mirror_kind="post", days_to_keep=90),
+    RetentionPolicy(name="metrics", table="performance_metrics", date_column="measured_at",
+                    mirror_kind="metrics", days_to_keep=90),
+    RetentionPolicy(name="state", table="orchestrator_states", date_column="date",
+                    mirror_kind="state", days_to_keep=90),
+    RetentionPolicy(name="runs", table="orchestrator_runs", date_column="run_date",
+                    days_to_keep=365),
+    RetentionPolicy(name="checkpoints", table="post_checkpoints", date_column="run_date",
+                    days_to_keep=90),
+    # Queued and running jobs are still owned by a worker, however old
+    RetentionPolicy(name="jobs", table="jobs", date_column="created_at",
+                    condition="status IN ('succeeded', 'failed', 'cancelled')", days_to_keep=30, fixed=True),
+    # Daily and weekly rollups serve long-range dashboards after raw samples are gone
+    RetentionPolicy(name="rollups", table="metric_rollups", date_column="bucket_start",
+                    days_to_keep=730, fixed=True),
+]
+
+
+class RetentionEngine:
+    """Applies retention policies without holding the write lock for long
+
+    Every batch is its own short transaction and the engine sleeps between
+    batches, so orchestrator writes interleave with a large purge. With
+    sharded storage every policy is applied to each shard in turn.
+    """
+
+    def __init__(self, storage, policies: Optional[List[RetentionPolicy]] = None,
+                 batch_size: int = 500, pause_seconds: float = 0.05,
+                 vacuum_pages: int = 2000, raw_metrics_days: Optional[int] = 14):
+        """
+        Initialize the engine
+
+        Args:
+            storage: StorageManager to purge
+            policies: Retention policies (defaults to DEFAULT_POLICIES)
+            batch_size: Rows or files deleted per transaction
+            pause_seconds: Sleep between batches to let other writers in
+            vacuum_pages: Free pages returned to the OS per run (0 disables)
+            raw_metrics_days: Age after which raw metrics samples are downsampled
+                to the latest sample per post and hourly rollups are dropped (None disables)
+        """
+        self.storage = storage
+        self.policies = policies or DEFAULT_POLICIES
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.vacuum_pages = vacuum_pages
+        self.raw_metrics_days = raw_metrics_days
+
+    def run(self, days_to_keep: Optional[int] = None) -> Dict[str, int]:
+        """
+        Apply every policy once
+
+        Args:
+            days_to_keep: Override the retention of every policy (optional)
+
+        Returns:
+            Rows and files deleted per policy, plus images and vacuumed pages
+        """
+        stats: Dict[str, int] = {}
+
+        def add(key: str, count: int):
+            stats[key] = stats.get(key, 0) + count
+
+        for shard in self.storage.shards.keys():
+            if self.raw_metrics_days is not None:
+                cutoff = (datetime.now() - timedelta(days=self.raw_metrics_days)).strftime('%Y-%m-%d')
+                add('metrics_downsampled', self._downsample_metrics(shard, cutoff))
+                add('hourly_rollups_deleted', self._prune_hourly_rollups(shard, cutoff))
+
+            for policy in self.policies:
+                days = policy.days_to_keep if days_to_keep is None or policy.fixed else days_to_keep
+                cutoff = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+                if policy.table and policy.date_column:
+                    add(f"{policy.name}_deleted", self._purge_rows(shard, policy, cutoff))
+                if policy.mirror_kind:
+                    add(f"{policy.name}_files_deleted",
+                        self._purge_mirror_files(shard, policy.mirror_kind, cutoff))
+
+        # Images of deleted posts were released by trigger
+        stats['images_deleted'] = self.storage.gc_images(batch_size=self.batch_size)
+
+        # Bloom filters keep deleted keys until rebuilt
+        if stats.get('posts_deleted') or stats.get('runs_deleted'):
+            self.storage.rebuild_membership()
+        stats['pages_vacuumed'] = sum(self._incremental_vacuum(shard)
+                                      for shard in self.storage.shards.keys())
+
+        log_stats = {key: value for key, value in stats.items() if value}
+        logger.info(f"Retention run completed: {log_stats}")
+        return stats
+
+    def _purge_rows(self, shard: str, policy: RetentionPolicy, cutoff: str) -> int:
+        """Delete expired rows of one table in bounded batches"""
+        deleted = 0
+        condition = f"AND ({policy.condition})" if policy.condition else ""
+        while True:
+            with self.storage._get_db(shard=shard) as conn:
+                cursor = conn.execute(f"""
+                    DELETE FROM {policy.table}
+                    WHERE rowid IN (
+                        SELECT rowid FROM {policy.table}
+                        WHERE {policy.date_column} < ? {condition}
+                        LIMIT ?
+                    )
+                """, (cutoff, self.batch_size))
+                conn.commit()
+
+            deleted += cursor.rowcount
+            if cursor.rowcount < self.batch_size:
+                return deleted
+            time.sleep(self.pause_seconds)
+
+    def _downsample_metrics(self, shard: str, cutoff: str) -> int:
+        """Delete raw metrics samples older than the cutoff except the latest of each post
+
+        The samples are already folded into the rollups; their mirror files go too.
+        """
+        deleted = 0
+        while True:
+            with self.storage._get_db(shard=shard) as conn:
+                rows = conn.execute("""
+                    SELECT m.id, m.post_id, m.measured_at FROM performance_metrics m
+                    WHERE m.measured_at < ? AND EXISTS (
+                        SELECT 1 FROM performance_metrics n
+                        WHERE n.post_id = m.post_id AND n.measured_at > m.measured_at
+                    )
+                    LIMIT ?
+                """, (cutoff, self.batch_size)).fetchall()
+                if not rows:
+                    return deleted
+
+                paths = [str(self.storage._metrics_file_path(row['post_id'], row['measured_at']))
+                         for row in rows]
+                conn.executemany("DELETE FROM performance_metrics WHERE id = ?",
+                                 [(row['id'],) for row in rows])
+                conn.executemany("DELETE FROM mirror_files WHERE path = ?",
+                                 [(path,) for path in paths])
+                conn.commit()
+
+            for path in paths:
+                self.storage.mirror.remove(path)
+            deleted += len(rows)
+            if len(rows) < self.batch_size:
+                return deleted
+            time.sleep(self.pause_seconds)
+
+    def _prune_hourly_rollups(self, shard: str, cutoff: str) -> int:
+        """Delete hourly rollups older than the cutoff (daily and weekly ones remain)"""
+        deleted = 0
+        while True:
+            with self.storage._get_db(shard=shard) as conn:
+                cursor = conn.execute("""
+                    DELETE FROM metric_rollups WHERE rowid IN (
+                        SELECT rowid FROM metric_rollups
+                        WHERE resolution = 'hour' AND bucket_start < ?
+                        LIMIT ?
+                    )
+                """, (cutoff, self.batch_size))
+                conn.commit()
+
+            deleted += cursor.rowcount
+            if cursor.rowcount < self.batch_size:
+                return deleted
+            time.sleep(self.pause_seconds)
+
+    def _purge_mirror_files(self, shard: str, kind: str, cutoff: str) -> int:
+        """Delete expired mirror files of one kind using their registered paths"""
+        deleted = 0
+        while True:
+            with self.storage._get_db(shard=shard) as conn:
+                paths = [row['path'] for row in conn.execute("""
+                    SELECT path FROM mirror_files
+                    WHERE kind = ? AND ref_date < ?
+                    LIMIT ?
+                """, (kind, cutoff, self.batch_size))]
+                if not paths:
+                    return deleted
+
+                for path in paths:
+                    try:
+                        os.unlink(path)
+                        deleted += 1
+                    except FileNotFoundError:
+                        pass
+
+                conn.executemany("DELETE FROM mirror_files WHERE path = ?",
+                                 [(path,) for path in paths])
+                conn.commit()
+
+            if len(paths) < self.batch_size:
+                return deleted
+            time.sleep(self.pause_seconds)
+
+    def _incremental_vacuum(self, shard: str) -> int:
+        """Return up to vacuum_pages free pages to the filesystem"""
+        if not self.vacuum_pages:
+            return 0
+
+        with self.storage._get_db(shard=shard) as conn:
+            free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            conn.execute(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})").fetchall()
+            free_after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+        return free_before - free_after
+
+    def convert_auto_vacuum(self) -> List[str]:
+        """
+        Switch databases created before incremental auto-vacuum to it
+
+        Runs a full VACUUM on every shard that is not in incremental mode yet:
+        it rewrites the whole file under an exclusive lock, so run it during a
+        maintenance window, not from the scheduler.
+
+        Returns:
+            Shards that were converted
+        """
+        converted = []
+        for shard in self.storage.shards.keys():
+            with self.storage._get_db(shard=shard) as conn:
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                    continue
+                started = time.monotonic()
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            converted.append(shard)
+            logger.info(f"Converted shard {shard} to incremental auto-vacuum "
+                        f"in {time.monotonic() - started:.1f}s")
+        return converted
+
+
+class RetentionScheduler:
+    """Runs a RetentionEngine periodically on a background thread"""
+
+    def __init__(self, engine: RetentionEngine, interval_seconds: float = 24 * 3600,
+                 initial_delay_seconds: float = 300):
+        """
+        Initialize the scheduler
+
+        Args:
+            engine: Retention engine to run
+            interval_seconds: Time between runs
+            initial_delay_seconds: Time before the first run (keeps startup light)
+        """
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self.initial_delay_seconds = initial_delay_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="retention", daemon=True)
+        self._thread.start()
+        logger.info(f"Retention scheduler started (every {self.interval_seconds:.0f}s)")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the background thread, waiting for a running batch to finish"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        if self._stop.wait(self.initial_delay_seconds):
+            return
+        while True:
+            try:
+                self.engine.run()
+            except Exception as e:
+                logger.error(f"Retention run failed: {str(e)}", exc_info=True)
+            if self._stop.wait(self.interval_seconds):
+                return
@@ -0,0 +1,144 @@
+"""
+Per-brand SQLite sharding for the orchestrator storage
+Routes each brand (or hash bucket of brands) to its own database file so
+orchestration for different brands does not compete for one writer lock
+"""
+
+import re
+import zlib
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agents.db_pool import SQLitePool
+
+# off: one database, brand: one file per brand, hash:N: N files shared by hash bucket
+SHARDING_MODES = ("off", "brand", "hash")
+
+# Unbranded data (orchestrator runs and state, posts recorded without a brand,
+# metrics of unknown posts) and every brand when sharding is off
+DEFAULT_SHARD = "default"
+
+DEFAULT_HASH_BUCKETS = 16
+
+
+def parse_sharding(spec: Optional[str]) -> Tuple[str, int]:
+    """
+    Parse a sharding spec ('off', 'brand', 'hash' or 'hash:<buckets>')
+
+    Returns:
+        Tuple of (mode, hash buckets)
+
+    Raises:
+        ValueError: If the spec is invalid
+    """
+    mode, _, buckets = (spec or "off").strip().lower().partition(":")
+    if mode not in SHARDING_MODES or (buckets and mode != "hash"):
+        raise ValueError(f"Invalid sharding '{spec}', expected off, brand or hash[:buckets]")
+    if not buckets:
+        return mode, DEFAULT_HASH_BUCKETS
+    if not buckets.isdigit() or int(buckets) < 1:
+        raise ValueError(f"Invalid number of hash buckets in '{spec}'")
+    return mode, int(buckets)
+
+
+def shard_key(brand_name: Optional[str], mode: str, buckets: int = DEFAULT_HASH_BUCKETS) -> str:
+    """
+    Shard key of a brand
+
+    Args:
+        brand_name: Brand name (None for unbranded data)
+        mode: One of SHARDING_MODES
+        buckets: Number of hash buckets (hash mode)
+
+    Returns:
+        DEFAULT_SHARD, 'brand_<slug>_<crc>' or 'hash_<bucket>'
+    """
+    if mode == "off" or not brand_name:
+        return DEFAULT_SHARD
+
+    crc = zlib.crc32(brand_name.encode('utf-8'))
+    if mode == "hash":
+        return f"hash_{crc % buckets:03d}"
+    # The checksum keeps brands that only differ in case or punctuation apart
+    slug = re.sub(r'[^a-z0-9]+', '-', brand_name.lower()).strip('-')[:40]
+    return f"brand_{slug}_{crc:08x}"
+
+
+class ShardRouter:
+    """Maps brands to SQLite files and owns one connection pool per file
+
+    The default shard is ``orchestrator.db`` in the storage directory; other
+    shards live in ``shards/<key>.db``. Pools are opened (and migrated through
+    ``on_open``) the first time a shard is used, and ``keys()`` discovers
+    shards created by other processes for fan-out queries.
+    """
+
+    def __init__(self, base_path: Path, spec: Optional[str] = None, pooled: bool = True,
+                 on_open: Optional[Callable[[SQLitePool], None]] = None):
+        """
+        Initialize the router
+
+        Args:
+            base_path: Storage directory
+            spec: Sharding spec, see parse_sharding (defaults to off)
+            pooled: Reuse one connection per thread in every shard pool
+            on_open: Called with each newly opened pool (e.g. to apply migrations)
+        """
+        self.mode, self.buckets = parse_sharding(spec)
+        self.base_path = Path(base_path)
+        self.shards_path = self.base_path / "shards"
+        self.pooled = pooled
+        self.on_open = on_open
+
+        self._lock = threading.Lock()
+        self._pools: Dict[str, SQLitePool] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether brands are spread over several files"""
+        return self.mode != "off"
+
+    def shard_for(self, brand_name: Optional[str]) -> str:
+        """Get the shard key of a brand"""
+        return shard_key(brand_name, self.mode, self.buckets)
+
+    def path_for(self, key: str) -> Path:
+        """Get the database file of a shard"""
+        if key == DEFAULT_SHARD:
+            return self.base_path / "orchestrator.db"
+        return self.shards_path / f"{key}.db"
+
+    def pool(self, key: str) -> SQLitePool:
+        """Get the connection pool of a shard, opening it on first use"""
+        pool = self._pools.get(key)
+        if pool is not None:
+            return pool
+
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                if key != DEFAULT_SHARD:
+                    self.shards_path.mkdir(exist_ok=True)
+                pool = SQLitePool(self.path_for(key), pooled=self.pooled)
+                if self.on_open:
+                    self.on_open(pool)
+                self._pools[key] = pool
+        return pool
+
+    def keys(self) -> List[str]:
+        """Get every shard, including files created by other processes"""
+        keys = {DEFAULT_SHARD, *self._pools}
+        if self.enabled and self.shards_path.exists():
+            keys.update(path.stem for path in self.shards_path.glob('*.db'))
+        return sorted(keys, key=lambda key: (key != DEFAULT_SHARD, key))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the sharding mode and the number of known and open shards"""
+        return {'mode': self.mode, 'shards': len(self.keys()), 'open': len(self._pools)}
+
+    def close_all(self):
+        """Close the connections of every open shard"""
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close_all()
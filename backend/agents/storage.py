@@ -5,18 +5,45 @@ Handles persistence of strategies, posted content, and metrics
 
 import json
 import os
+import re
 import hashlib
-from typing import List, Dict, Optional, Any
+import threading
+from itertools import islice
+from contextlib import ExitStack
+from typing import List, Dict, Optional, Any, Iterable, Set, Tuple
 from datetime import datetime, date, timedelta
 from pathlib import Path
-import sqlite3
-from contextlib import contextmanager
 
+from agents.blob_store import BlobStore
+from agents.model_loading import load_json, load_json_rows, load_object, load_rows
+from agents.db_pool import SQLitePool
+from agents.sharding import ShardRouter, DEFAULT_SHARD
+from agents.migrations import run_migrations
+from agents.plan_cache import PlanCache
+from agents.membership import BloomFilter
+from agents.retention import RetentionEngine
+from agents.metric_rollups import choose_resolution, merge_series
+from agents.storage_backend import (
+    StorageBackend, create_storage, summarize_checkpoints, summarize_performance,
+    yesterday_performance
+)
+from agents.mirror_writer import MirrorWriter
+from agents.plan_codec import (
+    DEFAULT_FORMAT, encode_plan, decode_plan, encode_document, decode_document, get_codec
+)
+from agents.plan_history import diff_plans, apply_delta, needs_snapshot
+from agents.near_duplicates import (
+    minhash, lsh_buckets, similarity, signature_to_bytes, signature_from_bytes
+)
 from agents.models import (
     MonthlyPlan,
     PostRecord,
     PerformanceMetrics,
     OrchestratorState,
+    CheckpointStatus,
+    PostCheckpoint,
+    Job,
+    JobStatus,
     Platform,
     DailyPost,
     PostingResult,
@@ -24,14 +51,28 @@ from agents.models import (
 )
 
 class StorageManager:
-    """Manages storage for the orchestrator suite"""
+    """Manages storage for the orchestrator suite (the SQLite StorageBackend)"""
 
-    def __init__(self, base_path: str = None):
+    def __init__(self, base_path: str = None, pooled: bool = True,
+                 plan_cache_size: int = 64, plan_cache_ttl: float = 300.0,
+                 mirror_mode: Optional[str] = None, plan_format: Optional[str] = None,
+                 plan_snapshot_interval: int = 10,
+                 sharding: Optional[str] = None):
         """
         Initialize storage manager
 
         Args:
             base_path: Base directory for storage (optional)
+            pooled: Reuse one SQLite connection per thread (default True)
+            plan_cache_size: Maximum number of brands in the active plan cache
+            plan_cache_ttl: Active plan cache entry lifetime in seconds
+            mirror_mode: JSON mirror files: 'sync', 'async' (write-behind) or 'off'
+                (defaults to STORAGE_MIRROR_MODE, then 'async'; the DB is authoritative)
+            plan_format: Codec for newly saved plans, see agents.plan_codec
+                (defaults to STORAGE_PLAN_FORMAT, then the best available codec)
+            plan_snapshot_interval: Maximum plan versions stored as deltas between full snapshots
+            sharding: Database layout: 'off', 'brand' (one file per brand) or 'hash:<buckets>'
+                (defaults to STORAGE_SHARDING, then 'off'), see agents.sharding
         """
         # Determine base path based on environment
         if base_path:
@@ -60,84 +101,78 @@ class StorageManager:
                     self.metrics_path, self.images_path, self.state_path]:
             path.mkdir(exist_ok=True)
 
-        # Initialize database for quick lookups
-        self.db_path = self.base_path / "orchestrator.db"
-        self._init_database()
-
-    def _init_database(self):
-        """Initialize SQLite database for tracking"""
-        with self._get_db() as conn:
-            cursor = conn.cursor()
-
-            # Create tables
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS posted_content (
-                    id TEXT PRIMARY KEY,
-                    date TEXT NOT NULL,
-                    platform TEXT NOT NULL,
-                    post_id TEXT,
-                    content_hash TEXT UNIQUE,
-                    content TEXT,
-                    posted_at TEXT,
-                    success BOOLEAN,
-                    error TEXT,
-                    UNIQUE(date, platform)
-                )
-            """)
-
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS monthly_plans (
-                    id TEXT PRIMARY KEY,
-                    brand_name TEXT,
-                    start_date TEXT,
-                    end_date TEXT,
-                    created_at TEXT,
-                    is_active BOOLEAN,
-                    plan_json TEXT
-                )
-            """)
+        # JSON mirrors are written after the SQLite commit (see rebuild_mirrors)
+        self.mirror = MirrorWriter(mode=mirror_mode or os.environ.get('STORAGE_MIRROR_MODE', 'async'))
 
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS performance_metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    post_id TEXT,
-                    platform TEXT,
-                    measured_at TEXT,
-                    impressions INTEGER,
-                    engagements INTEGER,
-                    clicks INTEGER,
-                    shares INTEGER,
-                    comments INTEGER,
-                    likes INTEGER,
-                    engagement_rate REAL,
-                    FOREIGN KEY (post_id) REFERENCES posted_content(post_id)
-                )
-            """)
+        # Encoding of new plans (stored rows carry their own format tag)
+        self.plan_format = plan_format or os.environ.get('STORAGE_PLAN_FORMAT') or DEFAULT_FORMAT
+        get_codec(self.plan_format)
+        self.plan_snapshot_interval = plan_snapshot_interval
 
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS orchestrator_runs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    run_date TEXT UNIQUE,
-                    started_at TEXT,
-                    completed_at TEXT,
-                    posts_attempted INTEGER,
-                    posts_succeeded INTEGER,
-                    posts_failed INTEGER,
-                    errors TEXT
-                )
-            """)
+        # Content-addressed image store (reference counts live in image_blobs)
+        self.blobs = BlobStore(self.images_path / "sha256")
+        self._blob_lock = threading.Lock()
 
-            conn.commit()
-
-    @contextmanager
-    def _get_db(self):
-        """Get database connection context manager"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        # Initialize database for quick lookups. Brands are routed to their shard,
+        # unbranded data (runs, state) stays in orchestrator.db
+        self.db_path = self.base_path / "orchestrator.db"
+        self.shards = ShardRouter(self.base_path, sharding or os.environ.get('STORAGE_SHARDING'),
+                                  pooled=pooled, on_open=self._init_database)
+        self.db = self.shards.pool(DEFAULT_SHARD)
+        # Shard of each post ID seen, so metrics are stored next to their post
+        self._post_shards: Dict[str, str] = {}
+
+        # Parsed active plans, validated against brand_plan_versions on read
+        self.plan_cache = PlanCache(max_entries=plan_cache_size, ttl_seconds=plan_cache_ttl)
+
+        # Bloom filters answering idempotency checks without a query when negative
+        self._membership_lock = threading.RLock()
+        self._membership_counters = {'negatives': 0, 'db_checks': 0, 'false_positives': 0,
+                                     'syncs': 0, 'rebuilds': 0}
+        self.rebuild_membership()
+
+    def _init_database(self, pool: SQLitePool):
+        """Initialize a SQLite database for tracking (applies pending schema migrations)"""
+        with pool.connection() as conn:
+            run_migrations(conn, self)
+
+    def _insert_calendar_posts(self, conn, plan_id: str, brand_name: str,
+                               posts: List[Dict[str, Any]]):
+        """Insert serialized calendar posts for a plan (caller commits)"""
+        conn.executemany("""
+            INSERT INTO calendar_posts
+            (plan_id, brand_name, date, platform, position, pillar, topic, post_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                plan_id,
+                brand_name,
+                post['date'],
+                post['platform'],
+                position,
+                post.get('pillar'),
+                post.get('topic'),
+                json.dumps(post, ensure_ascii=False)
+            )
+            for position, post in enumerate(posts)
+        ])
+
+    def _get_db(self, brand_name: Optional[str] = None, shard: Optional[str] = None):
+        """Get database connection context manager for a brand's shard (pooled per thread)"""
+        return self.shards.pool(shard or self.shards.shard_for(brand_name)).connection()
+
+    def _exists_in_any_shard(self, query: str, params: tuple) -> bool:
+        """Run an existence query on every shard until one returns a row"""
+        for shard in self.shards.keys():
+            with self._get_db(shard=shard) as conn:
+                if conn.execute(query, params).fetchone() is not None:
+                    return True
+        return False
+
+    def close(self):
+        """Write pending mirror files and close all pooled database connections"""
+        self.mirror.close()
+        self.shards.close_all()
 
     # Strategy Management
     def save_monthly_plan(self, plan: MonthlyPlan) -> str:
@@ -152,15 +187,29 @@ class StorageManager:
         """
         plan_id = f"plan_{plan.brand_name}_{plan.calendar.start_date}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
 
-        # Save to JSON file
         plan_file = self.strategies_path / f"{plan_id}.json"
-        with open(plan_file, 'w', encoding='utf-8') as f:
-            json.dump(plan.dict(), f, indent=2, ensure_ascii=False)
+        plan_format, plan_blob = encode_plan(plan, self.plan_format)
 
         # Save to database
-        with self._get_db() as conn:
+        with self._get_db(plan.brand_name) as conn:
             cursor = conn.cursor()
 
+            # Bump the brand's plan version (invalidates caches in every process).
+            # Written first so the write lock is held before the previous version is read.
+            cursor.execute("""
+                INSERT INTO brand_plan_versions (brand_name, version, plan_id, updated_at)
+                VALUES (?, 1, ?, ?)
+                ON CONFLICT(brand_name) DO UPDATE SET
+                    version = version + 1,
+                    plan_id = excluded.plan_id,
+                    updated_at = excluded.updated_at
+            """, (plan.brand_name, plan_id, datetime.now().isoformat()))
+            version = self._get_plan_version(conn, plan.brand_name)
+            self._record_plan_version(conn, plan, plan_id, version)
+
+            if self.mirror.enabled:
+                self._register_mirror_files(conn, [(plan_file, 'plan', plan.created_at[:10], plan_id)])
+
             # Deactivate previous plans
             cursor.execute("""
                 UPDATE monthly_plans SET is_active = 0
@@ -170,8 +219,9 @@ class StorageManager:
             # Insert new plan
             cursor.execute("""
                 INSERT INTO monthly_plans
-                (id, brand_name, start_date, end_date, created_at, is_active, plan_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                (id, brand_name, start_date, end_date, created_at, is_active,
+                 plan_format, plan_blob)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 plan_id,
                 plan.brand_name,
@@ -179,12 +229,34 @@ class StorageManager:
                 plan.calendar.end_date,
                 plan.created_at,
                 True,
-                json.dumps(plan.dict())
+                plan_format,
+                plan_blob
             ))
+
+            # Index each calendar post for date lookups
+            posts = [post.model_dump(mode='json') for post in plan.calendar.posts]
+            self._insert_calendar_posts(conn, plan_id, plan.brand_name, posts)
+
+            superseded_files = self._prune_superseded_plans(conn, plan.brand_name)
             conn.commit()
 
+        # Write-through: the saved plan becomes the cached active plan
+        self.plan_cache.put(plan.brand_name, version, plan)
+
+        # JSON file mirror (superseded plans are only kept in plan_history)
+        self.mirror.submit(plan_file, plan)
+        for path in superseded_files:
+            self.mirror.remove(path)
+
         return plan_id
 
+    def _get_plan_version(self, conn, brand_name: str) -> int:
+        """Get the current plan version for a brand (0 if never versioned)"""
+        row = conn.execute("""
+            SELECT version FROM brand_plan_versions WHERE brand_name = ?
+        """, (brand_name,)).fetchone()
+        return row['version'] if row else 0
+
     def get_active_plan(self, brand_name: str) -> Optional[MonthlyPlan]:
         """
         Get the active monthly plan for a brand
@@ -195,42 +267,396 @@ class StorageManager:
         Returns:
             Active monthly plan or None
         """
-        with self._get_db() as conn:
+        with self._get_db(brand_name) as conn:
+            version = self._get_plan_version(conn, brand_name)
+            cached = self.plan_cache.get(brand_name, version)
+            if cached is not None:
+                return cached
+
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT plan_json FROM monthly_plans
+                SELECT plan_format, plan_blob, plan_json FROM monthly_plans
                 WHERE brand_name = ? AND is_active = 1
                 ORDER BY created_at DESC LIMIT 1
             """, (brand_name,))
 
             row = cursor.fetchone()
             if row:
-                plan_data = json.loads(row['plan_json'])
-                return MonthlyPlan(**plan_data)
+                plan = self._load_plan(row)
+                self.plan_cache.put(brand_name, version, plan)
+                return plan
+
+        return None
+
+    def _load_plan(self, row) -> MonthlyPlan:
+        """Decode a monthly_plans row (rows saved before plan codecs only have plan_json)"""
+        if row['plan_format']:
+            return decode_plan(row['plan_format'], row['plan_blob'])
+        return load_json(MonthlyPlan, row['plan_json'])
+
+    def _record_plan_version(self, conn, plan: MonthlyPlan, plan_id: str, version: int):
+        """Store a plan version as a delta against the previous version or as a snapshot (caller commits)"""
+        data = plan.model_dump(mode='json')
+
+        # The active plan is the previous version if it was recorded in the history
+        previous = conn.execute("""
+            SELECT mp.plan_format, mp.plan_blob, mp.plan_json, ph.base_version
+            FROM monthly_plans mp
+            JOIN plan_history ph ON ph.plan_id = mp.id AND ph.version = ?
+            WHERE mp.brand_name = ? AND mp.is_active = 1
+            ORDER BY mp.created_at DESC LIMIT 1
+        """, (version - 1, plan.brand_name)).fetchone()
+
+        base_version, delta = None, None
+        if previous:
+            base_version = previous['base_version']
+            delta = diff_plans(self._load_plan(previous).model_dump(mode='json'), data)
+
+        if needs_snapshot(version, base_version, delta, len(plan.calendar.posts),
+                          self.plan_snapshot_interval):
+            kind, base_version, payload = 'snapshot', version, data
+        else:
+            kind, payload = 'delta', delta
+
+        conn.execute("""
+            INSERT INTO plan_history
+            (brand_name, version, plan_id, kind, base_version, plan_format, payload, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            plan.brand_name,
+            version,
+            plan_id,
+            kind,
+            base_version,
+            self.plan_format,
+            encode_document(payload, self.plan_format),
+            datetime.now().isoformat()
+        ))
+
+    def _prune_superseded_plans(self, conn, brand_name: str) -> List[Path]:
+        """Drop full copies of inactive plans that plan_history can rebuild (caller commits)
+
+        Returns:
+            Mirror files of the pruned plans, to be removed after the commit
+        """
+        plan_ids = [row['id'] for row in conn.execute("""
+            SELECT mp.id FROM monthly_plans mp
+            JOIN plan_history ph ON ph.plan_id = mp.id
+            WHERE mp.brand_name = ? AND mp.is_active = 0
+            AND (mp.plan_blob IS NOT NULL OR mp.plan_json IS NOT NULL)
+        """, (brand_name,))]
+        if not plan_ids:
+            return []
+
+        conn.executemany("""
+            UPDATE monthly_plans SET plan_blob = NULL, plan_json = NULL WHERE id = ?
+        """, [(plan_id,) for plan_id in plan_ids])
+        conn.executemany("DELETE FROM calendar_posts WHERE plan_id = ?",
+                         [(plan_id,) for plan_id in plan_ids])
+
+        files = [self.strategies_path / f"{plan_id}.json" for plan_id in plan_ids]
+        conn.executemany("DELETE FROM mirror_files WHERE path = ?",
+                         [(str(path),) for path in files])
+        return files
+
+    def _rebuild_plan(self, conn, brand_name: str, version: int) -> Optional[MonthlyPlan]:
+        """Rebuild a plan version from its base snapshot and the following deltas"""
+        row = conn.execute("""
+            SELECT base_version FROM plan_history WHERE brand_name = ? AND version = ?
+        """, (brand_name, version)).fetchone()
+        if not row:
+            return None
+
+        data = None
+        for step in conn.execute("""
+            SELECT kind, plan_format, payload FROM plan_history
+            WHERE brand_name = ? AND version BETWEEN ? AND ?
+            ORDER BY version
+        """, (brand_name, row['base_version'], version)):
+            payload = decode_document(step['plan_format'], step['payload'])
+            data = payload if step['kind'] == 'snapshot' else apply_delta(data, payload)
+
+        return load_object(MonthlyPlan, data)
+
+    def _load_plan_by_id(self, conn, plan_id: str) -> Optional[MonthlyPlan]:
+        """Load any stored plan, rebuilding pruned ones from plan_history"""
+        row = conn.execute("""
+            SELECT plan_format, plan_blob, plan_json FROM monthly_plans WHERE id = ?
+        """, (plan_id,)).fetchone()
+        if row and (row['plan_blob'] is not None or row['plan_json'] is not None):
+            return self._load_plan(row)
+
+        history = conn.execute("""
+            SELECT brand_name, version FROM plan_history WHERE plan_id = ?
+        """, (plan_id,)).fetchone()
+        if history:
+            return self._rebuild_plan(conn, history['brand_name'], history['version'])
+        return None
+
+    def get_plan(self, plan_id: str) -> Optional[MonthlyPlan]:
+        """
+        Get a monthly plan by ID, active or superseded
+
+        Args:
+            plan_id: Plan ID
 
+        Returns:
+            Monthly plan or None
+        """
+        for shard in self.shards.keys():
+            with self._get_db(shard=shard) as conn:
+                plan = self._load_plan_by_id(conn, plan_id)
+            if plan is not None:
+                return plan
         return None
 
-    def get_daily_posts(self, brand_name: str, target_date: str) -> List[DailyPost]:
+    def get_plan_at_version(self, brand_name: str, version: int) -> Optional[MonthlyPlan]:
+        """
+        Rebuild a brand's plan as it was at a given version
+
+        Args:
+            brand_name: Brand name
+            version: Plan version (see list_plan_versions)
+
+        Returns:
+            Monthly plan or None if the version is not in the history
+        """
+        with self._get_db(brand_name) as conn:
+            return self._rebuild_plan(conn, brand_name, version)
+
+    def list_plan_versions(self, brand_name: str) -> List[Dict[str, Any]]:
+        """
+        List the recorded plan versions of a brand
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            Versions, newest first, with their storage kind and size
+        """
+        with self._get_db(brand_name) as conn:
+            cursor = conn.execute("""
+                SELECT version, plan_id, kind, base_version, plan_format,
+                       length(payload) AS size, created_at
+                FROM plan_history
+                WHERE brand_name = ?
+                ORDER BY version DESC
+            """, (brand_name,))
+            return [dict(row) for row in cursor.fetchall()]
+
+    def warm_plan_cache(self) -> int:
+        """
+        Load the active plan of every brand into the plan cache
+
+        Returns:
+            Number of plans loaded
+        """
+        brands = []
+        for shard in self.shards.keys():
+            with self._get_db(shard=shard) as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT DISTINCT brand_name FROM monthly_plans
+                    WHERE is_active = 1
+                    LIMIT ?
+                """, (self.plan_cache.max_entries - len(brands),))
+                brands.extend(row['brand_name'] for row in cursor.fetchall())
+            if len(brands) >= self.plan_cache.max_entries:
+                break
+
+        return sum(1 for brand in brands if self.get_active_plan(brand) is not None)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get plan cache, membership filter, shard and connection pool counters"""
+        return {
+            'plan_cache': self.plan_cache.get_stats(),
+            'membership': dict(
+                self._membership_counters,
+                **{name: bloom.get_stats() for name, bloom in self._membership.items()}
+            ),
+            'shards': self.shards.get_stats(),
+            'db_pool': self.db.get_stats()
+        }
+
+    def get_active_plan_version(self, brand_name: str) -> Tuple[int, Optional[str]]:
+        """
+        Get the version of a brand's active plan without loading it (changes whenever a plan is saved)
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            (version, plan ID), or (0, None) if the brand has no versioned plan
+        """
+        with self._get_db(brand_name) as conn:
+            row = conn.execute("""
+                SELECT version, plan_id FROM brand_plan_versions WHERE brand_name = ?
+            """, (brand_name,)).fetchone()
+        return (row['version'], row['plan_id']) if row else (0, None)
+
+    def get_active_plan_id(self, brand_name: str) -> Optional[str]:
+        """
+        Get the ID of the active monthly plan for a brand without loading it
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            Active plan ID or None
+        """
+        with self._get_db(brand_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id FROM monthly_plans
+                WHERE brand_name = ? AND is_active = 1
+                ORDER BY created_at DESC LIMIT 1
+            """, (brand_name,))
+
+            row = cursor.fetchone()
+            return row['id'] if row else None
+
+    def get_daily_posts(self, brand_name: str, target_date: str,
+                        platforms: Optional[List[Platform]] = None) -> List[DailyPost]:
         """
         Get posts scheduled for a specific date
 
         Args:
             brand_name: Brand name
             target_date: Target date (YYYY-MM-DD)
+            platforms: Optional platform filter
 
         Returns:
             List of daily posts
         """
-        plan = self.get_active_plan(brand_name)
-        if not plan:
-            return []
+        params: List[Any] = [brand_name, target_date]
+        platform_filter = ""
+        if platforms:
+            platform_filter = f"AND platform IN ({', '.join('?' for _ in platforms)})"
+            params.extend(platform.value for platform in platforms)
 
-        return [post for post in plan.calendar.posts if post.date == target_date]
+        with self._get_db(brand_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT post_json FROM calendar_posts
+                WHERE plan_id = (
+                    SELECT id FROM monthly_plans
+                    WHERE brand_name = ? AND is_active = 1
+                    ORDER BY created_at DESC LIMIT 1
+                ) AND date = ? {platform_filter}
+                ORDER BY position
+            """, params)
+
+            rows = cursor.fetchall()
+
+        return load_json_rows(DailyPost, (row['post_json'] for row in rows))
 
     # Idempotency and Deduplication
+    def rebuild_membership(self, min_capacity: int = 10000):
+        """
+        Rebuild the idempotency filters from the database
+
+        Bloom filters cannot forget keys, so this runs after retention deletes
+        rows and when a filter holds more keys than it was sized for.
+
+        Args:
+            min_capacity: Minimum number of keys each filter is sized for
+        """
+        with self._membership_lock:
+            posts, runs = 0, 0
+            for shard in self.shards.keys():
+                with self._get_db(shard=shard) as conn:
+                    posts += conn.execute("SELECT COUNT(*) FROM posted_content").fetchone()[0]
+                    runs += conn.execute("SELECT COUNT(*) FROM orchestrator_runs").fetchone()[0]
+
+            # Room to grow before the next rebuild
+            self._membership = {
+                'posted': BloomFilter(max(min_capacity, 2 * posts)),
+                'content': BloomFilter(max(min_capacity, 2 * posts)),
+                'runs': BloomFilter(max(min_capacity, 2 * runs)),
+            }
+            # Rowid watermarks per shard, and rows this process already added past them
+            self._membership_marks: Dict[str, Dict[str, int]] = {}
+            self._membership_added: Dict[str, Dict[str, Set[int]]] = {}
+            self._sync_membership()
+
+            self._membership_counters['rebuilds'] += 1
+
+    def _sync_membership(self):
+        """Add rows inserted since the last sync (by any process, in any shard) to the filters"""
+        with self._membership_lock:
+            for shard in self.shards.keys():
+                marks = self._membership_marks.setdefault(shard, {'posts': 0, 'runs': 0})
+                added = self._membership_added.setdefault(shard, {'posts': set(), 'runs': set()})
+                with self._get_db(shard=shard) as conn:
+                    for row in conn.execute("""
+                        SELECT rowid, date, platform, content_hash, success FROM posted_content
+                        WHERE rowid > ? ORDER BY rowid
+                    """, (marks['posts'],)):
+                        marks['posts'] = row['rowid']
+                        if row['rowid'] in added['posts']:
+                            # Added by record_post already: counting it twice would
+                            # saturate the filter at half its capacity
+                            continue
+                        if row['success']:
+                            self._membership['posted'].add(f"{row['date']}|{row['platform']}")
+                        if row['content_hash']:
+                            self._membership['content'].add(row['content_hash'])
+
+                    for row in conn.execute("""
+                        SELECT id, run_date FROM orchestrator_runs
+                        WHERE id > ? ORDER BY id
+                    """, (marks['runs'],)):
+                        marks['runs'] = row['id']
+                        if row['id'] not in added['runs']:
+                            self._membership['runs'].add(row['run_date'])
+
+                # Rows at or below the watermarks are never read again
+                for table in ('posts', 'runs'):
+                    added[table] = {rowid for rowid in added[table] if rowid > marks[table]}
+
+            self._membership_counters['syncs'] += 1
+
+        if any(bloom.is_saturated for bloom in self._membership.values()):
+            self.rebuild_membership()
+
+    def _mark_membership_added(self, shard: str, table: str, rowid: int):
+        """Remember a row already added to the filters, so the next sync skips it"""
+        if rowid > self._membership_marks.get(shard, {}).get(table, 0):
+            added = self._membership_added.setdefault(shard, {'posts': set(), 'runs': set()})
+            added[table].add(rowid)
+
+    def _membership_stale(self) -> bool:
+        """Whether another connection committed to any shard since this thread last looked
+
+        Rows this process records are added to the filters directly, any other
+        commit (another worker, another thread) makes the filters read new rows.
+        """
+        # No short-circuit: every shard's version must be recorded
+        return any([self.shards.pool(shard).data_changed() for shard in self.shards.keys()])
+
+    def _may_contain(self, name: str, key: str) -> bool:
+        """Check a membership filter; False is definitive, True must be confirmed in the DB"""
+        # Read rows written by other processes first, so a post recorded by another
+        # worker is never reported as absent
+        if self._membership_stale():
+            self._sync_membership()
+
+        if key in self._membership[name]:
+            self._membership_counters['db_checks'] += 1
+            return True
+
+        self._membership_counters['negatives'] += 1
+        return False
+
+    def _confirm(self, found: bool) -> bool:
+        """Count filter positives the database did not confirm"""
+        if not found:
+            self._membership_counters['false_positives'] += 1
+        return found
+
     def has_been_posted(self, date: str, platform: Platform) -> bool:
         """
-        Check if content has already been posted for a date/platform
+        Check if content has already been posted for a date/platform (by any brand)
 
         Args:
             date: Date (YYYY-MM-DD)
@@ -239,14 +665,13 @@ class StorageManager:
         Returns:
             True if already posted
         """
-        with self._get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id FROM posted_content
-                WHERE date = ? AND platform = ? AND success = 1
-            """, (date, platform.value))
+        if not self._may_contain('posted', f"{date}|{platform.value}"):
+            return False
 
-            return cursor.fetchone() is not None
+        return self._confirm(self._exists_in_any_shard("""
+            SELECT id FROM posted_content
+            WHERE date = ? AND platform = ? AND success = 1
+        """, (date, platform.value)))
 
     def get_content_hash(self, content: str) -> str:
         """
@@ -271,54 +696,217 @@ class StorageManager:
             True if duplicate
         """
         content_hash = self.get_content_hash(content)
+        if not self._may_contain('content', content_hash):
+            return False
+
+        return self._confirm(self._exists_in_any_shard("""
+            SELECT id FROM posted_content
+            WHERE content_hash = ?
+        """, (content_hash,)))
+
+    def find_near_duplicates(self, content: str, brand_name: Optional[str] = None,
+                             platform: Optional[Platform] = None, days: int = 30,
+                             threshold: float = 0.5, limit: int = 5,
+                             reference_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find recently posted content similar to a text
 
-        with self._get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id FROM posted_content
-                WHERE content_hash = ?
-            """, (content_hash,))
+        Candidates come from the LSH buckets of the text's MinHash signature
+        (one index range per band), so the cost does not grow with the number
+        of stored posts. Posts are indexed per brand: brand_name=None only
+        matches posts recorded without a brand.
 
-            return cursor.fetchone() is not None
+        Args:
+            content: Text about to be posted
+            brand_name: Brand the post belongs to
+            platform: Restrict matches to one platform (optional)
+            days: Look-back window in days
+            threshold: Minimum estimated Jaccard similarity of character 4-grams (0-1)
+            limit: Maximum number of matches
+            reference_date: End of the look-back window (defaults to today)
+
+        Returns:
+            Matches (record_id, post_id, platform, date, similarity), most similar first
+        """
+        signature = minhash(content)
+        buckets = lsh_buckets(signature, brand_name)
+        end = datetime.strptime(reference_date, '%Y-%m-%d') if reference_date else datetime.now()
+        since = (end - timedelta(days=days)).strftime('%Y-%m-%d')
+
+        with self._get_db(brand_name) as conn:
+            rows = conn.execute(f"""
+                SELECT s.record_id, s.platform, s.date, s.signature, p.post_id
+                FROM content_signatures s
+                JOIN posted_content p ON p.id = s.record_id
+                WHERE s.record_id IN (
+                    SELECT record_id FROM content_lsh
+                    WHERE bucket IN ({','.join('?' * len(buckets))}) AND date >= ?
+                )
+            """, (*buckets, since)).fetchall()
+
+        matches = []
+        for row in rows:
+            if platform and row['platform'] != platform.value:
+                continue
+            score = similarity(signature, signature_from_bytes(row['signature']))
+            if score >= threshold:
+                matches.append({
+                    'record_id': row['record_id'],
+                    'post_id': row['post_id'],
+                    'platform': row['platform'],
+                    'date': row['date'],
+                    'similarity': score
+                })
+
+        matches.sort(key=lambda match: match['similarity'], reverse=True)
+        return matches[:limit]
+
+    def is_near_duplicate(self, content: str, brand_name: Optional[str] = None,
+                          platform: Optional[Platform] = None, days: int = 30,
+                          threshold: float = 0.5) -> bool:
+        """
+        Check if similar content was posted recently (see find_near_duplicates)
+
+        Returns:
+            True if at least one recent post is within the similarity threshold
+        """
+        return bool(self.find_near_duplicates(content, brand_name, platform, days, threshold, limit=1))
+
+    def _index_content(self, conn, record_id: str, brand_name: Optional[str], platform: str,
+                       date: str, content: str, signature: Optional[List[int]] = None):
+        """Store the MinHash signature and LSH buckets of a post (caller commits)"""
+        signature = signature or minhash(content)
+        conn.execute("""
+            INSERT INTO content_signatures (record_id, brand_name, platform, date, signature)
+            VALUES (?, ?, ?, ?, ?)
+        """, (record_id, brand_name, platform, date, signature_to_bytes(signature)))
+        conn.executemany("""
+            INSERT OR IGNORE INTO content_lsh (bucket, date, record_id) VALUES (?, ?, ?)
+        """, [(bucket, date, record_id) for bucket in lsh_buckets(signature, brand_name)])
 
     # Post Recording
-    def record_post(self, record: PostRecord) -> bool:
+    def record_post(self, record: PostRecord, brand_name: Optional[str] = None) -> bool:
         """
         Record a posted content
 
+        Uniqueness of (date, platform) and of the content hash is enforced
+        within the brand's shard.
+
         Args:
             record: Post record
+            brand_name: Brand the post was published for (scopes near-duplicate lookups)
 
         Returns:
             Success status
         """
-        # Save to JSON file
         post_file = self.posts_path / f"{record.date}_{record.platform.value}_{record.id}.json"
-        with open(post_file, 'w', encoding='utf-8') as f:
-            json.dump(record.dict(), f, indent=2, ensure_ascii=False)
+        content = record.generated_post.content
+        signature = minhash(content) if content else None
 
-        # Save to database
-        with self._get_db() as conn:
+        # Save to the brand's shard (the full record is stored alongside the lookup columns)
+        shard = self.shards.shard_for(brand_name)
+        with self._get_db(shard=shard) as conn:
             cursor = conn.cursor()
+            if self.mirror.enabled:
+                self._register_mirror_files(conn, [(post_file, 'post', record.date, record.id)])
+
+            # INSERT OR REPLACE does not fire delete triggers: drop the
+            # signatures of the rows it is about to replace
+            cursor.execute("""
+                DELETE FROM content_signatures WHERE record_id IN (
+                    SELECT id FROM posted_content
+                    WHERE id = ? OR (date = ? AND platform = ?) OR content_hash = ?
+                )
+            """, (record.id, record.date, record.platform.value, record.content_hash))
+
             cursor.execute("""
                 INSERT OR REPLACE INTO posted_content
-                (id, date, platform, post_id, content_hash, content, posted_at, success, error)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                (id, date, platform, post_id, content_hash, content, posted_at, success, error,
+                 record_json, brand_name)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 record.id,
                 record.date,
                 record.platform.value,
                 record.post_id,
                 record.content_hash,
-                record.generated_post.content,
+                content,
                 record.posting_result.timestamp,
                 record.posting_result.success,
-                record.posting_result.error
+                record.posting_result.error,
+                record.model_dump_json(),
+                brand_name
             ))
+
+            rowid = cursor.lastrowid
+
+            if signature:
+                self._index_content(conn, record.id, brand_name, record.platform.value,
+                                    record.date, content, signature)
             conn.commit()
 
+        # Visible to idempotency checks right away (other processes pick it up on sync)
+        with self._membership_lock:
+            if record.posting_result.success:
+                self._membership['posted'].add(f"{record.date}|{record.platform.value}")
+            self._membership['content'].add(record.content_hash)
+            self._mark_membership_added(shard, 'posts', rowid)
+        if record.post_id:
+            self._remember_post_shard(record.post_id, shard)
+
+        # Reference the post's image so it is kept until the post is deleted
+        if record.generated_post.image_base64:
+            self.save_image(record.generated_post.image_base64, record.platform,
+                            record.date, record_id=record.id, brand_name=brand_name)
+
+        # JSON file mirror
+        self.mirror.submit(post_file, record)
+
         return True
 
+    def _remember_post_shard(self, post_id: str, shard: str):
+        """Cache the shard of a platform post ID (bounded, cleared when full)"""
+        if len(self._post_shards) >= 100000:
+            self._post_shards.clear()
+        self._post_shards[post_id] = shard
+
+    def _shards_of_posts(self, post_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Find the shard holding each platform post ID
+
+        Args:
+            post_ids: Platform post IDs
+
+        Returns:
+            Shard key per post ID (the default shard for posts not recorded anywhere)
+        """
+        if not self.shards.enabled:
+            return {post_id: DEFAULT_SHARD for post_id in post_ids}
+
+        routes, missing = {}, set()
+        for post_id in post_ids:
+            if post_id in self._post_shards:
+                routes[post_id] = self._post_shards[post_id]
+            else:
+                missing.add(post_id)
+
+        for shard in self.shards.keys():
+            if not missing:
+                break
+            with self._get_db(shard=shard) as conn:
+                found = [row['post_id'] for row in conn.execute(f"""
+                    SELECT DISTINCT post_id FROM posted_content
+                    WHERE post_id IN ({','.join('?' * len(missing))})
+                """, list(missing))]
+            for post_id in found:
+                routes[post_id] = shard
+                missing.discard(post_id)
+                self._remember_post_shard(post_id, shard)
+
+        # Not cached: the post may still be recorded in its brand's shard
+        routes.update((post_id, DEFAULT_SHARD) for post_id in missing)
+        return routes
+
     def get_posted_content(self, start_date: str, end_date: str,
                           platform: Optional[Platform] = None) -> List[PostRecord]:
         """
@@ -332,32 +920,32 @@ class StorageManager:
         Returns:
             List of post records
         """
-        with self._get_db() as conn:
-            cursor = conn.cursor()
-
-            if platform:
-                cursor.execute("""
-                    SELECT * FROM posted_content
-                    WHERE date >= ? AND date <= ? AND platform = ?
-                    ORDER BY date DESC, posted_at DESC
-                """, (start_date, end_date, platform.value))
-            else:
-                cursor.execute("""
-                    SELECT * FROM posted_content
-                    WHERE date >= ? AND date <= ?
-                    ORDER BY date DESC, posted_at DESC
-                """, (start_date, end_date))
-
-            records = []
-            for row in cursor.fetchall():
-                # Load full record from JSON file
-                post_file = self.posts_path / f"{row['date']}_{row['platform']}_{row['id']}.json"
-                if post_file.exists():
-                    with open(post_file, 'r', encoding='utf-8') as f:
-                        record_data = json.load(f)
-                        records.append(PostRecord(**record_data))
-
-            return records
+        shards = self.shards.keys()
+        rows = []
+        for shard in shards:
+            with self._get_db(shard=shard) as conn:
+                cursor = conn.cursor()
+
+                if platform:
+                    cursor.execute("""
+                        SELECT date, posted_at, record_json FROM posted_content
+                        WHERE date >= ? AND date <= ? AND platform = ?
+                        AND record_json IS NOT NULL
+                        ORDER BY date DESC, posted_at DESC
+                    """, (start_date, end_date, platform.value))
+                else:
+                    cursor.execute("""
+                        SELECT date, posted_at, record_json FROM posted_content
+                        WHERE date >= ? AND date <= ?
+                        AND record_json IS NOT NULL
+                        ORDER BY date DESC, posted_at DESC
+                    """, (start_date, end_date))
+                rows.extend(cursor.fetchall())
+
+        if len(shards) > 1:
+            rows.sort(key=lambda row: (row['date'], row['posted_at'] or ''), reverse=True)
+
+        return load_json_rows(PostRecord, (row['record_json'] for row in rows))
 
     # Performance Metrics
     def save_metrics(self, metrics: PerformanceMetrics) -> bool:
@@ -370,34 +958,183 @@ class StorageManager:
         Returns:
             Success status
         """
-        # Save to JSON file
-        metrics_file = self.metrics_path / f"{metrics.post_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}.json"
-        with open(metrics_file, 'w', encoding='utf-8') as f:
-            json.dump(metrics.dict(), f, indent=2)
+        self.save_metrics_bulk([metrics])
+        return True
 
-        # Save to database
-        with self._get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO performance_metrics
-                (post_id, platform, measured_at, impressions, engagements,
-                 clicks, shares, comments, likes, engagement_rate)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                metrics.post_id,
-                metrics.platform.value,
-                metrics.measured_at,
-                metrics.impressions,
-                metrics.engagements,
-                metrics.clicks,
-                metrics.shares,
-                metrics.comments,
-                metrics.likes,
-                metrics.engagement_rate
-            ))
-            conn.commit()
+    def save_metrics_bulk(self, metrics: Iterable[PerformanceMetrics],
+                          batch_size: int = 500,
+                          write_files: Optional[bool] = None) -> Dict[str, int]:
+        """
+        Save many performance metrics in a single transaction
 
-        return True
+        The iterable is consumed in batches, so it can be a generator.
+        Samples already stored for the same (post_id, measured_at) are skipped.
+        Each sample is stored in the shard of its post, with one transaction per shard.
+
+        Args:
+            metrics: Performance metrics to save
+            batch_size: Number of rows sent per executemany call
+            write_files: Also mirror one JSON file per sample (defaults to mirrors being enabled)
+
+        Returns:
+            Counts of received, inserted and duplicate samples
+        """
+        if write_files is None or not self.mirror.enabled:
+            write_files = self.mirror.enabled
+
+        stats = {'received': 0, 'inserted': 0, 'duplicates': 0}
+        iterator = iter(metrics)
+        mirrors = []
+
+        with ExitStack() as stack:
+            connections = {}
+            while True:
+                batch = list(islice(iterator, batch_size))
+                if not batch:
+                    break
+                stats['received'] += len(batch)
+
+                routes = self._shards_of_posts({sample.post_id for sample in batch})
+                by_shard: Dict[str, List[PerformanceMetrics]] = {}
+                for sample in batch:
+                    by_shard.setdefault(routes[sample.post_id], []).append(sample)
+
+                for shard, samples in by_shard.items():
+                    if shard not in connections:
+                        connections[shard] = stack.enter_context(self._get_db(shard=shard))
+                    stats['inserted'] += self._insert_metrics(connections[shard], samples,
+                                                              write_files, mirrors)
+
+            for conn in connections.values():
+                conn.commit()
+
+        for metrics_file, sample in mirrors:
+            self.mirror.submit(metrics_file, sample)
+
+        stats['duplicates'] = stats['received'] - stats['inserted']
+        return stats
+
+    def _insert_metrics(self, conn, batch: List[PerformanceMetrics], write_files: bool,
+                        mirrors: List[tuple]) -> int:
+        """Insert samples into one shard and queue their mirror files for after the commit (caller commits)
+
+        Returns:
+            Number of samples inserted (duplicates are skipped)
+        """
+        # total_changes would also count the rollup trigger writes
+        last_id = conn.execute("SELECT MAX(id) FROM performance_metrics").fetchone()[0] or 0
+        conn.executemany("""
+            INSERT OR IGNORE INTO performance_metrics
+            (post_id, platform, measured_at, impressions, engagements,
+             clicks, shares, comments, likes, engagement_rate)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                sample.post_id,
+                sample.platform.value,
+                sample.measured_at,
+                sample.impressions,
+                sample.engagements,
+                sample.clicks,
+                sample.shares,
+                sample.comments,
+                sample.likes,
+                sample.engagement_rate
+            )
+            for sample in batch
+        ])
+        inserted = conn.execute("""
+            SELECT COUNT(*) FROM performance_metrics WHERE id > ?
+        """, (last_id,)).fetchone()[0]
+
+        if write_files:
+            files = [(self._metrics_file_path(sample.post_id, sample.measured_at), 'metrics',
+                      sample.measured_at[:10], f"{sample.post_id}|{sample.measured_at}")
+                     for sample in batch]
+            self._register_mirror_files(conn, files)
+            mirrors.extend(zip((file[0] for file in files), batch))
+
+        return inserted
+
+    def _register_mirror_files(self, conn, files: List[tuple]):
+        """Record mirror files as (path, kind, ref_date, ref_id) for retention and rebuilds (caller commits)"""
+        now = datetime.now().isoformat()
+        conn.executemany("""
+            INSERT OR REPLACE INTO mirror_files (path, kind, ref_date, created_at, ref_id)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(str(path), kind, ref_date, now, ref_id) for path, kind, ref_date, ref_id in files])
+
+    def _load_mirror_source(self, conn, kind: str, ref_id: str) -> Optional[Any]:
+        """Load the data of a mirror file from its source row (None if the row is gone)"""
+        if kind == 'metrics':
+            post_id, measured_at = ref_id.rsplit('|', 1)
+            row = conn.execute("""
+                SELECT * FROM performance_metrics
+                WHERE post_id = ? AND measured_at = ?
+            """, (post_id, measured_at)).fetchone()
+            return load_object(PerformanceMetrics, dict(row)) if row else None
+        if kind == 'plan':
+            return self._load_plan_by_id(conn, ref_id)
+
+        query = {
+            'post': "SELECT record_json FROM posted_content WHERE id = ?",
+            'state': "SELECT state_json FROM orchestrator_states WHERE date = ?",
+        }.get(kind)
+        if query is None:
+            return None
+        row = conn.execute(query, (ref_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def rebuild_mirrors(self, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Recreate missing JSON mirror files from the database
+
+        Mirrors are registered in the same transaction as their source row, so
+        files lost to a crash (or dropped by a full write-behind queue) are
+        found by walking the registry.
+
+        Args:
+            batch_size: Registry rows checked per query
+
+        Returns:
+            Number of mirror files rewritten per kind
+        """
+        stats: Dict[str, int] = {}
+        if not self.mirror.enabled:
+            return stats
+
+        # Files still queued are not missing
+        self.mirror.flush()
+
+        # Every shard registers the mirrors of its own rows
+        for shard in self.shards.keys():
+            last_path = ''
+            while True:
+                with self._get_db(shard=shard) as conn:
+                    rows = conn.execute("""
+                        SELECT path, kind, ref_id FROM mirror_files
+                        WHERE path > ? AND ref_id IS NOT NULL
+                        ORDER BY path
+                        LIMIT ?
+                    """, (last_path, batch_size)).fetchall()
+                    if not rows:
+                        break
+                    last_path = rows[-1]['path']
+
+                    for row in rows:
+                        if os.path.exists(row['path']):
+                            continue
+                        data = self._load_mirror_source(conn, row['kind'], row['ref_id'])
+                        if data is not None and self.mirror.submit(row['path'], data):
+                            stats[row['kind']] = stats.get(row['kind'], 0) + 1
+
+        self.mirror.flush()
+        return stats
+
+    def _metrics_file_path(self, post_id: str, measured_at: str) -> Path:
+        """Get the JSON mirror path of a metrics sample ({post_id}_{measured_at digits})"""
+        timestamp = re.sub(r'[^0-9]', '', measured_at)[:14]
+        return self.metrics_path / f"{post_id}_{timestamp}.json"
 
     def get_metrics(self, post_id: str) -> List[PerformanceMetrics]:
         """
@@ -409,7 +1146,7 @@ class StorageManager:
         Returns:
             List of performance metrics
         """
-        with self._get_db() as conn:
+        with self._get_db(shard=self._shards_of_posts([post_id])[post_id]) as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT * FROM performance_metrics
@@ -417,65 +1154,127 @@ class StorageManager:
                 ORDER BY measured_at DESC
             """, (post_id,))
 
-            metrics = []
-            for row in cursor.fetchall():
-                metrics.append(PerformanceMetrics(
-                    post_id=row['post_id'],
-                    platform=Platform(row['platform']),
-                    measured_at=row['measured_at'],
-                    impressions=row['impressions'],
-                    engagements=row['engagements'],
-                    clicks=row['clicks'],
-                    shares=row['shares'],
-                    comments=row['comments'],
-                    likes=row['likes'],
-                    engagement_rate=row['engagement_rate']
-                ))
-
-            return metrics
+            return load_rows(PerformanceMetrics, cursor.fetchall())
 
-    def get_yesterday_performance(self, brand_name: str) -> Dict[str, Any]:
+    def aggregate_performance(self, start_date: str, end_date: str,
+                              platforms: Optional[List[Platform]] = None) -> Dict[str, Any]:
         """
-        Get yesterday's performance summary
+        Aggregate post counts and latest metrics for a date range in one query
+
+        Only the most recent metrics sample of each post is counted, read from
+        the weekly rollups (which outlive downsampled raw samples). With
+        sharding the query runs on every shard and the groups are summed.
 
         Args:
-            brand_name: Brand name
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            platforms: Optional platform filter
 
         Returns:
-            Performance summary
+            Totals and per-platform breakdown
         """
-        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-        posts = self.get_posted_content(yesterday, yesterday)
-
-        total_impressions = 0
-        total_engagements = 0
-        platform_stats = {}
+        params: List[Any] = [start_date, end_date]
+        platform_filter = ""
+        if platforms:
+            platform_filter = f"AND platform IN ({', '.join('?' for _ in platforms)})"
+            params.extend(platform.value for platform in platforms)
+
+        rows = []
+        for shard in self.shards.keys():
+            with self._get_db(shard=shard) as conn:
+                rows.extend(conn.execute(f"""
+                    WITH posts AS (
+                        SELECT platform, post_id, success FROM posted_content
+                        WHERE date >= ? AND date <= ? {platform_filter}
+                    ),
+                    latest AS (
+                        SELECT post_id, impressions, engagements, clicks, shares, comments, likes,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY post_id ORDER BY last_measured_at DESC
+                               ) AS rn
+                        FROM metric_rollups
+                        WHERE resolution = 'week' AND post_id IN (SELECT post_id FROM posts)
+                    )
+                    SELECT p.platform,
+                           COUNT(*) AS posts,
+                           COALESCE(SUM(p.success = 1), 0) AS successful,
+                           COUNT(l.post_id) AS posts_with_metrics,
+                           COALESCE(SUM(l.impressions), 0) AS impressions,
+                           COALESCE(SUM(l.engagements), 0) AS engagements,
+                           COALESCE(SUM(l.clicks), 0) AS clicks,
+                           COALESCE(SUM(l.shares), 0) AS shares,
+                           COALESCE(SUM(l.comments), 0) AS comments,
+                           COALESCE(SUM(l.likes), 0) AS likes
+                    FROM posts p
+                    LEFT JOIN latest l ON l.post_id = p.post_id AND l.rn = 1
+                    GROUP BY p.platform
+                """, params).fetchall())
+
+        return summarize_performance(start_date, end_date, rows)
+
+    def get_metrics_series(self, start_date: str, end_date: str, interval: str = 'day',
+                           brand_name: Optional[str] = None,
+                           platform: Optional[Platform] = None) -> Dict[str, Any]:
+        """
+        Get a metrics time series from the rollups
 
-        for post in posts:
-            metrics = self.get_metrics(post.post_id)
-            if metrics:
-                latest_metric = metrics[0]
-                total_impressions += latest_metric.impressions
-                total_engagements += latest_metric.engagements
+        Each point sums, over the posts measured in its bucket, the latest sample
+        of every post within the bucket. Points are read from the coarsest rollup
+        resolution that answers the range exactly (hourly rollups are only kept
+        as long as raw samples).
 
-                if latest_metric.platform not in platform_stats:
-                    platform_stats[latest_metric.platform.value] = {
-                        'impressions': 0,
-                        'engagements': 0
-                    }
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), inclusive
+            interval: Point spacing: 'hour', 'day' or 'week'
+            brand_name: Optional brand filter
+            platform: Optional platform filter
 
-                platform_stats[latest_metric.platform.value]['impressions'] += latest_metric.impressions
-                platform_stats[latest_metric.platform.value]['engagements'] += latest_metric.engagements
+        Returns:
+            Interval, resolution read and the series points
+        """
+        resolution = choose_resolution(interval, start_date, end_date)
+
+        params: List[Any] = [resolution, start_date, f"{end_date}T23:59:59"]
+        filters = ""
+        if brand_name:
+            filters += " AND brand_name = ?"
+            params.append(brand_name)
+        if platform:
+            filters += " AND platform = ?"
+            params.append(platform.value)
+
+        # A brand's rollups live in its shard, global series read every shard
+        shards = [self.shards.shard_for(brand_name)] if brand_name else self.shards.keys()
+        rows = []
+        for shard in shards:
+            with self._get_db(shard=shard) as conn:
+                rows.extend(conn.execute(f"""
+                    SELECT * FROM metric_rollups
+                    WHERE resolution = ? AND bucket_start >= ? AND bucket_start <= ?
+                    {filters}
+                """, params).fetchall())
 
         return {
-            'date': yesterday,
-            'total_posts': len(posts),
-            'total_impressions': total_impressions,
-            'total_engagements': total_engagements,
-            'average_engagement_rate': (total_engagements / total_impressions * 100) if total_impressions > 0 else 0,
-            'platform_breakdown': platform_stats
+            'start_date': start_date,
+            'end_date': end_date,
+            'interval': interval,
+            'resolution': resolution,
+            'points': merge_series(rows, interval)
         }
 
+    def get_yesterday_performance(self, brand_name: str) -> Dict[str, Any]:
+        """
+        Get yesterday's performance summary
+
+        Args:
+            brand_name: Brand name
+
+        Returns:
+            Performance summary
+        """
+        return yesterday_performance(self)
+
     # Orchestrator State
     def save_orchestrator_state(self, state: OrchestratorState) -> bool:
         """
@@ -488,8 +1287,19 @@ class StorageManager:
             Success status
         """
         state_file = self.state_path / f"state_{state.current_date}.json"
-        with open(state_file, 'w', encoding='utf-8') as f:
-            json.dump(state.dict(), f, indent=2, ensure_ascii=False)
+
+        with self._get_db() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO orchestrator_states (date, state_json, updated_at)
+                VALUES (?, ?, ?)
+            """, (state.current_date, state.model_dump_json(), datetime.now().isoformat()))
+            if self.mirror.enabled:
+                self._register_mirror_files(conn, [(state_file, 'state', state.current_date,
+                                                    state.current_date)])
+            conn.commit()
+
+        # JSON file mirror
+        self.mirror.submit(state_file, state)
 
         return True
 
@@ -503,11 +1313,13 @@ class StorageManager:
         Returns:
             Orchestrator state or None
         """
-        state_file = self.state_path / f"state_{date}.json"
-        if state_file.exists():
-            with open(state_file, 'r', encoding='utf-8') as f:
-                state_data = json.load(f)
-                return OrchestratorState(**state_data)
+        with self._get_db() as conn:
+            row = conn.execute("""
+                SELECT state_json FROM orchestrator_states WHERE date = ?
+            """, (date,)).fetchone()
+
+        if row:
+            return load_json(OrchestratorState, row['state_json'])
 
         return None
 
@@ -544,6 +1356,11 @@ class StorageManager:
                 json.dumps(errors) if errors else None
             ))
             conn.commit()
+            rowid = cursor.lastrowid
+
+        with self._membership_lock:
+            self._membership['runs'].add(date)
+            self._mark_membership_added(DEFAULT_SHARD, 'runs', rowid)
 
         return True
 
@@ -557,6 +1374,9 @@ class StorageManager:
         Returns:
             True if already run
         """
+        if not self._may_contain('runs', date):
+            return False
+
         with self._get_db() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -564,87 +1384,443 @@ class StorageManager:
                 WHERE run_date = ?
             """, (date,))
 
-            return cursor.fetchone() is not None
+            return self._confirm(cursor.fetchone() is not None)
+
+    # Post Checkpoints
+    def start_checkpoints(self, brand_name: str, run_date: str,
+                          slots: Iterable[Tuple[Platform, int]],
+                          reset: bool = False) -> List[PostCheckpoint]:
+        """
+        Create pending checkpoints for a brand's scheduled posts of a day
+
+        Existing checkpoints keep their status, so a restarted run sees which
+        posts are already posted.
+
+        Args:
+            brand_name: Brand name
+            run_date: Execution date (YYYY-MM-DD)
+            slots: (platform, index among the platform's posts of the day) of each post
+            reset: Set the given slots back to pending, even posted ones (forced re-run)
+
+        Returns:
+            Every checkpoint of the brand for the day, ordered by platform and slot
+        """
+        now = datetime.now().isoformat()
+        conflict = """
+            DO UPDATE SET status = excluded.status, post_id = NULL, post_url = NULL,
+                          error = NULL, updated_at = excluded.updated_at
+        """ if reset else "DO NOTHING"
+
+        with self._get_db(brand_name) as conn:
+            conn.executemany(f"""
+                INSERT INTO post_checkpoints
+                (run_date, brand_name, platform, slot, status, attempts, updated_at)
+                VALUES (?, ?, ?, ?, ?, 0, ?)
+                ON CONFLICT (run_date, brand_name, platform, slot) {conflict}
+            """, [(run_date, brand_name, platform.value, slot, CheckpointStatus.PENDING.value, now)
+                  for platform, slot in slots])
+            conn.commit()
+
+            rows = conn.execute("""
+                SELECT * FROM post_checkpoints
+                WHERE run_date = ? AND brand_name = ?
+                ORDER BY platform, slot
+            """, (run_date, brand_name)).fetchall()
+
+        return load_rows(PostCheckpoint, rows)
+
+    def update_checkpoint(self, brand_name: str, run_date: str, platform: Platform, slot: int,
+                          status: CheckpointStatus, post_id: Optional[str] = None,
+                          post_url: Optional[str] = None, error: Optional[str] = None) -> bool:
+        """
+        Move a scheduled post to another pipeline stage
+
+        Args:
+            brand_name: Brand name
+            run_date: Execution date (YYYY-MM-DD)
+            platform: Platform of the post
+            slot: Index among the platform's posts of the day
+            status: New status (moving to generating counts an attempt)
+            post_id: Platform post ID (kept when None)
+            post_url: URL of the posted content (kept when None)
+            error: Error of a failed attempt (cleared otherwise)
+
+        Returns:
+            True if the checkpoint exists
+        """
+        with self._get_db(brand_name) as conn:
+            cursor = conn.execute("""
+                UPDATE post_checkpoints SET
+                    status = ?,
+                    attempts = attempts + ?,
+                    post_id = COALESCE(?, post_id),
+                    post_url = COALESCE(?, post_url),
+                    error = ?,
+                    updated_at = ?
+                WHERE run_date = ? AND brand_name = ? AND platform = ? AND slot = ?
+            """, (status.value, int(status == CheckpointStatus.GENERATING), post_id, post_url, error,
+                  datetime.now().isoformat(), run_date, brand_name, platform.value, slot))
+            conn.commit()
+
+        return cursor.rowcount > 0
+
+    def get_checkpoint_summary(self, brand_name: str, run_date: str) -> Dict[str, Any]:
+        """
+        Count a brand's scheduled posts of a day per status
+
+        Args:
+            brand_name: Brand name
+            run_date: Execution date (YYYY-MM-DD)
+
+        Returns:
+            Total and per-status counts (0 everywhere before the first run) and last_update
+        """
+        with self._get_db(brand_name) as conn:
+            rows = conn.execute("""
+                SELECT status, COUNT(*) AS posts, MAX(updated_at) AS updated_at
+                FROM post_checkpoints
+                WHERE run_date = ? AND brand_name = ?
+                GROUP BY status
+            """, (run_date, brand_name)).fetchall()
+
+        return summarize_checkpoints(tuple(row) for row in rows)
+
+    # Jobs
+    def _row_to_job(self, row) -> Job:
+        """Build a Job from a jobs row"""
+        data = dict(row)
+        data['request'] = json.loads(data.pop('request_json'))
+        result_json = data.pop('result_json')
+        data['result'] = json.loads(result_json) if result_json else None
+        details_json = data.pop('details_json')
+        data['details'] = json.loads(details_json) if details_json else None
+        data['cancel_requested'] = bool(data['cancel_requested'])
+        return load_object(Job, data)
+
+    def create_job(self, job: Job) -> bool:
+        """
+        Store a new job
+
+        Args:
+            job: Job to store (usually queued)
+
+        Returns:
+            Success status
+        """
+        with self._get_db() as conn:
+            conn.execute("""
+                INSERT INTO jobs
+                (id, kind, status, stage, progress, request_json, concurrency_key, result_json,
+                 error, attempts, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (job.id, job.kind, job.status.value, job.stage, job.progress,
+                  json.dumps(job.request, ensure_ascii=False), job.concurrency_key,
+                  json.dumps(job.result, ensure_ascii=False) if job.result is not None else None,
+                  job.error, job.attempts, job.created_at, job.updated_at))
+            conn.commit()
+        return True
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        Get a job by ID
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job or None
+        """
+        with self._get_db() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, status: Optional[JobStatus] = None, limit: int = 100) -> List[Job]:
+        """
+        List jobs, oldest first
+
+        Args:
+            status: Only jobs with this status (optional)
+            limit: Maximum number of jobs
+
+        Returns:
+            Jobs ordered by submission time
+        """
+        with self._get_db() as conn:
+            if status:
+                rows = conn.execute("""
+                    SELECT * FROM jobs
+                    WHERE status = ?
+                    ORDER BY created_at LIMIT ?
+                """, (status.value, limit)).fetchall()
+            else:
+                rows = conn.execute("""
+                    SELECT * FROM jobs ORDER BY created_at LIMIT ?
+                """, (limit,)).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def claim_job(self, job_id: str, owner: str, max_per_key: int = 1) -> Optional[Job]:
+        """
+        Atomically move a queued job to running for one worker
+
+        Args:
+            job_id: Job ID
+            owner: Worker identifier, required by later updates and heartbeats
+            max_per_key: Maximum number of running jobs of the same type and
+                concurrency key, across all workers (jobs without a key are not limited)
+
+        Returns:
+            The claimed job, or None if it was not queued (e.g. claimed by another
+            worker) or its key is at the limit
+        """
+        now = datetime.now().isoformat()
+        with self._get_db() as conn:
+            # One statement: SQLite serializes writers, so the count cannot go stale
+            cursor = conn.execute("""
+                UPDATE jobs SET status = 'running', owner = ?, attempts = attempts + 1,
+                                updated_at = ?, heartbeat_at = ?
+                WHERE id = ? AND status = 'queued'
+                  AND (concurrency_key IS NULL OR (
+                      SELECT COUNT(*) FROM jobs AS other
+                      WHERE other.kind = jobs.kind AND other.concurrency_key = jobs.concurrency_key
+                        AND other.status = 'running'
+                  ) < ?)
+            """, (owner, now, now, job_id, max_per_key))
+            conn.commit()
+            if cursor.rowcount == 0:
+                return None
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row)
+
+    def update_job(self, job_id: str, status: Optional[JobStatus] = None, stage: Optional[str] = None,
+                   progress: Optional[int] = None, result: Optional[Dict[str, Any]] = None,
+                   error: Optional[str] = None, owner: Optional[str] = None,
+                   details: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Update a job (fields left to None keep their value)
+
+        Args:
+            job_id: Job ID
+            status: New status
+            stage: Current stage
+            progress: Completion percentage
+            result: Result of a succeeded job
+            error: Error of a failed job
+            owner: Only update if the job is still claimed by this worker (optional)
+            details: Live progress details (replace the previous ones)
+
+        Returns:
+            True if the job was updated
+        """
+        with self._get_db() as conn:
+            cursor = conn.execute("""
+                UPDATE jobs SET
+                    status = COALESCE(?, status),
+                    stage = COALESCE(?, stage),
+                    progress = COALESCE(?, progress),
+                    result_json = COALESCE(?, result_json),
+                    error = COALESCE(?, error),
+                    details_json = COALESCE(?, details_json),
+                    updated_at = ?
+                WHERE id = ? AND (? IS NULL OR owner = ?)
+            """, (status.value if status else None, stage, progress,
+                  json.dumps(result, ensure_ascii=False) if result is not None else None,
+                  error, json.dumps(details, ensure_ascii=False) if details is not None else None,
+                  datetime.now().isoformat(), job_id, owner, owner))
+            conn.commit()
+        return cursor.rowcount > 0
+
+    def heartbeat_jobs(self, job_ids: List[str], owner: str) -> int:
+        """
+        Record that a worker is still running its jobs
+
+        Args:
+            job_ids: IDs of the jobs the worker runs
+            owner: Worker identifier
+
+        Returns:
+            Number of jobs still claimed by the worker
+        """
+        now = datetime.now().isoformat()
+        with self._get_db() as conn:
+            cursor = conn.executemany("""
+                UPDATE jobs SET heartbeat_at = ?
+                WHERE id = ? AND status = 'running' AND owner = ?
+            """, [(now, job_id, owner) for job_id in job_ids])
+            conn.commit()
+        return max(cursor.rowcount, 0)
+
+    def requeue_stale_jobs(self, heartbeat_before: str) -> int:
+        """
+        Queue again running jobs whose worker stopped sending heartbeats (e.g. after a crash)
+
+        Jobs whose cancellation was requested are cancelled instead.
+
+        Args:
+            heartbeat_before: Jobs whose last heartbeat is older than this timestamp are requeued
+
+        Returns:
+            Number of jobs requeued or cancelled
+        """
+        with self._get_db() as conn:
+            cursor = conn.execute("""
+                UPDATE jobs SET status = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'queued' END,
+                                owner = NULL, stage = NULL, progress = 0, details_json = NULL, updated_at = ?
+                WHERE status = 'running' AND heartbeat_at < ?
+            """, (datetime.now().isoformat(), heartbeat_before))
+            conn.commit()
+        return cursor.rowcount
+
+    def cancel_job(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job
+
+        A queued job is cancelled at once. A running job is flagged, and its worker
+        stops it at the next progress report. Finished jobs are left unchanged.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            The job after the request, or None if it does not exist
+        """
+        with self._get_db() as conn:
+            conn.execute("""
+                UPDATE jobs SET status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+                                cancel_requested = 1, updated_at = ?
+                WHERE id = ? AND status IN ('queued', 'running')
+            """, (datetime.now().isoformat(), job_id))
+            conn.commit()
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
 
     # Image Management
-    def save_image(self, image_base64: str, platform: Platform, date: str) -> str:
+    def save_image(self, image_base64: str, platform: Platform, date: str,
+                   record_id: Optional[str] = None, brand_name: Optional[str] = None) -> str:
         """
-        Save generated image
+        Save generated image in the content-addressed blob store
+
+        Identical images are stored once. The base64 payload is decoded in
+        chunks while it is hashed and written.
 
         Args:
             image_base64: Base64 encoded image
             platform: Platform
             date: Date
+            record_id: Post record referencing the image (optional)
+            brand_name: Brand of the post (selects the shard holding the reference)
 
         Returns:
             Image file path
         """
-        import base64
-
-        image_filename = f"{date}_{platform.value}_{datetime.now().strftime('%H%M%S')}.png"
-        image_path = self.images_path / image_filename
+        # Decoded, hashed and written without the lock: saves run in parallel
+        digest, size, image_path = self.blobs.put_base64(image_base64)
+        now = datetime.now().isoformat()
+
+        # Serialize the row update with gc_images batches; once touched, the blob
+        # is kept for the grace period (the protection across processes too)
+        with self._blob_lock, self._get_db(brand_name) as conn:
+            conn.execute("""
+                INSERT INTO image_blobs (sha256, ext, size, refcount, created_at, touched_at)
+                VALUES (?, ?, ?, 0, ?, ?)
+                ON CONFLICT(sha256) DO UPDATE SET touched_at = excluded.touched_at
+            """, (digest, image_path.suffix, size, now, now))
+
+            if record_id:
+                conn.execute("""
+                    INSERT OR IGNORE INTO post_images (record_id, sha256, platform, date)
+                    VALUES (?, ?, ?, ?)
+                """, (record_id, digest, platform.value, date))
+            conn.commit()
 
-        # Decode and save image
-        image_data = base64.b64decode(image_base64)
-        with open(image_path, 'wb') as f:
-            f.write(image_data)
+        # A collection between the write and the row update may have removed an
+        # existing unreferenced copy of this blob
+        if not image_path.exists():
+            self.blobs.put_base64(image_base64)
 
         return str(image_path)
 
+    def gc_images(self, grace_seconds: int = 3600, batch_size: int = 500) -> int:
+        """
+        Delete image blobs no post references anymore
+
+        Reference counts are kept per shard; a blob file shared by several
+        shards is only deleted once none of them has a row for it.
+
+        Args:
+            grace_seconds: Minimum time a blob must have been unreferenced
+            batch_size: Blobs removed per transaction
+
+        Returns:
+            Number of blobs deleted
+        """
+        cutoff = (datetime.now() - timedelta(seconds=grace_seconds)).isoformat()
+        deleted = 0
+
+        shards = self.shards.keys()
+        for shard in shards:
+            while True:
+                with self._blob_lock, self._get_db(shard=shard) as conn:
+                    rows = conn.execute("""
+                        SELECT sha256, ext FROM image_blobs
+                        WHERE refcount <= 0 AND touched_at < ?
+                        LIMIT ?
+                    """, (cutoff, batch_size)).fetchall()
+                    if not rows:
+                        break
+
+                    for row in rows:
+                        if not any(self._blob_in_shard(other, row['sha256'])
+                                   for other in shards if other != shard):
+                            self.blobs.delete(row['sha256'], row['ext'])
+                    conn.executemany("""
+                        DELETE FROM image_blobs WHERE sha256 = ? AND refcount <= 0
+                    """, [(row['sha256'],) for row in rows])
+                    conn.commit()
+
+                deleted += len(rows)
+
+        return deleted
+
+    def _blob_in_shard(self, shard: str, sha256: str) -> bool:
+        """Check whether a shard still tracks an image blob"""
+        with self._get_db(shard=shard) as conn:
+            return conn.execute("""
+                SELECT 1 FROM image_blobs WHERE sha256 = ?
+            """, (sha256,)).fetchone() is not None
+
     # Cleanup and Maintenance
     def cleanup_old_data(self, days_to_keep: int = 90) -> Dict[str, int]:
         """
         Clean up old data
 
+        Rows are deleted in small batches by indexed date columns and mirror
+        files are removed from the paths registered in the database.
+
         Args:
             days_to_keep: Number of days of data to keep
 
         Returns:
             Cleanup statistics
         """
-        cutoff_date = (datetime.now() - timedelta(days=days_to_keep)).strftime('%Y-%m-%d')
-        stats = {'posts_deleted': 0, 'metrics_deleted': 0, 'files_deleted': 0}
-
-        with self._get_db() as conn:
-            cursor = conn.cursor()
+        stats = RetentionEngine(self).run(days_to_keep=days_to_keep)
 
-            # Delete old posts
-            cursor.execute("""
-                DELETE FROM posted_content
-                WHERE date < ?
-            """, (cutoff_date,))
-            stats['posts_deleted'] = cursor.rowcount
-
-            # Delete old metrics
-            cursor.execute("""
-                DELETE FROM performance_metrics
-                WHERE measured_at < ?
-            """, (cutoff_date,))
-            stats['metrics_deleted'] = cursor.rowcount
-
-            conn.commit()
-
-        # Clean up old files
-        for path in [self.posts_path, self.metrics_path, self.state_path]:
-            for file in path.glob('*'):
-                if file.is_file():
-                    file_date = file.stem.split('_')[0]
-                    try:
-                        if file_date < cutoff_date:
-                            file.unlink()
-                            stats['files_deleted'] += 1
-                    except:
-                        pass
-
-        return stats
+        return {
+            'posts_deleted': stats['posts_deleted'],
+            'metrics_deleted': stats['metrics_deleted'],
+            'metrics_downsampled': stats.get('metrics_downsampled', 0),
+            'files_deleted': sum(count for key, count in stats.items() if key.endswith('_files_deleted')),
+            'images_deleted': stats['images_deleted'],
+            'runs_deleted': stats['runs_deleted'],
+            'pages_vacuumed': stats['pages_vacuumed']
+        }
 
 
 # Singleton instance
 _storage_instance = None
 
-def get_storage() -> StorageManager:
-    """Get storage manager singleton instance"""
+def get_storage() -> StorageBackend:
+    """Get storage singleton instance (backend selected by STORAGE_BACKEND, see create_storage)"""
     global _storage_instance
     if _storage_instance is None:
-        _storage_instance = StorageManager()
+        _storage_instance = create_storage()
     return _storage_instance
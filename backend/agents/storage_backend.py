@@ -0,0 +1,276 @@
+"""
+Storage backend protocol for the Social CM Orchestrator Suite
+StorageManager (SQLite), InMemoryStorage and PostgresStorage implement the same
+operations; the backend used by the app is selected with STORAGE_BACKEND
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Tuple, runtime_checkable
+
+from agents.models import (
+    MonthlyPlan,
+    PostRecord,
+    PerformanceMetrics,
+    OrchestratorState,
+    CheckpointStatus,
+    PostCheckpoint,
+    Job,
+    JobStatus,
+    Platform,
+    DailyPost
+)
+
+STORAGE_BACKENDS = ("sqlite", "memory", "postgres")
+
+# Per-platform counters of aggregate_performance, summed over platforms for the totals
+PERFORMANCE_COUNTERS = ("posts", "successful", "posts_with_metrics", "impressions",
+                        "engagements", "clicks", "shares", "comments", "likes")
+
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """Operations the API, the orchestrator and the channel agents rely on
+
+    Semantics every backend follows (checked by benchmarks/check_storage_backends.py):
+    saving a plan makes it the brand's active plan and a new version; recording a
+    post replaces any post with the same ID, (date, platform) or content hash;
+    metrics samples are unique per (post_id, measured_at); aggregates count the
+    latest sample of each post; starting checkpoints never resets a posted one
+    unless asked to; a queued job is claimed by at most one worker.
+    """
+
+    # Plans
+    def save_monthly_plan(self, plan: MonthlyPlan) -> str: ...
+
+    def get_active_plan(self, brand_name: str) -> Optional[MonthlyPlan]: ...
+
+    def get_active_plan_id(self, brand_name: str) -> Optional[str]: ...
+
+    def get_active_plan_version(self, brand_name: str) -> Tuple[int, Optional[str]]: ...
+
+    def get_daily_posts(self, brand_name: str, target_date: str,
+                        platforms: Optional[List[Platform]] = None) -> List[DailyPost]: ...
+
+    def get_plan(self, plan_id: str) -> Optional[MonthlyPlan]: ...
+
+    def list_plan_versions(self, brand_name: str) -> List[Dict[str, Any]]: ...
+
+    def get_plan_at_version(self, brand_name: str, version: int) -> Optional[MonthlyPlan]: ...
+
+    # Posts
+    def record_post(self, record: PostRecord, brand_name: Optional[str] = None) -> bool: ...
+
+    def has_been_posted(self, date: str, platform: Platform) -> bool: ...
+
+    def is_duplicate_content(self, content: str) -> bool: ...
+
+    def get_posted_content(self, start_date: str, end_date: str,
+                           platform: Optional[Platform] = None) -> List[PostRecord]: ...
+
+    def find_near_duplicates(self, content: str, brand_name: Optional[str] = None,
+                             platform: Optional[Platform] = None, days: int = 30,
+                             threshold: float = 0.5, limit: int = 5,
+                             reference_date: Optional[str] = None) -> List[Dict[str, Any]]: ...
+
+    # Metrics
+    def save_metrics(self, metrics: PerformanceMetrics) -> bool: ...
+
+    def save_metrics_bulk(self, metrics: Iterable[PerformanceMetrics], batch_size: int = 500,
+                          write_files: Optional[bool] = None) -> Dict[str, int]: ...
+
+    def get_metrics(self, post_id: str) -> List[PerformanceMetrics]: ...
+
+    def aggregate_performance(self, start_date: str, end_date: str,
+                              platforms: Optional[List[Platform]] = None) -> Dict[str, Any]: ...
+
+    def get_metrics_series(self, start_date: str, end_date: str, interval: str = 'day',
+                           brand_name: Optional[str] = None,
+                           platform: Optional[Platform] = None) -> Dict[str, Any]: ...
+
+    def get_yesterday_performance(self, brand_name: str) -> Dict[str, Any]: ...
+
+    # Runs and state
+    def record_orchestrator_run(self, date: str, posts_attempted: int,
+                                posts_succeeded: int, posts_failed: int,
+                                errors: Optional[List[str]] = None) -> bool: ...
+
+    def has_run_today(self, date: str) -> bool: ...
+
+    def save_orchestrator_state(self, state: OrchestratorState) -> bool: ...
+
+    def get_orchestrator_state(self, date: str) -> Optional[OrchestratorState]: ...
+
+    # Post checkpoints
+    def start_checkpoints(self, brand_name: str, run_date: str,
+                          slots: Iterable[Tuple[Platform, int]],
+                          reset: bool = False) -> List[PostCheckpoint]: ...
+
+    def update_checkpoint(self, brand_name: str, run_date: str, platform: Platform, slot: int,
+                          status: CheckpointStatus, post_id: Optional[str] = None,
+                          post_url: Optional[str] = None, error: Optional[str] = None) -> bool: ...
+
+    def get_checkpoint_summary(self, brand_name: str, run_date: str) -> Dict[str, Any]: ...
+
+    # Jobs
+    def create_job(self, job: Job) -> bool: ...
+
+    def get_job(self, job_id: str) -> Optional[Job]: ...
+
+    def list_jobs(self, status: Optional[JobStatus] = None, limit: int = 100) -> List[Job]: ...
+
+    def claim_job(self, job_id: str, owner: str, max_per_key: int = 1) -> Optional[Job]: ...
+
+    def update_job(self, job_id: str, status: Optional[JobStatus] = None, stage: Optional[str] = None,
+                   progress: Optional[int] = None, result: Optional[Dict[str, Any]] = None,
+                   error: Optional[str] = None, owner: Optional[str] = None,
+                   details: Optional[Dict[str, Any]] = None) -> bool: ...
+
+    def heartbeat_jobs(self, job_ids: List[str], owner: str) -> int: ...
+
+    def requeue_stale_jobs(self, heartbeat_before: str) -> int: ...
+
+    def cancel_job(self, job_id: str) -> Optional[Job]: ...
+
+    # Blobs
+    def save_image(self, image_base64: str, platform: Platform, date: str,
+                   record_id: Optional[str] = None, brand_name: Optional[str] = None) -> str: ...
+
+    # Maintenance
+    def warm_plan_cache(self) -> int: ...
+
+    def rebuild_mirrors(self, batch_size: int = 500) -> Dict[str, int]: ...
+
+    def cleanup_old_data(self, days_to_keep: int = 90) -> Dict[str, int]: ...
+
+    def get_cache_stats(self) -> Dict[str, Any]: ...
+
+    def close(self): ...
+
+
+def summarize_performance(start_date: str, end_date: str,
+                          rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the aggregate_performance result from per-platform counter rows
+
+    Args:
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
+        rows: Rows with a platform and every PERFORMANCE_COUNTERS value; rows of
+            the same platform (e.g. from several shards) are summed
+
+    Returns:
+        Totals and per-platform breakdown
+    """
+    totals = {counter: 0 for counter in PERFORMANCE_COUNTERS}
+    by_platform = {}
+
+    for row in rows:
+        stats = by_platform.setdefault(row['platform'], {counter: 0 for counter in PERFORMANCE_COUNTERS})
+        for counter in PERFORMANCE_COUNTERS:
+            stats[counter] += row[counter]
+            totals[counter] += row[counter]
+
+    for stats in by_platform.values():
+        stats['engagement_rate'] = (
+            stats['engagements'] / stats['impressions'] * 100 if stats['impressions'] > 0 else 0
+        )
+
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'total_posts': totals['posts'],
+        'successful_posts': totals['successful'],
+        'failed_posts': totals['posts'] - totals['successful'],
+        'posts_with_metrics': totals['posts_with_metrics'],
+        'total_impressions': totals['impressions'],
+        'total_engagements': totals['engagements'],
+        'total_clicks': totals['clicks'],
+        'total_shares': totals['shares'],
+        'total_comments': totals['comments'],
+        'total_likes': totals['likes'],
+        'average_engagement_rate': (
+            totals['engagements'] / totals['impressions'] * 100 if totals['impressions'] > 0 else 0
+        ),
+        'by_platform': by_platform
+    }
+
+
+def yesterday_performance(storage: StorageBackend) -> Dict[str, Any]:
+    """
+    Summarize yesterday's posts and their latest metrics
+
+    Args:
+        storage: Backend to aggregate
+
+    Returns:
+        Performance summary
+    """
+    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    summary = storage.aggregate_performance(yesterday, yesterday)
+
+    return {
+        'date': yesterday,
+        'total_posts': summary['total_posts'],
+        'total_impressions': summary['total_impressions'],
+        'total_engagements': summary['total_engagements'],
+        'average_engagement_rate': summary['average_engagement_rate'],
+        'platform_breakdown': {
+            platform: {
+                'impressions': stats['impressions'],
+                'engagements': stats['engagements']
+            }
+            for platform, stats in summary['by_platform'].items()
+            if stats['posts_with_metrics'] > 0
+        }
+    }
+
+
+def summarize_checkpoints(rows: Iterable[Tuple[str, int, Optional[str]]]) -> Dict[str, Any]:
+    """
+    Build the get_checkpoint_summary result from per-status counts
+
+    Args:
+        rows: (status, number of posts, latest updated_at) tuples
+
+    Returns:
+        Number of posts in total and per status, and the time of the last change
+    """
+    summary: Dict[str, Any] = {'total': 0, **{status.value: 0 for status in CheckpointStatus},
+                               'last_update': None}
+    for status, posts, updated_at in rows:
+        summary[status] += posts
+        summary['total'] += posts
+        if updated_at and (summary['last_update'] is None or updated_at > summary['last_update']):
+            summary['last_update'] = updated_at
+    return summary
+
+
+def create_storage(backend: Optional[str] = None, **options) -> StorageBackend:
+    """
+    Create a storage backend
+
+    Args:
+        backend: 'sqlite', 'memory' or 'postgres' (defaults to STORAGE_BACKEND, then 'sqlite')
+        **options: Constructor arguments of the backend (for postgres, dsn defaults to DATABASE_URL)
+
+    Returns:
+        Storage backend
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = (backend or os.environ.get('STORAGE_BACKEND') or 'sqlite').strip().lower()
+
+    # Imported here: the implementations import this module
+    if backend == 'sqlite':
+        from agents.storage import StorageManager
+        return StorageManager(**options)
+    if backend == 'memory':
+        from agents.memory_storage import InMemoryStorage
+        return InMemoryStorage(**options)
+    if backend == 'postgres':
+        from agents.postgres_storage import PostgresStorage
+        return PostgresStorage(**options)
+
+    raise ValueError(f"Invalid storage backend '{backend}', expected one of {STORAGE_BACKENDS}")
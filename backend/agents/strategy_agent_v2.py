@@ -5,7 +5,7 @@ This agent creates monthly editorial plans with structured JSON output
 
 from dotenv import load_dotenv
 import os
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -29,16 +29,26 @@ from agents.models import (
     MonthlyPlan
 )
 from agents.storage import get_storage
-from landing_page_analyzer import extract_landing_page_info
+from landing_page_analyzer import LandingPageAnalyzer, extract_landing_page_info
 
 load_dotenv()
 
 class StrategyAgentV2:
     """Strategy Agent for creating monthly editorial plans"""
 
-    def __init__(self):
-        """Initialize the Strategy Agent V2"""
-        self.llm = ChatOpenAI(
+    def __init__(self, llm: Optional[ChatOpenAI] = None,
+                 landing_page_analyzer: Optional[LandingPageAnalyzer] = None):
+        """Initialize the Strategy Agent V2
+
+        The agent keeps no per-request state, so one instance can serve concurrent
+        requests (see agents.agent_registry).
+
+        Args:
+            llm: Shared LLM client; a new one is created if None
+            landing_page_analyzer: Shared landing page analyzer; one is created per analysis if None
+        """
+        self.landing_page_analyzer = landing_page_analyzer
+        self.llm = llm or ChatOpenAI(
             api_key=os.getenv("BLACKBOX_API_KEY"),
             base_url="https://api.blackbox.ai/v1",
             model=os.getenv("BLACKBOX_MODEL", "blackboxai/openai/gpt-4o"),
@@ -467,7 +477,8 @@ class StrategyAgentV2:
         cta_targets: List[str] = None,
         startup_name: Optional[str] = None,
         landing_page_info: Optional[str] = None,
-        platforms: Optional[List[str]] = None
+        platforms: Optional[List[str]] = None,
+        save: bool = True
     ) -> MonthlyPlan:
         """
         Create a complete monthly plan
@@ -482,6 +493,7 @@ class StrategyAgentV2:
             language: Content language
             tone: Tone of voice
             cta_targets: CTA targets
+            save: Save the plan (False when the caller saves a derived plan instead)
 
         Returns:
             Complete monthly plan
@@ -585,8 +597,9 @@ class StrategyAgentV2:
             )
 
             # Save the plan
-            plan_id = self.storage.save_monthly_plan(plan)
-            print(f"\n✅ Monthly plan created and saved with ID: {plan_id}")
+            if save:
+                plan_id = self.storage.save_monthly_plan(plan)
+                print(f"\n✅ Monthly plan created and saved with ID: {plan_id}")
 
             return plan
 
@@ -608,15 +621,20 @@ class StrategyAgentV2:
         additional_context: str = "",
         startup_name: Optional[str] = None,
         landing_page_info: Optional[str] = None,
-        platforms: Optional[List[str]] = None
+        platforms: Optional[List[str]] = None,
+        progress: Optional[Callable[[str, int], None]] = None
     ) -> MonthlyPlan:
         """
         Create a monthly plan with AI-generated content
 
         This method uses the LLM to generate more creative and contextual content
+
+        Args:
+            progress: Called with the stage name and completion percentage as generation advances (optional)
         """
+        report = progress or (lambda stage, percent: None)
         try:
-            # First create the base plan structure
+            # First create the base plan structure (saved only if the AI enhancement fails)
             base_plan = self.create_monthly_plan(
                 brand_name=brand_name,
                 positioning=positioning,
@@ -629,7 +647,8 @@ class StrategyAgentV2:
                 cta_targets=cta_targets,
                 startup_name=startup_name,
                 landing_page_info=landing_page_info,
-                platforms=platforms
+                platforms=platforms,
+                save=False
             )
 
             # Prepare query for AI enhancement
@@ -682,6 +701,7 @@ class StrategyAgentV2:
                 posts_per_day = 3
             
             # Generate enhanced content using AI
+            report("generating_with_ai", 50)
             response = self.agent_executor.invoke({
                 "query": query,
                 "brand_name": brand_name,
@@ -705,17 +725,21 @@ class StrategyAgentV2:
             })
 
             # Try to parse the AI response
+            report("saving_plan", 90)
             try:
                 enhanced_plan = self.parser.parse(response.get("output", ""))
-                # Save the enhanced plan
-                plan_id = self.storage.save_monthly_plan(enhanced_plan)
-                print(f"\n✅ AI-enhanced monthly plan created and saved with ID: {plan_id}")
-                return enhanced_plan
             except:
-                # If parsing fails, return the base plan
+                # If parsing fails, save and return the base plan
                 print("⚠️ Could not parse AI response, returning base plan")
+                plan_id = self.storage.save_monthly_plan(base_plan)
+                print(f"\n✅ Monthly plan created and saved with ID: {plan_id}")
                 return base_plan
 
+            # Save the enhanced plan
+            plan_id = self.storage.save_monthly_plan(enhanced_plan)
+            print(f"\n✅ AI-enhanced monthly plan created and saved with ID: {plan_id}")
+            return enhanced_plan
+
         except Exception as e:
             print(f"Error creating AI-generated plan: {e}")
             # Fallback to base plan
@@ -796,7 +820,9 @@ def create_monthly_strategy(
     additional_context: str = "",
     startup_name: Optional[str] = None,
     startup_url: Optional[str] = None,
-    platforms: Optional[List[str]] = None
+    platforms: Optional[List[str]] = None,
+    progress: Optional[Callable[[str, int], None]] = None,
+    agent: Optional[StrategyAgentV2] = None
 ) -> MonthlyPlan:
     """
     Create a monthly editorial strategy
@@ -815,6 +841,9 @@ def create_monthly_strategy(
         additional_context: Additional context for AI
         startup_name: Name of the startup for content generation (required)
         startup_url: URL of the startup's landing page for analysis
+        progress: Called with the stage name and completion percentage as generation advances
+            (e.g. by the job that runs it)
+        agent: Shared strategy agent (e.g. from the agent registry); a new one is built if None
 
     Returns:
         Monthly plan
@@ -826,13 +855,16 @@ def create_monthly_strategy(
     if not startup_name or startup_name.strip() == "":
         raise ValueError("startup_name is required and cannot be empty")
 
+    report = progress or (lambda stage, percent: None)
 
     # Extract landing page information if URL is provided
     landing_page_info = None
     if startup_url:
+        report("analyzing_landing_page", 10)
         try:
             print(f"Analyzing startup landing page: {startup_url}")
-            landing_page_info = extract_landing_page_info(startup_url)
+            landing_page_info = extract_landing_page_info(
+                startup_url, analyzer=agent.landing_page_analyzer if agent else None)
             print(f"Landing page analysis result: {landing_page_info[:200]}..." if landing_page_info else "No analysis result")
             if landing_page_info:
                 additional_context += f"\n\nLanding Page Analysis:\n{landing_page_info}"
@@ -840,8 +872,9 @@ def create_monthly_strategy(
         except Exception as e:
             print(f"⚠️ Could not analyze landing page: {e}")
 
-    agent = StrategyAgentV2()
+    agent = agent or StrategyAgentV2()
 
+    report("creating_plan", 30)
     if use_ai:
         plan = agent.create_ai_generated_plan(
             brand_name=brand_name,
@@ -856,7 +889,8 @@ def create_monthly_strategy(
             additional_context=additional_context,
             startup_name=startup_name,
             landing_page_info=landing_page_info,
-            platforms=platforms
+            platforms=platforms,
+            progress=progress
         )
     else:
         plan = agent.create_monthly_plan(
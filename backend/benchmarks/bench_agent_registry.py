@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request agent construction vs the agent registry
+
+Measures the agent and LLM client overhead of one request, before and after
+the registry:
+  strategy   - /strategy/generate built StrategyAgentV2 twice (once unused in
+               the endpoint) plus a LandingPageAnalyzer; now it reads the
+               registry's shared agent
+  status     - /orchestrator/status and /metrics built an OrchestratorAgentV2;
+               now they read the registry's shared agent
+  llm call   - one LLM round trip on a new ChatOpenAI client vs the registry's
+               shared client, against a local OpenAI-compatible stub server
+               (no network or API key needed)
+
+langchain_openai already shares a cached default HTTP client between
+ChatOpenAI instances with the same base URL, so connections were reused before
+too: the gain is the client construction. The registry's own HTTP client
+makes the pool size and timeouts explicit and is closed on shutdown.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import statistics
+import tempfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Isolated data and log directories, set before the agents create their storage
+_tmp = tempfile.mkdtemp(prefix="bench_agents_")
+os.environ["DATA_PATH"] = str(Path(_tmp) / "data")
+os.environ["LOGS_PATH"] = str(Path(_tmp) / "logs")
+os.environ.setdefault("BLACKBOX_API_KEY", "bench-key")
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.agent_registry import AgentRegistry, create_llm
+from agents.strategy_agent_v2 import StrategyAgentV2
+from agents.orchestrator_agent_v2 import OrchestratorAgentV2
+from landing_page_analyzer import LandingPageAnalyzer
+
+COMPLETION = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "bench",
+    "choices": [{"index": 0, "finish_reason": "stop",
+                 "message": {"role": "assistant", "content": "ok"}}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every chat completion with a fixed message, keeping connections alive"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(func, repeat: int) -> float:
+    """Median of several calls, in milliseconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def quiet(func):
+    """Run func with stdout silenced (the agents print while they initialize)"""
+    def run():
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+        try:
+            return func()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-request agent construction vs the agent registry")
+    parser.add_argument("--repeat", type=int, default=30, help="Runs per measurement (median is kept)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["BLACKBOX_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+
+    registry = AgentRegistry()
+    quiet(registry.warm)()
+
+    def strategy_before():
+        StrategyAgentV2()
+        StrategyAgentV2()
+        LandingPageAnalyzer()
+
+    def strategy_after():
+        registry.strategy_agent
+        registry.landing_page_analyzer
+
+    def llm_before():
+        create_llm(0.7).invoke("ping")
+
+    def llm_after():
+        registry.llm(0.7).invoke("ping")
+
+    cases = {
+        "strategy": (quiet(strategy_before), quiet(strategy_after)),
+        "status": (quiet(OrchestratorAgentV2), lambda: registry.orchestrator_agent),
+        "llm call": (llm_before, llm_after),
+    }
+
+    print(f"{'request':<10} {'per request':>12} {'registry':>10} {'saved':>9}")
+    for name, (before, after) in cases.items():
+        before(), after()  # warm up imports and connections
+        before_ms, after_ms = measure(before, args.repeat), measure(after, args.repeat)
+        print(f"{name:<10} {before_ms:>10.3f}ms {after_ms:>8.3f}ms {before_ms - after_ms:>7.3f}ms")
+
+    registry.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: exporting posted content with get_posted_content vs the streaming exporter
+
+Seeds post records, then writes them all to an NDJSON file twice: through
+get_posted_content in monthly slices (every slice becomes PostRecord objects,
+the previous approach) and with StreamingExporter. Reports the time and the
+peak Python memory of each, for growing numbers of posts.
+"""
+
+import sys
+import time
+import tempfile
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.storage import StorageManager
+from agents.exporter import StreamingExporter
+from fixtures import make_record, PLATFORMS
+
+START = datetime(1950, 1, 1)
+
+
+def export_slices(storage: StorageManager, path: Path, last_day: datetime, slice_days: int = 30):
+    """Write every post through get_posted_content, one slice of days at a time"""
+    with open(path, 'w') as f:
+        day = START
+        while day <= last_day:
+            end = min(day + timedelta(days=slice_days - 1), last_day)
+            for record in storage.get_posted_content(day.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')):
+                f.write(record.model_dump_json() + "\n")
+            day = end + timedelta(days=1)
+
+
+def export_stream(storage: StorageManager, path: Path):
+    """Write every post with the streaming exporter"""
+    _, chunks = StreamingExporter(storage).export("posted_content")
+    with open(path, 'wb') as f:
+        for data in chunks:
+            f.write(data)
+
+
+def measure(func) -> tuple:
+    """Return (seconds, peak traced MB) of one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming exporter")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 20000, 50000],
+                        help="Numbers of posts to export")
+    args = parser.parse_args()
+
+    print(f"{'posts':>7} {'slices (s)':>11} {'slices MB':>10} {'stream (s)':>11} {'stream MB':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = StorageManager(base_path=tmp, mirror_mode="off")
+            last_day = START
+            for i in range(size):
+                last_day = START + timedelta(days=i // len(PLATFORMS))
+                storage.record_post(make_record(i, last_day))
+
+            slice_time, slice_mb = measure(lambda: export_slices(storage, Path(tmp) / "slices.ndjson", last_day))
+            stream_time, stream_mb = measure(lambda: export_stream(storage, Path(tmp) / "stream.ndjson"))
+            print(f"{size:>7} {slice_time:>11.2f} {slice_mb:>10.1f} {stream_time:>11.2f} {stream_mb:>10.1f}")
+            storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: idempotency checks answered by SQLite vs the in-process Bloom filters
+
+Seeds N post records and runs, then times has_been_posted, is_duplicate_content
+and has_run_today for keys that are absent (the common case before posting)
+with the previous query-only implementation and with StorageManager's
+filter-first checks, which read every shard's data version first so rows
+written by other processes are never reported absent. Also checks that each
+stored key is counted once by its filter, however it was added (by
+record_post, then again by the next sync).
+"""
+
+import sys
+import time
+import tempfile
+import argparse
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.storage import StorageManager
+from agents.models import Platform
+from fixtures import seed
+
+
+def legacy_checks(storage: StorageManager):
+    """The previous implementations: one indexed query per check"""
+    def has_been_posted(date: str, platform: Platform) -> bool:
+        with storage._get_db() as conn:
+            return conn.execute("""
+                SELECT id FROM posted_content
+                WHERE date = ? AND platform = ? AND success = 1
+            """, (date, platform.value)).fetchone() is not None
+
+    def is_duplicate_content(content: str) -> bool:
+        with storage._get_db() as conn:
+            return conn.execute("""
+                SELECT id FROM posted_content WHERE content_hash = ?
+            """, (storage.get_content_hash(content),)).fetchone() is not None
+
+    def has_run_today(date: str) -> bool:
+        with storage._get_db() as conn:
+            return conn.execute("""
+                SELECT id FROM orchestrator_runs WHERE run_date = ?
+            """, (date,)).fetchone() is not None
+
+    return has_been_posted, is_duplicate_content, has_run_today
+
+
+def time_calls(func, args_list, repeat: int) -> float:
+    """Best microseconds per call over repeat passes"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / len(args_list) * 1e6
+
+
+def check_key_counts(storage: StorageManager, posts: int, runs: int):
+    """Fail if a filter counts a different number of keys than were stored"""
+    storage._sync_membership()
+    expected = {'posted': posts, 'content': posts, 'runs': runs}
+    counts = {name: bloom.count for name, bloom in storage._membership.items()}
+    if counts != expected:
+        raise AssertionError(f"Filter key counts {counts}, expected {expected}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark idempotency checks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="Numbers of stored records")
+    parser.add_argument("--calls", type=int, default=5000, help="Checks per measurement")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    print(f"{'records':>8} {'check':>22} {'sqlite (us)':>12} {'filter (us)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = StorageManager(base_path=tmp, mirror_mode="off")
+            seed(storage, size)
+            for day in range(365):
+                storage.record_orchestrator_run(f"1950-{day // 28 + 1:02d}-{day % 28 + 1:02d}", 3, 3, 0)
+            check_key_counts(storage, size, 365)
+
+            # Keys after the seeded range: all absent
+            dates = [f"2099-{i % 12 + 1:02d}-{i % 28 + 1:02d}" for i in range(args.calls)]
+            cases = {
+                'has_been_posted': [(d, Platform.TWITTER) for d in dates],
+                'is_duplicate_content': [(f"new post {i}",) for i in range(args.calls)],
+                'has_run_today': [(d,) for d in dates],
+            }
+            legacy = dict(zip(cases, legacy_checks(storage)))
+
+            for name, args_list in cases.items():
+                old = time_calls(legacy[name], args_list, args.repeat)
+                new = time_calls(getattr(storage, name), args_list, args.repeat)
+                print(f"{size:>8} {name:>22} {old:>12.2f} {new:>12.2f} {old / new:>7.1f}x")
+
+            print(f"{'':>8} membership: {storage.get_cache_stats()['membership']}")
+            storage.close()
+
+
+if __name__ == "__main__":
+    main()
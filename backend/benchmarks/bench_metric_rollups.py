@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: long-range metrics queries over raw samples vs the rollups
+
+Seeds posts with hourly metrics samples, then times a daily and a weekly series
+over the whole range computed from raw performance_metrics rows (the previous
+approach) and read from metric_rollups by StorageManager.get_metrics_series,
+plus the ingest rate with the rollup triggers in place.
+"""
+
+import sys
+import time
+import tempfile
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.storage import StorageManager
+from agents.models import PerformanceMetrics
+from agents.metric_rollups import merge_series
+from fixtures import make_record
+
+START = datetime(1950, 1, 2)  # a Monday
+
+
+def seed(storage: StorageManager, posts: int, hours: int) -> int:
+    """Record posts and hourly cumulative samples for each; returns samples/second"""
+    records = [make_record(i, START + timedelta(days=i % 84)) for i in range(posts)]
+    for record in records:
+        storage.record_post(record, brand_name=f"Brand{hash(record.id) % 4}")
+
+    def samples():
+        for record in records:
+            first = datetime.fromisoformat(record.date)
+            for hour in range(hours):
+                yield PerformanceMetrics(
+                    post_id=record.post_id, platform=record.platform,
+                    measured_at=(first + timedelta(hours=hour)).isoformat(),
+                    impressions=hour * 10, engagements=hour
+                )
+
+    start = time.perf_counter()
+    stats = storage.save_metrics_bulk(samples(), write_files=False)
+    return int(stats['inserted'] / (time.perf_counter() - start))
+
+
+def raw_series(storage: StorageManager, start_date: str, end_date: str, interval: str):
+    """Series computed from every raw sample in the range"""
+    with storage._get_db() as conn:
+        rows = conn.execute("""
+            SELECT post_id, measured_at AS bucket_start, measured_at AS last_measured_at,
+                   1 AS samples, impressions, engagements, clicks, shares, comments, likes
+            FROM performance_metrics
+            WHERE measured_at >= ? AND measured_at <= ?
+        """, (start_date, f"{end_date}T23:59:59")).fetchall()
+    return merge_series(rows, interval)
+
+
+def timed(func, repeat: int):
+    """Return (best seconds, result) over repeat runs"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark metrics rollups")
+    parser.add_argument("--posts", type=int, default=1000, help="Number of posts")
+    parser.add_argument("--hours", type=int, default=24 * 14, help="Hourly samples per post")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = StorageManager(base_path=tmp, mirror_mode="off")
+        rate = seed(storage, args.posts, args.hours)
+        print(f"Ingested {args.posts * args.hours} samples at {rate} samples/s (rollups included)")
+
+        start_date = START.strftime('%Y-%m-%d')
+        end_date = (START + timedelta(weeks=14) - timedelta(days=1)).strftime('%Y-%m-%d')
+
+        print(f"{'interval':>8} {'points':>7} {'raw (ms)':>9} {'rollups (ms)':>13} {'speedup':>8}")
+        for interval in ("day", "week"):
+            raw_time, raw = timed(lambda: raw_series(storage, start_date, end_date, interval), args.repeat)
+            new_time, new = timed(
+                lambda: storage.get_metrics_series(start_date, end_date, interval), args.repeat)
+            assert raw == new['points']
+            print(f"{interval:>8} {len(raw):>7} {raw_time * 1000:>9.1f} "
+                  f"{new_time * 1000:>13.1f} {raw_time / new_time:>7.1f}x")
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: validated vs trusted loading of stored plans
+
+For plans of 90, 365 and 1,095 posts, loads the stored plan JSON and the
+calendar rows of every post three ways:
+  validated  - json.loads then the model constructor, as request bodies are
+               validated (and as calendar rows used to be loaded)
+  trusted    - agents.model_loading: the stored JSON goes straight to the
+               compiled validator
+  construct  - json.loads then model_construct, recursively building nested
+               models and enums (not used by the storage layer, for reference)
+and checks that every mode returns the same models.
+"""
+
+import sys
+import json
+import time
+import enum
+import typing
+import argparse
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pydantic import BaseModel
+
+from agents.models import DailyPost, MonthlyPlan
+from agents.model_loading import load_json, load_json_rows
+from fixtures import make_plan
+
+
+def make_sized_plan(posts: int) -> MonthlyPlan:
+    """Build a plan with exactly this many posts (one per platform per day)"""
+    plan = make_plan(-(-posts // 3))
+    plan.calendar.posts = plan.calendar.posts[:posts]
+    plan.calendar.total_posts = posts
+    return plan
+
+
+def constructor(tp) -> typing.Optional[typing.Callable]:
+    """Build a function turning decoded JSON into tp with model_construct (None when nothing to convert)"""
+    origin = typing.get_origin(tp)
+    if origin is typing.Union:
+        inner = constructor(next(arg for arg in typing.get_args(tp) if arg is not type(None)))
+        return inner and (lambda value: None if value is None else inner(value))
+    if origin is list:
+        inner = constructor(typing.get_args(tp)[0])
+        return inner and (lambda value: [inner(item) for item in value])
+    if origin is dict:
+        inner = constructor(typing.get_args(tp)[1])
+        return inner and (lambda value: {key: inner(item) for key, item in value.items()})
+    if isinstance(tp, type) and issubclass(tp, enum.Enum):
+        return tp
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        fields = {name: constructor(field.annotation) for name, field in tp.model_fields.items()}
+        fields = {name: convert for name, convert in fields.items() if convert}
+
+        def construct(data):
+            for name, convert in fields.items():
+                if name in data:
+                    data[name] = convert(data[name])
+            return tp.model_construct(**data)
+        return construct
+    return None
+
+
+def best_of(func, repeat: int) -> float:
+    """Fastest of several calls, in milliseconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark validated vs trusted model loading")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[90, 365, 1095],
+                        help="Numbers of posts per plan")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    construct_plan = constructor(MonthlyPlan)
+    construct_post = constructor(DailyPost)
+
+    print(f"{'posts':>6} {'what':<14} {'validated':>10} {'trusted':>10} {'construct':>10} {'speedup':>8}")
+    for size in args.sizes:
+        plan = make_sized_plan(size)
+        document = plan.model_dump_json()
+        rows = [post.model_dump_json() for post in plan.calendar.posts]
+
+        modes = {
+            'plan JSON': (
+                lambda: MonthlyPlan(**json.loads(document)),
+                lambda: load_json(MonthlyPlan, document),
+                lambda: construct_plan(json.loads(document)),
+            ),
+            'calendar rows': (
+                lambda: [DailyPost(**json.loads(row)) for row in rows],
+                lambda: load_json_rows(DailyPost, rows),
+                lambda: [construct_post(json.loads(row)) for row in rows],
+            ),
+        }
+        for what, (validated, trusted, construct) in modes.items():
+            results = [validated(), trusted(), construct()]
+            assert results[0] == results[1] == results[2], f"{what}: modes disagree"
+
+            times = [best_of(func, args.repeat) for func in (validated, trusted, construct)]
+            print(f"{size:>6} {what:<14} {times[0]:>8.2f}ms {times[1]:>8.2f}ms {times[2]:>8.2f}ms "
+                  f"{times[0] / times[1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
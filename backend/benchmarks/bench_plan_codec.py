@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: stored size, encode time and decode time of the plan codecs
+
+Builds multi-platform plans of increasing length and compares every codec
+available here with the legacy encoding (json.dumps of the plan dict stored as
+TEXT, loaded with MonthlyPlan(**json.loads(...))). Decode times include
+building the MonthlyPlan, as in StorageManager.get_active_plan.
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.models import MonthlyPlan
+from agents.plan_codec import CODECS
+from fixtures import make_plan
+
+
+def timed(func, repeat: int):
+    """Best wall time of repeat runs and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark plan codecs")
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 90, 365],
+                        help="Plan lengths in days (one post per platform per day)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    print(f"{'days':>5} {'posts':>6} {'format':<13} {'size (KB)':>10} {'ratio':>6} "
+          f"{'encode (ms)':>12} {'decode (ms)':>12}")
+    for days in args.days:
+        plan = make_plan(days)
+        posts = len(plan.calendar.posts)
+
+        encode_time, legacy = timed(lambda: json.dumps(plan.model_dump()).encode('utf-8'), args.repeat)
+        decode_time, _ = timed(lambda: MonthlyPlan(**json.loads(legacy)), args.repeat)
+        legacy_size = len(legacy)
+        print(f"{days:>5} {posts:>6} {'legacy json':<13} {legacy_size / 1024:>10.1f} {1:>5.1f}x "
+              f"{encode_time * 1000:>12.2f} {decode_time * 1000:>12.2f}")
+
+        for name, codec in CODECS.items():
+            encode_time, blob = timed(lambda: codec.encode(plan), args.repeat)
+            decode_time, decoded = timed(lambda: codec.decode(blob), args.repeat)
+            assert decoded == plan
+            print(f"{days:>5} {posts:>6} {name:<13} {len(blob) / 1024:>10.1f} "
+                  f"{legacy_size / len(blob):>5.1f}x "
+                  f"{encode_time * 1000:>12.2f} {decode_time * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: get_posted_content with per-row JSON file reads vs records stored in SQLite
+
+Seeds N post records (mirrored to JSON files so both read paths have their
+data), then times a 90-day range query with the legacy file-per-row loader
+and with the single-query loader now used by StorageManager.
+"""
+
+import sys
+import json
+import time
+import tempfile
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.storage import StorageManager
+from agents.models import PostRecord
+from fixtures import seed
+
+
+def legacy_get_posted_content(storage: StorageManager, start_date: str, end_date: str):
+    """The previous implementation: one SQL query, then one JSON file per row"""
+    with storage._get_db() as conn:
+        rows = conn.execute("""
+            SELECT * FROM posted_content
+            WHERE date >= ? AND date <= ?
+            ORDER BY date DESC, posted_at DESC
+        """, (start_date, end_date)).fetchall()
+
+    records = []
+    for row in rows:
+        post_file = storage.posts_path / f"{row['date']}_{row['platform']}_{row['id']}.json"
+        if post_file.exists():
+            with open(post_file, 'r', encoding='utf-8') as f:
+                records.append(PostRecord(**json.load(f)))
+    return records
+
+
+def timed(func, repeat: int):
+    """Return (best seconds, result) over repeat runs"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark posted content range queries")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="Numbers of stored records")
+    parser.add_argument("--days", type=int, default=90, help="Range length of the query in days")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    print(f"{'records':>8} {'rows':>6} {'files (ms)':>11} {'sqlite (ms)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = StorageManager(base_path=tmp, mirror_mode="sync")
+            last = seed(storage, size)
+            end = datetime.strptime(last, '%Y-%m-%d')
+            start_date = (end - timedelta(days=args.days - 1)).strftime('%Y-%m-%d')
+
+            legacy_time, legacy = timed(
+                lambda: legacy_get_posted_content(storage, start_date, last), args.repeat)
+            new_time, new = timed(
+                lambda: storage.get_posted_content(start_date, last), args.repeat)
+            assert len(legacy) == len(new)
+
+            print(f"{size:>8} {len(new):>6} {legacy_time * 1000:>11.1f} "
+                  f"{new_time * 1000:>12.1f} {legacy_time / new_time:>7.1f}x")
+            storage.close()
+
+
+if __name__ == "__main__":
+    main()
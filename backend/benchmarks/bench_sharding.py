@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent per-brand writes with one database vs brand shards
+
+Starts one worker process per brand; each records posts and saves metrics for
+its own brand at the same time. Reports aggregate throughput and the p50/p95
+latency of record_post with sharding off (one writer lock for everyone) and
+with one SQLite file per brand.
+"""
+
+import sys
+import time
+import tempfile
+import argparse
+import statistics
+import multiprocessing
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.storage import StorageManager
+from agents.models import PerformanceMetrics
+from fixtures import make_record
+
+
+def worker(base_path: str, sharding: str, brand_index: int, posts: int, queue):
+    """Record posts (plus one metrics sample each) for one brand"""
+    storage = StorageManager(base_path=base_path, mirror_mode="off", sharding=sharding)
+    brand = f"Brand{brand_index}"
+    latencies = []
+    for i in range(posts):
+        # Distinct (date, platform) per brand so no post replaces another
+        record = make_record(brand_index * posts + i, datetime(2000, 1, 1) + timedelta(days=i))
+        record.id = f"{brand}_{record.id}"
+        record.post_id = f"{brand}_{record.post_id}"
+        record.content_hash = f"{brand}_{record.content_hash}"
+        record.generated_post.content = f"{brand} {record.generated_post.content}"
+        record.date = (datetime(2000, 1, 1) + timedelta(days=brand_index * posts + i)).strftime('%Y-%m-%d')
+
+        start = time.perf_counter()
+        storage.record_post(record, brand_name=brand)
+        latencies.append(time.perf_counter() - start)
+        storage.save_metrics(PerformanceMetrics(
+            post_id=record.post_id, platform=record.platform,
+            measured_at=f"{record.date}T12:00:00", impressions=i
+        ))
+    storage.close()
+    queue.put(latencies)
+
+
+def run(sharding: str, brands: int, posts: int):
+    """Run all brand workers at once; returns (posts/s, p50 ms, p95 ms)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Create the schema (and shards) before timing
+        storage = StorageManager(base_path=tmp, mirror_mode="off", sharding=sharding)
+        for index in range(brands):
+            storage.shards.pool(storage.shards.shard_for(f"Brand{index}"))
+        storage.close()
+
+        queue = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=worker, args=(tmp, sharding, index, posts, queue))
+                     for index in range(brands)]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        latencies = [latency for _ in processes for latency in queue.get()]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return (brands * posts / elapsed, statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.95)] * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent brand writes with and without shards")
+    parser.add_argument("--brands", type=int, default=4, help="Concurrent brand workers")
+    parser.add_argument("--posts", type=int, default=300, help="Posts recorded per brand")
+    args = parser.parse_args()
+
+    print(f"{'sharding':>9} {'posts/s':>9} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for sharding in ("off", "brand"):
+        rate, p50, p95 = run(sharding, args.brands, args.posts)
+        print(f"{sharding:>9} {rate:>9.0f} {p50:>9.2f} {p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
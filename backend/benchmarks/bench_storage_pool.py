@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-call SQLite connections vs pooled connections in StorageManager
+
+Runs the idempotency and metrics lookups the orchestrator and analytics
+endpoints issue, single-threaded and from a threadpool (like FastAPI).
+"""
+
+import sys
+import time
+import tempfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.storage import StorageManager
+from agents.models import Platform, PerformanceMetrics
+
+
+def seed(storage: StorageManager, posts: int):
+    """Insert a few metrics so lookups hit real rows"""
+    now = datetime.now()
+    for i in range(posts):
+        storage.save_metrics(PerformanceMetrics(
+            post_id=f"post_{i}",
+            platform=Platform.LINKEDIN,
+            impressions=100 + i,
+            engagements=10 + i,
+            measured_at=(now - timedelta(hours=i)).isoformat()
+        ))
+
+
+def workload(storage: StorageManager, i: int):
+    """One analytics-style request worth of lookups"""
+    day = (datetime(2024, 1, 1) + timedelta(days=i % 365)).strftime('%Y-%m-%d')
+    storage.has_run_today(day)
+    storage.has_been_posted(day, Platform.TWITTER)
+    storage.is_duplicate_content(f"content {i}")
+    storage.get_metrics(f"post_{i % 50}")
+
+
+def run(storage: StorageManager, iterations: int, threads: int) -> float:
+    """Run the workload and return elapsed seconds"""
+    start = time.perf_counter()
+    if threads <= 1:
+        for i in range(iterations):
+            workload(storage, i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda i: workload(storage, i), range(iterations)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark StorageManager connection pooling")
+    parser.add_argument("--iterations", type=int, default=2000, help="Workload iterations")
+    parser.add_argument("--threads", type=int, default=8, help="Threads for the threadpool run")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'threads':>8} {'total (s)':>10} {'per call (µs)':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pooled in (False, True):
+            storage = StorageManager(base_path=str(Path(tmp) / ("pooled" if pooled else "per_call")),
+                                     pooled=pooled)
+            seed(storage, 50)
+            for threads in (1, args.threads):
+                elapsed = run(storage, args.iterations, threads)
+                # Four storage calls per iteration
+                per_call = elapsed / (args.iterations * 4) * 1e6
+                mode = "pooled" if pooled else "per-call"
+                print(f"{mode:<10} {threads:>8} {elapsed:>10.3f} {per_call:>14.1f}")
+            print(f"  pool stats: {storage.db.get_stats()}")
+            storage.close()
+
+
+if __name__ == "__main__":
+    main()
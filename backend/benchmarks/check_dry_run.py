@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Check that a dry run leaves no trace of the day's execution
+
+Runs execute_daily as a dry run and then live for the same brand and date on a
+fresh database: the dry run must write no checkpoint and no orchestrator run,
+and the live run must then post every scheduled post.
+
+Exits with status 1 if any check fails.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.orchestrator_agent_v2 import OrchestratorAgentV2
+from agents.storage import StorageManager
+from fixtures import make_plan
+
+BRAND = "DryRunBrand"
+
+
+def main() -> int:
+    failures = 0
+
+    def check(name: str, ok: bool, detail: str = "") -> None:
+        nonlocal failures
+        failures += not ok
+        print(f"  {'✅' if ok else '❌'} {name}{f' ({detail})' if detail and not ok else ''}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = OrchestratorAgentV2(startup_name="DryRunStartup")
+        orchestrator.storage = storage = StorageManager(base_path=tmp, mirror_mode='off')
+        try:
+            plan = make_plan(2, BRAND)
+            storage.save_monthly_plan(plan)
+            day = plan.calendar.posts[0].date
+            scheduled = len(storage.get_daily_posts(BRAND, day))
+
+            dry = orchestrator.execute_daily(BRAND, day, dry_run=True)
+            summary = storage.get_checkpoint_summary(BRAND, day)
+            status = orchestrator.get_execution_status(BRAND, day)
+            run_recorded = storage.has_run_today(day)
+            live = orchestrator.execute_daily(BRAND, day)
+            again = orchestrator.execute_daily(BRAND, day)
+        finally:
+            storage.close()
+
+    print(f"\n🧪 Dry run then live run ({scheduled} posts on {day})")
+    check("dry run previews every post", dry.get("stats", {}).get("attempted") == scheduled, str(dry.get("stats")))
+    check("dry run writes no checkpoint", summary["total"] == 0, str(summary))
+    check("dry run is not reported as executed", not status["has_run"] and not status["posts_completed"],
+          str(status))
+    check("dry run records no orchestrator run", not run_recorded)
+    check("live run posts every post", live.get("stats", {}).get("succeeded") == scheduled,
+          str(live.get("stats") or live.get("message")))
+    check("second live run skips the posted day", again.get("message") == "Already executed today", str(again))
+
+    if failures:
+        print(f"\n❌ {failures} checks failed")
+        return 1
+    print("\n✅ Dry runs leave no trace")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
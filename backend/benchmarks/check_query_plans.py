@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Check that no storage hot query does a full table scan
+
+Creates a fresh database through the migrations, runs EXPLAIN QUERY PLAN on
+every query in agents.migrations.HOT_QUERIES and exits non-zero if any of
+them scans a whole table.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.storage import StorageManager
+from agents.migrations import HOT_QUERIES, find_full_scans, get_schema_version
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = StorageManager(base_path=tmp)
+        with storage._get_db() as conn:
+            version = get_schema_version(conn)
+            # Let the planner use index statistics like a long-lived database would
+            conn.execute("ANALYZE")
+            offenders = find_full_scans(conn)
+        storage.close()
+
+    print(f"Schema version {version}, {len(HOT_QUERIES)} hot queries checked")
+    for name in HOT_QUERIES:
+        status = "FULL SCAN" if name in offenders else "ok"
+        print(f"  {name:<28} {status}")
+        for detail in offenders.get(name, []):
+            print(f"      {detail}")
+
+    return 1 if offenders else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
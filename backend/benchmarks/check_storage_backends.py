@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Check: every storage backend behaves the same
+
+Runs one set of checks (plans and versions, posts and idempotency,
+near-duplicates, metrics aggregates and series, runs, state, post checkpoints,
+jobs, images, cleanup)
+against the SQLite, in-memory and PostgreSQL backends. PostgreSQL uses a
+throwaway database created on --postgres-url / DATABASE_URL, or a temporary
+local server started with initdb and pg_ctl (found on PATH or in PG_BIN);
+it is skipped when neither is available.
+
+Exits with status 1 if any check fails.
+"""
+
+import os
+import sys
+import shutil
+import socket
+import tempfile
+import argparse
+import subprocess
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Optional
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.storage_backend import STORAGE_BACKENDS, StorageBackend, create_storage
+from agents.metric_rollups import COUNTERS, merge_series
+from agents.models import CheckpointStatus, Job, JobStatus, OrchestratorState, PerformanceMetrics, Platform
+from fixtures import make_plan, make_record
+
+BRAND = "ConformanceBrand"
+OTHER_BRAND = "OtherBrand"
+START = datetime(2024, 1, 1)  # a Monday
+IMAGE = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
+
+def check_plans(storage: StorageBackend):
+    """Saving a plan makes it the active version; older versions stay readable"""
+    first = make_plan(3, BRAND)
+    first_id = storage.save_monthly_plan(first)
+    assert storage.get_active_plan(BRAND) == first, "active plan differs from the saved plan"
+    assert storage.get_active_plan_id(BRAND) == first_id, "active plan ID"
+
+    day = first.calendar.posts[0].date
+    expected = [post for post in first.calendar.posts if post.date == day]
+    assert storage.get_daily_posts(BRAND, day) == expected, "daily posts (order kept)"
+    assert storage.get_daily_posts(BRAND, day, [Platform.LINKEDIN]) == [
+        post for post in expected if post.platform == Platform.LINKEDIN], "daily posts platform filter"
+
+    second = make_plan(4, BRAND)
+    second.calendar.start_date = "2024-01-02"  # distinct plan ID within the same second
+    second_id = storage.save_monthly_plan(second)
+    assert storage.get_active_plan(BRAND) == second, "active plan after a new version"
+    assert storage.get_active_plan_id(BRAND) == second_id, "active plan ID after a new version"
+    assert storage.get_plan(first_id) == first, "superseded plan by ID"
+    versions = storage.list_plan_versions(BRAND)
+    assert [(v['version'], v['plan_id']) for v in versions] == [(2, second_id), (1, first_id)], \
+        f"plan versions {versions}"
+    assert storage.get_plan_at_version(BRAND, 1) == first, "plan at version 1"
+    assert storage.get_active_plan_version(BRAND) == (2, second_id), "active plan version"
+
+    # Callers own the plans they get: editing one (or the saved one) changes neither the store nor the cache
+    stored = storage.get_active_plan(BRAND).model_dump()
+    edited = storage.get_active_plan(BRAND)
+    edited.calendar.posts.pop()
+    edited.calendar.posts[0].topic = "edited"
+    second.calendar.posts.pop()
+    assert storage.get_active_plan(BRAND).model_dump() == stored, "edits to a returned plan leak into later reads"
+
+    assert storage.get_active_plan(OTHER_BRAND) is None, "unknown brand has no plan"
+    assert storage.get_active_plan_id(OTHER_BRAND) is None, "unknown brand has no plan ID"
+    assert storage.get_daily_posts(OTHER_BRAND, day) == [], "unknown brand has no posts"
+    assert storage.list_plan_versions(OTHER_BRAND) == [], "unknown brand has no versions"
+    assert storage.get_active_plan_version(OTHER_BRAND) == (0, None), "unknown brand has no version"
+    assert storage.warm_plan_cache() >= 1, "warm_plan_cache loads the active plan"
+
+
+def recorded_posts(count: int = 8):
+    """Post records spread over consecutive days, the last one failed"""
+    records = [make_record(i, START + timedelta(days=i)) for i in range(count)]
+    records[-1].posting_result.success = False
+    return records
+
+
+def check_posts(storage: StorageBackend):
+    """Idempotency lookups, range reads and replacement on (date, platform)"""
+    records = recorded_posts()
+    for record in records:
+        assert storage.record_post(record, brand_name=BRAND) is True
+
+    assert storage.has_been_posted(records[0].date, records[0].platform), "posted slot"
+    assert not storage.has_been_posted(records[-1].date, records[-1].platform), "failed post is not posted"
+    assert not storage.has_been_posted("1999-01-01", Platform.TWITTER), "empty slot"
+    assert not storage.is_duplicate_content("never posted"), "unknown content"
+
+    found = storage.get_posted_content(records[0].date, records[-1].date)
+    assert [record.id for record in found] == [record.id for record in reversed(records)], \
+        "posted content newest first"
+    platform = records[0].platform
+    assert [record.id for record in storage.get_posted_content(records[0].date, records[-1].date, platform)] \
+        == [record.id for record in reversed(records) if record.platform == platform], "platform filter"
+
+    # Same (date, platform) under a new ID replaces the earlier post
+    replacement = make_record(100, START)
+    replacement.platform = records[0].platform
+    replacement.posting_result.platform = records[0].platform
+    replacement.generated_post.platform = records[0].platform
+    storage.record_post(replacement, brand_name=BRAND)
+    ids = [record.id for record in storage.get_posted_content(records[0].date, records[0].date)]
+    assert ids == [replacement.id], f"replaced post, got {ids}"
+
+    # Content hashes are sha256 of the content when recorded by the orchestrator
+    hashed = make_record(101, START + timedelta(days=30))
+    hashed.content_hash = storage.get_content_hash(hashed.generated_post.content)
+    storage.record_post(hashed, brand_name=BRAND)
+    assert storage.is_duplicate_content(hashed.generated_post.content), "duplicate content"
+
+
+def check_near_duplicates(storage: StorageBackend):
+    """Near-duplicates are scoped per brand and limited to the look-back window"""
+    record = make_record(200, START + timedelta(days=60))
+    record.generated_post.content = "Sponsors love founders who share weekly metrics with them"
+    storage.record_post(record, brand_name=BRAND)
+
+    matches = storage.find_near_duplicates(record.generated_post.content, BRAND,
+                                           reference_date=record.date)
+    assert matches and matches[0]['record_id'] == record.id and matches[0]['similarity'] == 1.0, \
+        f"exact duplicate, got {matches}"
+    assert matches[0]['post_id'] == record.post_id and matches[0]['date'] == record.date
+    assert storage.find_near_duplicates(record.generated_post.content, OTHER_BRAND,
+                                        reference_date=record.date) == [], "other brand"
+    assert storage.find_near_duplicates(record.generated_post.content, None,
+                                        reference_date=record.date) == [], "unbranded scope"
+    assert storage.find_near_duplicates(record.generated_post.content, BRAND,
+                                        reference_date="2030-01-01") == [], "outside the window"
+    other = [p for p in Platform if p != record.platform][0]
+    assert storage.find_near_duplicates(record.generated_post.content, BRAND, platform=other,
+                                        reference_date=record.date) == [], "platform filter"
+
+
+def metrics_samples(records) -> List[PerformanceMetrics]:
+    """Three samples a day for three days per post (cumulative counters)"""
+    samples = []
+    for n, record in enumerate(records):
+        first = datetime.fromisoformat(record.date)
+        for step in range(9):
+            samples.append(PerformanceMetrics(
+                post_id=record.post_id, platform=record.platform,
+                measured_at=(first + timedelta(hours=8 * step)).isoformat(),
+                impressions=100 * step + n, engagements=7 * step, clicks=step,
+                shares=step // 2, comments=step // 3, likes=2 * step,
+                engagement_rate=7.0
+            ))
+    return samples
+
+
+def check_metrics(storage: StorageBackend):
+    """Bulk ingest deduplication, latest-sample aggregates and series"""
+    records = [make_record(300 + i, START + timedelta(days=90 + i)) for i in range(6)]
+    for record in records:
+        storage.record_post(record, brand_name=BRAND if record.platform != Platform.TWITTER else OTHER_BRAND)
+
+    samples = metrics_samples(records)
+    stats = storage.save_metrics_bulk(samples + samples[:5], batch_size=7)
+    assert stats == {'received': len(samples) + 5, 'inserted': len(samples), 'duplicates': 5}, stats
+    assert storage.save_metrics(samples[0]) is True
+
+    post = records[0].post_id
+    stored = storage.get_metrics(post)
+    assert [m.measured_at for m in stored] == sorted((s.measured_at for s in samples if s.post_id == post),
+                                                     reverse=True), "metrics newest first"
+    assert stored[0] == max((s for s in samples if s.post_id == post), key=lambda s: s.measured_at)
+
+    start, end = records[0].date, records[-1].date
+    summary = storage.aggregate_performance(start, end)
+    latest = {}
+    for sample in samples:
+        if sample.post_id not in latest or sample.measured_at > latest[sample.post_id].measured_at:
+            latest[sample.post_id] = sample
+    assert summary['total_posts'] == len(records) and summary['posts_with_metrics'] == len(records)
+    assert summary['total_impressions'] == sum(s.impressions for s in latest.values()), summary
+    assert summary['total_likes'] == sum(s.likes for s in latest.values()), summary
+    by_platform = storage.aggregate_performance(start, end, [Platform.LINKEDIN])['by_platform']
+    assert set(by_platform) == {Platform.LINKEDIN.value}, by_platform
+
+    # Series over the full weeks of the samples, compared with the raw-sample reference
+    series_start, series_end = START + timedelta(days=84), START + timedelta(days=104)
+    for interval in ("hour", "day", "week"):
+        for brand in (None, BRAND):
+            brands = {r.post_id for r in records if brand is None or r.platform != Platform.TWITTER}
+            rows = [{'post_id': s.post_id, 'bucket_start': s.measured_at, 'last_measured_at': s.measured_at,
+                     'samples': 1, **{counter: getattr(s, counter) for counter in COUNTERS}}
+                    for s in samples if s.post_id in brands]
+            series = storage.get_metrics_series(series_start.strftime('%Y-%m-%d'),
+                                                series_end.strftime('%Y-%m-%d'), interval, brand_name=brand)
+            assert series['points'] == merge_series(rows, interval), f"{interval} series (brand={brand})"
+
+
+def check_runs_and_state(storage: StorageBackend):
+    """Run records and orchestrator state round-trip"""
+    day = "2024-06-01"
+    assert not storage.has_run_today(day), "no run yet"
+    assert storage.record_orchestrator_run(day, 3, 2, 1, ["boom"]) is True
+    assert storage.record_orchestrator_run(day, 3, 3, 0) is True
+    assert storage.has_run_today(day), "run recorded"
+
+    state = OrchestratorState(current_date=day, monthly_plan_id="plan_x", posts_scheduled_today=[],
+                              posts_completed_today=[make_record(400, START)],
+                              failed_posts=[{'platform': 'Twitter', 'error': 'rate limited'}],
+                              last_execution=datetime.now().isoformat())
+    assert storage.save_orchestrator_state(state) is True
+    assert storage.get_orchestrator_state(day) == state, "state round-trip"
+    assert storage.get_orchestrator_state("2024-06-02") is None, "missing state"
+
+
+def check_checkpoints(storage: StorageBackend):
+    """Checkpoints keep their status across restarts unless reset, and are counted per status"""
+    day = "2024-06-01"
+    empty = storage.get_checkpoint_summary(BRAND, day)
+    assert empty['total'] == 0 and empty['last_update'] is None, "no checkpoints yet"
+
+    slots = [(Platform.LINKEDIN, 0), (Platform.TWITTER, 0), (Platform.TWITTER, 1)]
+    started = storage.start_checkpoints(BRAND, day, slots)
+    assert [(c.platform, c.slot, c.status) for c in started] == [
+        (platform, slot, CheckpointStatus.PENDING) for platform, slot in slots], "pending checkpoints"
+
+    assert storage.update_checkpoint(BRAND, day, Platform.LINKEDIN, 0, CheckpointStatus.GENERATING)
+    assert storage.update_checkpoint(BRAND, day, Platform.LINKEDIN, 0, CheckpointStatus.POSTED,
+                                     post_id="li_1", post_url="https://linkedin.com/post/1")
+    assert storage.update_checkpoint(BRAND, day, Platform.TWITTER, 0, CheckpointStatus.GENERATING)
+    assert storage.update_checkpoint(BRAND, day, Platform.TWITTER, 0, CheckpointStatus.FAILED, error="boom")
+    assert not storage.update_checkpoint(BRAND, day, Platform.FACEBOOK, 0, CheckpointStatus.POSTED)
+
+    summary = storage.get_checkpoint_summary(BRAND, day)
+    assert {key: summary[key] for key in ('total', 'pending', 'generating', 'posted', 'failed')} == {
+        'total': 3, 'pending': 1, 'generating': 0, 'posted': 1, 'failed': 1}, summary
+    assert summary['last_update'] is not None
+    assert storage.get_checkpoint_summary(OTHER_BRAND, day)['total'] == 0, "brands are separate"
+
+    # A restart keeps the posted checkpoint and adds new slots
+    resumed = {(c.platform, c.slot): c
+               for c in storage.start_checkpoints(BRAND, day, slots + [(Platform.FACEBOOK, 0)])}
+    posted = resumed[(Platform.LINKEDIN, 0)]
+    assert (posted.status, posted.post_id, posted.attempts) == (CheckpointStatus.POSTED, "li_1", 1), posted
+    assert (resumed[(Platform.TWITTER, 0)].status, resumed[(Platform.TWITTER, 0)].error) == (
+        CheckpointStatus.FAILED, "boom")
+    assert resumed[(Platform.FACEBOOK, 0)].status == CheckpointStatus.PENDING
+
+    # A forced re-run resets the given slots only
+    reset = {(c.platform, c.slot): c
+             for c in storage.start_checkpoints(BRAND, day, [(Platform.LINKEDIN, 0)], reset=True)}
+    assert (reset[(Platform.LINKEDIN, 0)].status, reset[(Platform.LINKEDIN, 0)].post_id) == (
+        CheckpointStatus.PENDING, None), "reset checkpoint"
+    assert reset[(Platform.LINKEDIN, 0)].attempts == 1, "attempts survive a reset"
+    assert reset[(Platform.TWITTER, 0)].status == CheckpointStatus.FAILED, "other slots untouched"
+
+
+def check_jobs(storage: StorageBackend):
+    """A queued job is claimed once, updated by its owner only, and requeued when abandoned"""
+    created = datetime.now().isoformat()
+    job = Job(id="job_conformance", kind="strategy.generate", request={"brand_name": BRAND},
+              created_at=created, updated_at=created)
+    assert storage.create_job(job)
+    assert storage.get_job(job.id) == job, "stored job differs"
+    assert storage.get_job("missing") is None
+    assert [j.id for j in storage.list_jobs(status=JobStatus.QUEUED)] == [job.id], "queued jobs"
+
+    claimed = storage.claim_job(job.id, "worker-a")
+    assert claimed and (claimed.status, claimed.attempts) == (JobStatus.RUNNING, 1), claimed
+    assert storage.claim_job(job.id, "worker-b") is None, "a running job cannot be claimed again"
+    assert storage.list_jobs(status=JobStatus.QUEUED) == []
+
+    assert storage.update_job(job.id, stage="creating_plan", progress=30, owner="worker-a")
+    assert not storage.update_job(job.id, stage="stolen", owner="worker-b"), "only the owner updates"
+    assert storage.heartbeat_jobs([job.id], "worker-a") == 1
+    assert storage.heartbeat_jobs([job.id], "worker-b") == 0
+    running = storage.get_job(job.id)
+    assert (running.stage, running.progress) == ("creating_plan", 30), running
+
+    # A worker that stopped sending heartbeats loses the job
+    assert storage.requeue_stale_jobs((datetime.now() - timedelta(minutes=5)).isoformat()) == 0
+    assert storage.requeue_stale_jobs((datetime.now() + timedelta(seconds=1)).isoformat()) == 1
+    requeued = storage.get_job(job.id)
+    assert (requeued.status, requeued.stage, requeued.progress) == (JobStatus.QUEUED, None, 0), requeued
+    assert not storage.update_job(job.id, progress=50, owner="worker-a"), "previous owner cannot update"
+
+    assert storage.claim_job(job.id, "worker-b").attempts == 2
+    assert storage.update_job(job.id, status=JobStatus.SUCCEEDED, progress=100,
+                              result={"total_posts": 90}, owner="worker-b")
+    done = storage.get_job(job.id)
+    assert (done.status, done.result, done.error) == (JobStatus.SUCCEEDED, {"total_posts": 90}, None), done
+    assert [j.id for j in storage.list_jobs()] == [job.id]
+    assert storage.cancel_job(job.id).status == JobStatus.SUCCEEDED, "finished jobs cannot be cancelled"
+    assert storage.cancel_job("missing") is None
+
+    # A queued job is cancelled at once, a running one is flagged for its worker
+    queued = job.model_copy(update={"id": "job_queued"})
+    running = job.model_copy(update={"id": "job_running"})
+    storage.create_job(queued)
+    storage.create_job(running)
+    cancelled = storage.cancel_job(queued.id)
+    assert (cancelled.status, cancelled.cancel_requested) == (JobStatus.CANCELLED, True), cancelled
+    assert storage.claim_job(queued.id, "worker-a") is None, "a cancelled job never runs"
+    storage.claim_job(running.id, "worker-a")
+    details = {"platforms": {"LinkedIn": {"status": "posted", "duration_seconds": 1.5}}}
+    assert storage.update_job(running.id, stage="posting_twitter", progress=50, details=details, owner="worker-a")
+    flagged = storage.cancel_job(running.id)
+    assert (flagged.status, flagged.cancel_requested, flagged.details) == (JobStatus.RUNNING, True, details), flagged
+    # A flagged job whose worker died is cancelled, not requeued
+    assert storage.requeue_stale_jobs((datetime.now() + timedelta(seconds=1)).isoformat()) == 1
+    assert storage.get_job(running.id).status == JobStatus.CANCELLED
+
+    # Jobs sharing a concurrency key: the claim refuses past the limit, whichever worker asks
+    runs = [Job(id=f"run_{i}", kind="orchestrator.daily", request={"brand_name": BRAND},
+                concurrency_key=BRAND, created_at=created, updated_at=created) for i in range(3)]
+    for run in runs:
+        storage.create_job(run)
+    assert storage.get_job(runs[0].id).concurrency_key == BRAND
+    assert storage.claim_job(runs[0].id, "worker-a")
+    assert storage.claim_job(runs[1].id, "worker-b") is None, "one run per key by default"
+    assert storage.claim_job(runs[1].id, "worker-b", max_per_key=2), "limit of two"
+    assert storage.claim_job(runs[2].id, "worker-c", max_per_key=2) is None
+    other = job.model_copy(update={"id": "job_other_kind", "concurrency_key": BRAND})
+    storage.create_job(other)
+    assert storage.claim_job(other.id, "worker-c"), "keys are counted per job type"
+    storage.update_job(runs[0].id, status=JobStatus.SUCCEEDED, owner="worker-a")
+    assert storage.claim_job(runs[2].id, "worker-c", max_per_key=2), "a finished run frees its slot"
+
+
+def check_cleanup(storage: StorageBackend):
+    """Old rows are deleted, recent ones and their images kept"""
+    recent = make_record(500, datetime.now())
+    recent.generated_post.image_base64 = IMAGE
+    storage.record_post(recent, brand_name=BRAND)
+    assert isinstance(storage.save_image(IMAGE, recent.platform, recent.date), str)
+    today = datetime.now().strftime('%Y-%m-%d')
+    storage.record_orchestrator_run(today, 1, 1, 0)
+    old = (datetime.now() - timedelta(days=40)).isoformat()
+    for status in ("queued", "running", "succeeded"):
+        storage.create_job(Job(id=f"old_{status}", kind="strategy.generate", request={}, created_at=old,
+                               updated_at=old))
+    storage.claim_job("old_running", "worker-a")
+    storage.claim_job("old_succeeded", "worker-a")
+    storage.update_job("old_succeeded", status=JobStatus.SUCCEEDED, owner="worker-a")
+
+    stats = storage.cleanup_old_data(days_to_keep=90)
+    assert stats['posts_deleted'] > 0 and stats['metrics_deleted'] > 0 and stats['runs_deleted'] > 0, stats
+    assert storage.get_posted_content("2000-01-01", "2024-12-31") == [], "old posts deleted"
+    assert [record.id for record in storage.get_posted_content(recent.date, recent.date)] == [recent.id]
+    assert storage.has_run_today(today) and not storage.has_run_today("2024-06-01")
+    assert storage.get_orchestrator_state("2024-06-01") is None, "old state deleted"
+    assert storage.get_checkpoint_summary(BRAND, "2024-06-01")['total'] == 0, "old checkpoints deleted"
+    assert storage.get_job("old_succeeded") is None, "old finished jobs deleted"
+    assert storage.get_job("old_queued") and storage.get_job("old_running"), "unfinished jobs kept, however old"
+    assert isinstance(storage.get_cache_stats(), dict)
+    assert isinstance(storage.rebuild_mirrors(), dict)
+
+
+CHECKS: List[Callable[[StorageBackend], None]] = [
+    check_plans, check_posts, check_near_duplicates, check_metrics, check_runs_and_state,
+    check_checkpoints, check_jobs, check_cleanup
+]
+
+
+def find_pg_binary(name: str) -> Optional[str]:
+    """Locate a PostgreSQL server binary on PG_BIN or PATH"""
+    if os.environ.get('PG_BIN'):
+        path = Path(os.environ['PG_BIN']) / name
+        return str(path) if path.exists() else None
+    return shutil.which(name)
+
+
+def start_local_postgres(tmp: str) -> str:
+    """
+    Start a throwaway PostgreSQL server listening on a socket in tmp
+
+    Returns:
+        Connection string
+
+    Raises:
+        RuntimeError: If the server cannot be started here
+    """
+    initdb, pg_ctl = find_pg_binary('initdb'), find_pg_binary('pg_ctl')
+    if not initdb or not pg_ctl:
+        raise RuntimeError("initdb/pg_ctl not found (set PG_BIN or --postgres-url)")
+    if hasattr(os, 'geteuid') and os.geteuid() == 0:
+        raise RuntimeError("initdb cannot run as root (pass --postgres-url)")
+
+    data = Path(tmp) / "pgdata"
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    subprocess.run([initdb, '-D', str(data), '-U', 'postgres', '-A', 'trust', '-E', 'UTF8',
+                    '--locale=C'], check=True, capture_output=True)
+    subprocess.run([pg_ctl, '-D', str(data), '-l', str(Path(tmp) / 'postgres.log'), '-w',
+                    '-o', f"-p {port} -k {tmp} -c listen_addresses=''", 'start'],
+                   check=True, capture_output=True)
+    return f"host={tmp} port={port} user=postgres dbname=postgres"
+
+
+def stop_local_postgres(tmp: str):
+    """Stop the server started by start_local_postgres"""
+    subprocess.run([find_pg_binary('pg_ctl'), '-D', str(Path(tmp) / "pgdata"), '-m', 'fast', 'stop'],
+                   capture_output=True)
+
+
+def run_checks(name: str, storage: StorageBackend) -> int:
+    """Run every check against one backend; returns the number of failures"""
+    failures = 0
+    for check in CHECKS:
+        try:
+            check(storage)
+            print(f"  ✅ {check.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"  ❌ {check.__name__}: {type(e).__name__}: {e}")
+    return failures
+
+
+def run_postgres(url: Optional[str]) -> int:
+    """Run the checks in a throwaway database; returns failures (0 when skipped)"""
+    try:
+        import psycopg
+        from psycopg.conninfo import make_conninfo
+    except ImportError:
+        print("⏭️  postgres skipped: psycopg is not installed")
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = False
+        try:
+            if not url:
+                url = start_local_postgres(tmp)
+                started = True
+        except (RuntimeError, subprocess.CalledProcessError) as e:
+            print(f"⏭️  postgres skipped: {e}")
+            return 0
+
+        database = f"storage_conformance_{os.getpid()}"
+        try:
+            with psycopg.connect(url, autocommit=True) as admin:
+                admin.execute(f"CREATE DATABASE {database}")
+            print(f"\n🐘 postgres ({'temporary server' if started else 'server from URL'})")
+            storage = create_storage('postgres', dsn=make_conninfo(url, dbname=database))
+            try:
+                return run_checks('postgres', storage)
+            finally:
+                storage.close()
+        finally:
+            with psycopg.connect(url, autocommit=True) as admin:
+                admin.execute(f"DROP DATABASE IF EXISTS {database}")
+            if started:
+                stop_local_postgres(tmp)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the storage conformance checks on every backend")
+    parser.add_argument("--backend", choices=STORAGE_BACKENDS, action="append",
+                        help="Backend to check (repeatable, defaults to all)")
+    parser.add_argument("--postgres-url", default=os.environ.get('DATABASE_URL'),
+                        help="Server to create the throwaway database on (defaults to DATABASE_URL, "
+                             "then a temporary local server)")
+    args = parser.parse_args()
+
+    failures = 0
+    for name in args.backend or STORAGE_BACKENDS:
+        if name == 'postgres':
+            failures += run_postgres(args.postgres_url)
+            continue
+
+        with tempfile.TemporaryDirectory() as tmp:
+            options = {'base_path': tmp, 'mirror_mode': 'off'} if name == 'sqlite' else {}
+            print(f"\n🗄️  {name}")
+            storage = create_storage(name, **options)
+            try:
+                failures += run_checks(name, storage)
+            finally:
+                storage.close()
+
+    if failures:
+        print(f"\n❌ {failures} checks failed")
+        sys.exit(1)
+    print("\n✅ All backends conform")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Shared data builders for the benchmark and check scripts
+
+Realistic plans and post records, so the benchmarks and the storage backend
+conformance check work on the same data without importing each other.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.models import (
+    Platform, ContentPillar, CTAType, PostFormat, PostVariation, DailyPost,
+    MonthlyCalendar, EditorialGuidelines, MonthlyPlan, PostRecord, PostingResult, GeneratedPost
+)
+
+PLATFORMS = list(Platform)
+PILLARS = list(ContentPillar)
+CTAS = list(CTAType)
+
+
+def make_plan(days: int, brand_name: str = "BenchBrand") -> MonthlyPlan:
+    """Build a plan with one post per platform per day"""
+    start = datetime(2024, 1, 1)
+    posts = []
+    for day in range(days):
+        date = (start + timedelta(days=day)).strftime('%Y-%m-%d')
+        for i, platform in enumerate(Platform):
+            n = day * len(Platform) + i
+            posts.append(DailyPost(
+                date=date,
+                platform=platform,
+                pillar=PILLARS[n % len(PILLARS)],
+                topic=f"How founders turn sponsor feedback into product wins #{n}",
+                key_message=(f"Day {day}: practical lessons for startup teams working with sponsors, "
+                             "with concrete steps, examples and a clear call to action for readers."),
+                variation=PostVariation(
+                    angle="behind the scenes",
+                    hook_style="question",
+                    cta_type=CTAS[n % len(CTAS)],
+                    format=PostFormat.TEXT
+                ),
+                hashtags=["#StartupLife", "#AIInnovation", f"#Day{day}"]
+            ))
+
+    return MonthlyPlan(
+        campaign_name=f"{days}-day campaign",
+        brand_name=brand_name,
+        positioning="AI tools for startup sponsorship",
+        target_audience="Startup founders",
+        value_propositions=["Faster sponsor matching", "Measurable results"],
+        content_pillars=PILLARS,
+        editorial_guidelines=EditorialGuidelines(
+            tone="professional",
+            do_list=["Be concrete"],
+            dont_list=["Overpromise"],
+            brand_voice_attributes=["helpful", "direct"]
+        ),
+        calendar=MonthlyCalendar(
+            start_date=posts[0].date,
+            end_date=posts[-1].date,
+            posts=posts,
+            total_posts=len(posts),
+            posts_per_platform={platform.value: days for platform in Platform}
+        ),
+        variation_rules={},
+        cta_targets=CTAS,
+        created_at=datetime.now().isoformat()
+    )
+
+
+def make_record(i: int, day: datetime) -> PostRecord:
+    """Build a realistic post record"""
+    platform = PLATFORMS[i % len(PLATFORMS)]
+    content = f"Post {i}: " + "insightful content about startups and sponsors " * 6
+    return PostRecord(
+        id=f"rec_{i}",
+        date=day.strftime('%Y-%m-%d'),
+        platform=platform,
+        post_id=f"{platform.value.lower()}_{i}",
+        content_hash=f"hash_{i}",
+        posting_result=PostingResult(
+            success=True,
+            platform=platform,
+            post_id=f"{platform.value.lower()}_{i}",
+            post_url=f"https://{platform.value.lower()}.com/post/{i}",
+            timestamp=day.isoformat()
+        ),
+        generated_post=GeneratedPost(
+            platform=platform,
+            content=content,
+            hashtags=["#StartupLife", "#AIInnovation", "#FundingFriday"],
+            character_count=len(content),
+            metadata={"tone": "professional", "pillar": "education"}
+        )
+    )
+
+
+def seed(storage, count: int) -> str:
+    """Insert count records, one per (date, platform); returns the last date"""
+    start = datetime(1950, 1, 1)
+    day = start
+    for i in range(count):
+        day = start + timedelta(days=i // len(PLATFORMS))
+        storage.record_post(make_record(i, day))
+    return day.strftime('%Y-%m-%d')
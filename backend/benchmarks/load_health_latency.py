@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Load test: light request latency while /analytics/performance is under heavy load
+
+Drives the FastAPI app in-process over ASGI (one event loop, like a single
+uvicorn worker). Two endpoints are probed at a fixed rate, first on an idle
+app and then while many clients hammer /analytics/performance:
+  /health          probes storage on the general threadpool, outside the
+                   facade, so it measures event loop responsiveness
+  /strategy/active reads through the async storage facade (plan version
+                   lookup, cached response body); analytics calls queue on the
+                   facade's slow pool, so it only competes with them for CPU
+"""
+
+import os
+import sys
+import math
+import time
+import asyncio
+import tempfile
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Isolated data and log directories, set before the app creates its storage
+_tmp = tempfile.mkdtemp(prefix="load_health_")
+os.environ["DATA_PATH"] = str(Path(_tmp) / "data")
+os.environ["LOGS_PATH"] = str(Path(_tmp) / "logs")
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+
+import main_v2
+from agents.models import Platform, PerformanceMetrics
+from fixtures import make_plan, make_record
+
+BRAND = "LoadBrand"
+PROBES = ["/health", f"/strategy/active/{BRAND}"]
+
+
+def seed(posts: int):
+    """Store posts with a few metrics samples each"""
+    storage = main_v2.storage
+    start = datetime(2024, 1, 1)
+    samples = []
+    for i in range(posts):
+        day = start + timedelta(days=i // len(Platform))
+        record = make_record(i, day)
+        storage.record_post(record)
+        for k in range(3):
+            samples.append(PerformanceMetrics(
+                post_id=record.post_id,
+                platform=record.platform,
+                impressions=100 * (k + 1),
+                engagements=10 * (k + 1),
+                measured_at=(day + timedelta(hours=k)).isoformat()
+            ))
+    storage.save_metrics_bulk(samples, write_files=False)
+    storage.save_monthly_plan(make_plan(30, BRAND))
+
+
+async def probe(client: httpx.AsyncClient, path: str, duration: float, interval: float):
+    """Call an endpoint every interval seconds and return latencies in ms"""
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def hammer_analytics(client: httpx.AsyncClient, stop: asyncio.Event, counter: list):
+    """Request analytics for the whole seeded range until stopped"""
+    payload = {"start_date": "2024-01-01", "end_date": "2030-12-31"}
+    while not stop.is_set():
+        response = await client.post("/analytics/performance", json=payload)
+        response.raise_for_status()
+        counter[0] += 1
+
+
+def summarize(label: str, latencies: list, extra: str = ""):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.99) - 1)]
+    print(f"{label:<34} n={len(ordered):<5} p50={statistics.median(ordered):7.2f} ms "
+          f"p99={p99:7.2f} ms max={ordered[-1]:7.2f} ms {extra}")
+
+
+async def run(args):
+    transport = httpx.ASGITransport(app=main_v2.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for path in PROBES:
+            idle = await probe(client, path, args.duration, args.interval)
+            summarize(f"{path} idle", idle)
+
+            stop = asyncio.Event()
+            counter = [0]
+            workers = [asyncio.create_task(hammer_analytics(client, stop, counter))
+                       for _ in range(args.concurrency)]
+            loaded = await probe(client, path, args.duration, args.interval)
+            stop.set()
+            await asyncio.gather(*workers)
+            summarize(f"{path} under load", loaded,
+                      f"({counter[0] / args.duration:.0f} analytics req/s, "
+                      f"{args.concurrency} clients)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure light request latency under analytics load")
+    parser.add_argument("--posts", type=int, default=3000, help="Seeded posts")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent analytics clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per phase")
+    parser.add_argument("--interval", type=float, default=0.01, help="Seconds between probes")
+    args = parser.parse_args()
+
+    seed(args.posts)
+    asyncio.run(run(args))
+    main_v2.async_storage.shutdown()
+    main_v2.storage.close()
+
+
+if __name__ == "__main__":
+    main()
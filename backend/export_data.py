@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Export posts, metrics and calendar posts for offline analysis
+
+Streams each table to <output>/<table>_<timestamp>.ndjson (or .parquet) in
+chunks, reading every shard. With --incremental only rows added since the
+previous incremental export are written: the watermarks are kept in
+<output>/watermarks.json and only advanced once a table's file is complete.
+
+Examples:
+    python export_data.py --output exports/
+    python export_data.py --output exports/ --format parquet --incremental
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent))
+
+from agents.storage import StorageManager
+from agents.exporter import EXPORT_TABLES, EXPORT_FORMATS, StreamingExporter
+
+WATERMARKS_FILE = "watermarks.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream storage tables to NDJSON or Parquet files")
+    parser.add_argument("--output", required=True, help="Directory receiving the export files")
+    parser.add_argument("--tables", nargs="+", choices=list(EXPORT_TABLES), default=list(EXPORT_TABLES),
+                        help="Tables to export (default: all)")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson", help="File format")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"Only export rows added since the watermarks in <output>/{WATERMARKS_FILE}")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows read and written at a time")
+    parser.add_argument("--data-path", default=None,
+                        help="Storage directory containing orchestrator.db (defaults to the app's)")
+    parser.add_argument("--sharding", default=None,
+                        help="Storage layout the app runs with (defaults to STORAGE_SHARDING)")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    watermarks_path = output / WATERMARKS_FILE
+    watermarks = {}
+    if args.incremental and watermarks_path.exists():
+        watermarks = json.loads(watermarks_path.read_text())
+
+    storage = StorageManager(base_path=args.data_path, mirror_mode="off", sharding=args.sharding)
+    exporter = StreamingExporter(storage, chunk_size=args.chunk_size)
+    kind = "incremental" if args.incremental else "full"
+    print(f"\n📤 {kind.capitalize()} {args.format} export of {', '.join(args.tables)} to {output}")
+
+    try:
+        for table in args.tables:
+            result = exporter.export_to_file(table, output, args.format,
+                                             since=watermarks.get(table) if args.incremental else None)
+            if result['path'] is None:
+                print(f"⏭️  {table}: no new rows")
+            else:
+                print(f"✅ {table}: {result['rows']} rows, {result['bytes'] / 1024:.1f} KB -> {result['path']}")
+
+            # Saved after every table so a failure later on does not re-export this one
+            watermarks[table] = result['watermark']
+            watermarks_path.write_text(json.dumps(watermarks, indent=2))
+    except ImportError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,9 +10,14 @@ import re
 load_dotenv()
 
 class LandingPageAnalyzer:
-    def __init__(self):
-        """Initialize the Landing Page Analyzer with LLM"""
-        self.llm = ChatOpenAI(
+    def __init__(self, llm: Optional[ChatOpenAI] = None):
+        """
+        Initialize the Landing Page Analyzer with LLM
+
+        Args:
+            llm: Shared LLM client (e.g. from the agent registry); a new one is created if None
+        """
+        self.llm = llm or ChatOpenAI(
             api_key=os.getenv("BLACKBOX_API_KEY"),
             base_url="https://api.blackbox.ai/v1",
             model=os.getenv("BLACKBOX_MODEL", "blackboxai/openai/gpt-4o"),
@@ -146,17 +151,18 @@ class LandingPageAnalyzer:
             }
 
 # Standalone function for easy integration
-def extract_landing_page_info(url: str) -> str:
+def extract_landing_page_info(url: str, analyzer: Optional[LandingPageAnalyzer] = None) -> str:
     """
     Extract useful information from a landing page URL
 
     Args:
         url: The URL of the landing page to analyze
+        analyzer: Shared analyzer to use (a new one is created if None)
 
     Returns:
         String containing the extracted information or error message
     """
-    analyzer = LandingPageAnalyzer()
+    analyzer = analyzer or LandingPageAnalyzer()
     result = analyzer.analyze_landing_page(url)
 
     if result["status"] == "success":
@@ -5,8 +5,12 @@ Main FastAPI application with endpoints for strategy generation and daily orches
 
 from dotenv import load_dotenv
 import os
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -16,15 +20,22 @@ import uvicorn
 from agents.logger_config import setup_logger, log_with_context, log_api_request
 
 # Import V2 agents for Orchestrator Suite
-from agents.strategy_agent_v2 import StrategyAgentV2, create_monthly_strategy
-from agents.orchestrator_agent_v2 import OrchestratorAgentV2, execute_daily_orchestration
+from agents.strategy_agent_v2 import create_monthly_strategy
+from agents.orchestrator_agent_v2 import execute_daily_orchestration
 from agents.models import (
     StrategyRequest,
     OrchestratorRequest,
     AnalyticsRequest,
+    BulkMetricsRequest,
     Platform
 )
-from agents.storage import get_storage
+from agents.storage import StorageManager, get_storage
+from agents.async_storage import AsyncStorage
+from agents.retention import RetentionEngine, RetentionScheduler
+from agents.exporter import EXPORT_FORMATS, StreamingExporter, format_watermark
+from agents.plan_cache import PlanResponseCache, plan_etag
+from agents.jobs import FINISHED_STATUSES, JobManager
+from agents.agent_registry import get_agent_registry
 from twitter_service import get_twitter_service
 
 # Legacy imports (kept for backward compatibility)
@@ -35,10 +46,54 @@ load_dotenv()
 logger = setup_logger("api.main", "INFO")
 
 # ---------- FastAPI App ----------
+async def rebuild_missing_mirrors():
+    """Recreate JSON mirrors lost if the previous process died before writing them"""
+    try:
+        rebuilt = await async_storage.rebuild_mirrors()
+        if rebuilt:
+            logger.info(f"Rebuilt missing mirror files: {rebuilt}")
+    except Exception as e:
+        logger.error(f"Mirror rebuild failed: {str(e)}", exc_info=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks"""
+    # Build the shared agents and LLM clients once, instead of per request
+    agent_registry = get_agent_registry()
+    if await run_in_threadpool(agent_registry.warm):
+        logger.info("Agents and LLM clients ready")
+    # Parse active plans once so the first requests hit the cache
+    warmed = await async_storage.warm_plan_cache()
+    logger.info(f"Plan cache warmed with {warmed} active plans")
+    # The mirror registry grows with history: walk it in the background, not before serving
+    mirror_rebuild = asyncio.create_task(rebuild_missing_mirrors())
+    # Purge expired data in small batches off the request path (SQLite backend;
+    # other backends are purged through DELETE /data/cleanup)
+    retention = None
+    if isinstance(storage, StorageManager):
+        retention = RetentionScheduler(
+            RetentionEngine(storage, raw_metrics_days=int(os.getenv("METRICS_RAW_DAYS", 14))),
+            interval_seconds=float(os.getenv("RETENTION_INTERVAL_HOURS", 24)) * 3600
+        )
+        retention.start()
+    # Run queued jobs, including those interrupted by the previous shutdown
+    jobs.start()
+    yield
+    # Drain: let running jobs (e.g. orchestration runs) finish, then in-flight storage calls, then release pooled database connections
+    jobs.stop(timeout=float(os.getenv("JOB_SHUTDOWN_TIMEOUT", 30)))
+    mirror_rebuild.cancel()
+    agent_registry.close()
+    if retention:
+        retention.stop()
+    async_storage.shutdown()
+    storage.close()
+    logger.info("Storage connections closed")
+
 app = FastAPI(
     title="Social CM Orchestrator Suite API",
     version="2.0.0",
-    description="API for managing social media content strategy and daily orchestration"
+    description="API for managing social media content strategy and daily orchestration",
+    lifespan=lifespan
 )
 
 logger.info("FastAPI application initialized")
@@ -54,6 +109,15 @@ app.add_middleware(
 
 # Initialize storage (agents will be initialized per request with startup params)
 storage = get_storage()
+# Endpoints go through the async facade so SQLite and file I/O never block the event loop
+async_storage = AsyncStorage(storage, max_workers=int(os.getenv("STORAGE_MAX_WORKERS", 8)),
+                             slow_workers=int(os.getenv("STORAGE_SLOW_WORKERS", 2)))
+# Long tasks (strategy generation, orchestration runs) run as stored jobs on a bounded worker pool
+jobs = JobManager(storage, max_workers=int(os.getenv("JOB_MAX_WORKERS", 4)))
+# Serialized /strategy/active bodies by plan ETag (the frontend polls this endpoint)
+plan_responses = PlanResponseCache(max_entries=int(os.getenv("PLAN_RESPONSE_CACHE_SIZE", 64)))
+JOB_EVENTS_POLL_SECONDS = 0.5
+JOB_EVENTS_KEEPALIVE_SECONDS = 15.0
 
 # ---------- Root Endpoint ----------
 @app.get("/")
@@ -66,6 +130,7 @@ def read_root():
             "strategy": "/strategy/*",
             "orchestrator": "/orchestrator/*",
             "analytics": "/analytics/*",
+            "jobs": "/jobs/*",
             "legacy": "/agent"
         },
         "documentation": "/docs"
@@ -77,7 +142,9 @@ async def health_check():
     """Health check endpoint"""
     try:
         # Check if storage is accessible
-        storage.has_run_today("2024-01-01")  # Dummy check
+        # Probe storage outside the facade's bounded queue so health checks
+        # still answer promptly while analytics saturate the storage workers
+        await run_in_threadpool(storage.has_run_today, "2024-01-01")  # Dummy check
 
         return {
             "status": "healthy",
@@ -98,7 +165,58 @@ async def health_check():
         }
 
 # ---------- Strategy Endpoints ----------
-@app.post("/strategy/generate")
+def run_strategy_job(request: Dict[str, Any], progress) -> Dict[str, Any]:
+    """
+    Job handler generating a monthly strategy (runs on a job worker)
+
+    Args:
+        request: StrategyRequest fields
+        progress: Reports the current stage and completion percentage
+
+    Returns:
+        Summary of the generated plan
+    """
+    request = StrategyRequest(**request)
+    plan = create_monthly_strategy(
+        brand_name=request.brand_name,
+        positioning=request.positioning,
+        target_audience=request.target_audience,
+        value_props=request.value_props,
+        start_date=request.start_date,
+        duration_days=request.duration_days,
+        language=request.language,
+        tone=request.tone,
+        cta_targets=request.cta_targets,
+        use_ai=True,  # Enable AI generation with platform filtering
+        startup_name=request.startup_name,
+        startup_url=request.startup_url,
+        platforms=request.platforms,
+        progress=progress,
+        agent=get_agent_registry().strategy_agent
+    )
+
+    logger.info(f"Strategy generated successfully for {request.brand_name}")
+    log_with_context(logger, "info", "Strategy generation success",
+                    brand=request.brand_name,
+                    plan_id=f"plan_{request.brand_name}_{request.start_date}",
+                    total_posts=plan.calendar.total_posts)
+
+    return {
+        "success": True,
+        "plan_id": f"plan_{request.brand_name}_{request.start_date}",
+        "message": f"Generated {request.duration_days}-day strategy for {request.brand_name}",
+        "summary": {
+            "total_posts": plan.calendar.total_posts,
+            "posts_per_platform": plan.calendar.posts_per_platform,
+            "content_pillars": [p.value for p in plan.content_pillars],
+            "start_date": plan.calendar.start_date,
+            "end_date": plan.calendar.end_date
+        }
+    }
+
+jobs.register("strategy.generate", run_strategy_job)
+
+@app.post("/strategy/generate", status_code=202)
 async def generate_strategy(request: StrategyRequest):
     """
     Generate a monthly content strategy
@@ -107,6 +225,10 @@ async def generate_strategy(request: StrategyRequest):
     - 1 post per day per network (LinkedIn, Facebook, Twitter)
     - Content pillars and variation rules
     - Editorial guidelines and tone of voice
+
+    Generation runs as a background job: the response carries the job ID at once,
+    follow it with GET /jobs/{job_id} or the Server-Sent Events of /jobs/{job_id}/events.
+    The plan summary is the job result.
     """
     logger.info(f"Strategy generation requested for brand: {request.brand_name}")
     log_with_context(logger, "debug", "Strategy request details",
@@ -118,62 +240,90 @@ async def generate_strategy(request: StrategyRequest):
                     startup_url=request.startup_url)
 
     try:
-        # Initialize strategy agent with startup params if provided
-        strategy_agent = StrategyAgentV2()
-
-        plan = create_monthly_strategy(
-            brand_name=request.brand_name,
-            positioning=request.positioning,
-            target_audience=request.target_audience,
-            value_props=request.value_props,
-            start_date=request.start_date,
-            duration_days=request.duration_days,
-            language=request.language,
-            tone=request.tone,
-            cta_targets=request.cta_targets,
-            use_ai=True,  # Enable AI generation with platform filtering
-            startup_name=request.startup_name,
-            startup_url=request.startup_url,
-            platforms=request.platforms
-        )
+        job = await run_in_threadpool(jobs.submit, "strategy.generate", request.model_dump(mode="json"))
+        return {
+            "success": True,
+            "job_id": job.id,
+            "status": job.status.value,
+            "status_url": f"/jobs/{job.id}",
+            "events_url": f"/jobs/{job.id}/events"
+        }
+    except Exception as e:
+        logger.error(f"Failed to queue strategy for {request.brand_name}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Note: startup_name and startup_url are already passed to create_monthly_strategy
-        # so they are already included in the plan. No need to save again.
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison, as RFC 9110 asks)"""
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
 
-        logger.info(f"Strategy generated successfully for {request.brand_name}")
-        log_with_context(logger, "info", "Strategy generation success",
-                        brand=request.brand_name,
-                        plan_id=f"plan_{request.brand_name}_{request.start_date}",
-                        total_posts=plan.calendar.total_posts)
+def serialize_plan_response(plan) -> bytes:
+    """JSON body of /strategy/active for a plan"""
+    return b'{"success":true,"plan":' + plan.model_dump_json().encode() + b'}'
+
+@app.get("/strategy/active/{brand_name}")
+async def get_active_strategy(brand_name: str, if_none_match: Optional[str] = Header(default=None)):
+    """
+    Get the active strategy for a brand
 
+    The response carries an ETag naming the plan version. Send it back in
+    If-None-Match to get a 304 without the plan while it has not been regenerated.
+    """
+    try:
+        version, plan_id = await async_storage.get_active_plan_version(brand_name)
+        etag = plan_etag(brand_name, version, plan_id) if version else None
+        if etag and if_none_match and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+        body = plan_responses.get(etag) if etag else None
+        if body is None:
+            plan = await async_storage.get_active_plan(brand_name)
+            if not plan:
+                raise HTTPException(status_code=404, detail="No active strategy found")
+            body = await run_in_threadpool(serialize_plan_response, plan)
+            # Only cache the body under the tag if no new version was saved meanwhile
+            if etag and (await async_storage.get_active_plan_version(brand_name))[0] == version:
+                plan_responses.put(etag, body)
+            else:
+                etag = None
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"} if etag else None
+        return Response(content=body, media_type="application/json", headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/strategy/history/{brand_name}")
+async def get_strategy_history(brand_name: str):
+    """
+    List the stored plan versions of a brand
+    """
+    try:
+        versions = await async_storage.list_plan_versions(brand_name)
         return {
             "success": True,
-            "plan_id": f"plan_{request.brand_name}_{request.start_date}",
-            "message": f"Generated {request.duration_days}-day strategy for {request.brand_name}",
-            "summary": {
-                "total_posts": plan.calendar.total_posts,
-                "posts_per_platform": plan.calendar.posts_per_platform,
-                "content_pillars": [p.value for p in plan.content_pillars],
-                "start_date": plan.calendar.start_date,
-                "end_date": plan.calendar.end_date
-            }
+            "brand_name": brand_name,
+            "versions": versions,
+            "count": len(versions)
         }
     except Exception as e:
-        logger.error(f"Failed to generate strategy for {request.brand_name}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/strategy/active/{brand_name}")
-async def get_active_strategy(brand_name: str):
+@app.get("/strategy/history/{brand_name}/{version}")
+async def get_strategy_version(brand_name: str, version: int):
     """
-    Get the active strategy for a brand
+    Get a brand's plan as it was at a given version
     """
     try:
-        plan = storage.get_active_plan(brand_name)
+        plan = await async_storage.get_plan_at_version(brand_name, version)
         if not plan:
-            raise HTTPException(status_code=404, detail="No active strategy found")
+            raise HTTPException(status_code=404, detail="Plan version not found")
 
         return {
             "success": True,
+            "version": version,
             "plan": plan.model_dump()
         }
     except HTTPException:
@@ -187,7 +337,7 @@ async def get_daily_posts(brand_name: str, date: str):
     Get posts scheduled for a specific date
     """
     try:
-        posts = storage.get_daily_posts(brand_name, date)
+        posts = await async_storage.get_daily_posts(brand_name, date)
         return {
             "success": True,
             "date": date,
@@ -198,8 +348,53 @@ async def get_daily_posts(brand_name: str, date: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 # ---------- Orchestrator Endpoints ----------
-@app.post("/orchestrator/daily")
-async def execute_daily(request: OrchestratorRequest, background_tasks: BackgroundTasks):
+def run_orchestration_job(request: Dict[str, Any], progress) -> Dict[str, Any]:
+    """
+    Job handler executing a daily orchestration run (runs on a job worker)
+
+    Args:
+        request: Run parameters (see execute_daily)
+        progress: Reports the current stage, percentage and per-platform progress
+
+    Returns:
+        Orchestration result
+    """
+    result = execute_daily_orchestration(progress=progress, agent=get_agent_registry().orchestrator_agent,
+                                         **request)
+
+    logger.info(f"Daily orchestration completed: success={result.get('success')}")
+    log_with_context(logger, "info", "Orchestration result",
+                    success=result.get('success'),
+                    stats=result.get('stats'),
+                    errors=result.get('errors'))
+    return result
+
+# One run at a time per brand, so two runs never post the same brand's day concurrently
+jobs.register("orchestrator.daily", run_orchestration_job,
+              concurrency_key=lambda request: request["brand_name"],
+              max_per_key=int(os.getenv("ORCHESTRATOR_RUNS_PER_BRAND", 1)))
+
+def format_run(job) -> Dict[str, Any]:
+    """Orchestration run view of a job record"""
+    return {
+        "run_id": job.id,
+        "status": job.status.value,
+        "stage": job.stage,
+        "progress": job.progress,
+        "brand_name": job.request.get("brand_name"),
+        "date": job.request.get("execution_date"),
+        "dry_run": job.request.get("dry_run"),
+        "platforms": (job.details or {}).get("platforms"),
+        "cancel_requested": job.cancel_requested,
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "result": job.result,
+        "error": job.error
+    }
+
+@app.post("/orchestrator/daily", status_code=202)
+async def execute_daily(request: OrchestratorRequest):
     """
     Execute daily content posting
 
@@ -208,6 +403,10 @@ async def execute_daily(request: OrchestratorRequest, background_tasks: Backgrou
     - Adapts content based on recent signals
     - Dispatches to channel agents (LinkedIn, Facebook, Twitter)
     - Ensures idempotency (won't double-post)
+
+    The run is queued (one run at a time per brand) and the response carries its
+    run ID at once: follow it with GET /orchestrator/runs/{run_id}, cancel it with
+    POST /orchestrator/runs/{run_id}/cancel.
     """
     # Default to today if no date specified
     execution_date = request.execute_date or datetime.now().strftime("%Y-%m-%d")
@@ -223,28 +422,53 @@ async def execute_daily(request: OrchestratorRequest, background_tasks: Backgrou
                     startup_url=request.startup_url)
 
     try:
-        # Execute orchestration with startup params
-        result = execute_daily_orchestration(
-            brand_name=request.company_name,  # Should come from auth/config
-            execution_date=execution_date,
-            force=request.force_execution,
-            dry_run=request.dry_run,
-            platforms=[p.value for p in request.platforms] if request.platforms else None,
-            startup_name=request.startup_name,
-            startup_url=request.startup_url
-        )
-
-        logger.info(f"Daily orchestration completed: success={result.get('success')}")
-        log_with_context(logger, "info", "Orchestration result",
-                        success=result.get('success'),
-                        stats=result.get('stats'),
-                        errors=result.get('errors'))
-
-        return result
+        job = await run_in_threadpool(jobs.submit, "orchestrator.daily", {
+            "brand_name": request.company_name,  # Should come from auth/config
+            "execution_date": execution_date,
+            "force": request.force_execution,
+            "dry_run": request.dry_run,
+            "platforms": [p.value for p in request.platforms] if request.platforms else None,
+            "startup_name": request.startup_name,
+            "startup_url": request.startup_url
+        })
+        return {
+            "success": True,
+            "run_id": job.id,
+            "status": job.status.value,
+            "date": execution_date,
+            "status_url": f"/orchestrator/runs/{job.id}",
+            "cancel_url": f"/orchestrator/runs/{job.id}/cancel"
+        }
     except Exception as e:
         logger.error(f"Daily orchestration failed: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/orchestrator/runs/{run_id}")
+async def get_orchestration_run(run_id: str):
+    """
+    Get the status of an orchestration run, with per-platform progress and timings
+    """
+    job = await async_storage.get_job(run_id)
+    if not job or job.kind != "orchestrator.daily":
+        raise HTTPException(status_code=404, detail="Run not found")
+    return {"success": True, "run": format_run(job)}
+
+@app.post("/orchestrator/runs/{run_id}/cancel")
+async def cancel_orchestration_run(run_id: str):
+    """
+    Cancel an orchestration run
+
+    A queued run never starts. A running run stops before its next post; posts
+    already made are kept, and a later run resumes with the remaining ones.
+    """
+    job = await async_storage.get_job(run_id)
+    if not job or job.kind != "orchestrator.daily":
+        raise HTTPException(status_code=404, detail="Run not found")
+    if job.status in FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Run already {job.status.value}")
+    job = await run_in_threadpool(jobs.cancel, run_id)
+    return {"success": True, "run": format_run(job)}
+
 @app.get("/orchestrator/status")
 async def get_orchestrator_status(date: Optional[str] = None):
     """
@@ -254,9 +478,8 @@ async def get_orchestrator_status(date: Optional[str] = None):
         if not date:
             date = datetime.now().strftime("%Y-%m-%d")
 
-        # Initialize orchestrator agent (without startup params for status check)
-        orchestrator_agent = OrchestratorAgentV2()
-        status = orchestrator_agent.get_execution_status(
+        status = await run_in_threadpool(
+            get_agent_registry().orchestrator_agent.get_execution_status,
             brand_name="DefaultBrand",  # Should come from auth/config
             date=date
         )
@@ -265,7 +488,7 @@ async def get_orchestrator_status(date: Optional[str] = None):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/orchestrator/retry/{date}/{platform}")
+@app.post("/orchestrator/retry/{date}/{platform}", status_code=202)
 async def retry_failed_post(
     date: str,
     platform: str,
@@ -275,6 +498,10 @@ async def retry_failed_post(
     """
     Retry a failed post for a specific platform
 
+    The retry is queued like a daily run (it waits for any run of the brand in
+    progress) and only re-posts slots that were not posted: content already
+    published that day is left alone.
+
     Query parameters:
         startup_name: Optional startup name for content generation
         startup_url: Optional startup URL for landing page analysis
@@ -282,21 +509,29 @@ async def retry_failed_post(
     try:
         # Convert platform string to enum
         platform_enum = Platform(platform)
-
-        result = execute_daily_orchestration(
-            brand_name="DefaultBrand",
-            execution_date=date,
-            force=True,
-            dry_run=False,
-            platforms=[platform],
-            startup_name=startup_name,
-            startup_url=startup_url
-        )
-
-        return result
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid platform: {platform}")
+
+    try:
+        job = await run_in_threadpool(jobs.submit, "orchestrator.daily", {
+            "brand_name": "DefaultBrand",
+            "execution_date": date,
+            "force": False,
+            "dry_run": False,
+            "platforms": [platform_enum.value],
+            "startup_name": startup_name,
+            "startup_url": startup_url
+        })
+        return {
+            "success": True,
+            "run_id": job.id,
+            "status": job.status.value,
+            "date": date,
+            "status_url": f"/orchestrator/runs/{job.id}",
+            "cancel_url": f"/orchestrator/runs/{job.id}/cancel"
+        }
     except Exception as e:
+        logger.error(f"Retry of {platform} on {date} failed: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ---------- Analytics Endpoints ----------
@@ -306,51 +541,29 @@ async def get_performance_analytics(request: AnalyticsRequest):
     Get performance analytics for a date range
     """
     try:
-        # Get posted content
-        posts = storage.get_posted_content(
+        # Totals and per-platform breakdown come from a single grouped query
+        summary = await async_storage.aggregate_performance(
             start_date=request.start_date,
             end_date=request.end_date,
-            platform=request.platforms[0] if request.platforms and len(request.platforms) == 1 else None
+            platforms=request.platforms
         )
 
-        # Aggregate metrics
-        total_posts = len(posts)
-        successful_posts = len([p for p in posts if p.posting_result.success])
-        failed_posts = total_posts - successful_posts
-
-        # Get metrics for each post
         metrics_summary = {
-            "total_impressions": 0,
-            "total_engagements": 0,
-            "average_engagement_rate": 0,
-            "by_platform": {}
+            "total_impressions": summary["total_impressions"],
+            "total_engagements": summary["total_engagements"],
+            "average_engagement_rate": summary["average_engagement_rate"],
+            "by_platform": {
+                platform: {
+                    "posts": stats["posts_with_metrics"],
+                    "impressions": stats["impressions"],
+                    "engagements": stats["engagements"],
+                    "engagement_rate": stats["engagement_rate"]
+                }
+                for platform, stats in summary["by_platform"].items()
+                if stats["posts_with_metrics"] > 0
+            }
         }
 
-        for post in posts:
-            post_metrics = storage.get_metrics(post.post_id)
-            if post_metrics:
-                latest = post_metrics[0]
-                metrics_summary["total_impressions"] += latest.impressions
-                metrics_summary["total_engagements"] += latest.engagements
-
-                platform_key = post.platform.value
-                if platform_key not in metrics_summary["by_platform"]:
-                    metrics_summary["by_platform"][platform_key] = {
-                        "posts": 0,
-                        "impressions": 0,
-                        "engagements": 0
-                    }
-
-                metrics_summary["by_platform"][platform_key]["posts"] += 1
-                metrics_summary["by_platform"][platform_key]["impressions"] += latest.impressions
-                metrics_summary["by_platform"][platform_key]["engagements"] += latest.engagements
-
-        # Calculate average engagement rate
-        if metrics_summary["total_impressions"] > 0:
-            metrics_summary["average_engagement_rate"] = (
-                metrics_summary["total_engagements"] / metrics_summary["total_impressions"] * 100
-            )
-
         return {
             "success": True,
             "period": {
@@ -358,22 +571,61 @@ async def get_performance_analytics(request: AnalyticsRequest):
                 "end": request.end_date
             },
             "posts": {
-                "total": total_posts,
-                "successful": successful_posts,
-                "failed": failed_posts
+                "total": summary["total_posts"],
+                "successful": summary["successful_posts"],
+                "failed": summary["failed_posts"]
             },
             "metrics": metrics_summary
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analytics/metrics/bulk")
+async def ingest_metrics_bulk(request: BulkMetricsRequest):
+    """
+    Store a batch of performance metrics in a single transaction
+
+    Samples already stored for the same post and measurement time are skipped.
+    """
+    try:
+        stats = await async_storage.save_metrics_bulk(request.metrics, write_files=request.write_files)
+        return {
+            "success": True,
+            "stats": stats
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/analytics/series")
+async def get_metrics_series(start_date: str, end_date: str, interval: str = "day",
+                             brand_name: Optional[str] = None, platform: Optional[str] = None):
+    """
+    Get an hourly, daily or weekly metrics time series from the rollups
+    """
+    try:
+        series = await async_storage.get_metrics_series(
+            start_date=start_date,
+            end_date=end_date,
+            interval=interval,
+            brand_name=brand_name,
+            platform=Platform(platform) if platform else None
+        )
+        return {
+            "success": True,
+            "series": series
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/analytics/yesterday/{brand_name}")
 async def get_yesterday_performance(brand_name: str):
     """
     Get yesterday's performance summary
     """
     try:
-        performance = storage.get_yesterday_performance(brand_name)
+        performance = await async_storage.get_yesterday_performance(brand_name)
         return {
             "success": True,
             "performance": performance
@@ -441,7 +693,7 @@ async def cleanup_old_data(days_to_keep: int = 90):
     Clean up old data (requires admin privileges)
     """
     try:
-        stats = storage.cleanup_old_data(days_to_keep)
+        stats = await async_storage.cleanup_old_data(days_to_keep)
         return {
             "success": True,
             "message": f"Cleaned up data older than {days_to_keep} days",
@@ -450,6 +702,82 @@ async def cleanup_old_data(days_to_keep: int = 90):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/data/export/{table}")
+async def export_table(table: str, format: str = "ndjson", since: Optional[str] = None):
+    """
+    Stream a table (posted_content, performance_metrics or calendar_posts) as NDJSON or Parquet
+
+    Pass the X-Export-Watermark header of the previous response as `since`
+    to only receive rows added after it.
+    """
+    if not isinstance(storage, StorageManager):
+        raise HTTPException(status_code=501, detail="Exports are only available with the sqlite storage backend")
+
+    try:
+        exporter = StreamingExporter(storage)
+        watermark, chunks = await async_storage.run(exporter.export, table, format, since)
+    except (ValueError, ImportError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # Chunks are read and encoded on a worker thread while the response is sent
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[format]["media_type"],
+        headers={
+            "X-Export-Watermark": format_watermark(watermark),
+            "Content-Disposition": f'attachment; filename="{table}{EXPORT_FORMATS[format]["extension"]}"'
+        }
+    )
+
+# ---------- Job Endpoints ----------
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status, stage and progress of a background job (and its result once finished)
+    """
+    job = await async_storage.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"success": True, "job": job.model_dump(mode="json")}
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Follow a background job with Server-Sent Events
+
+    An event (named after the job status) is sent each time the job changes stage,
+    progress or status; the stream ends once the job succeeded or failed.
+    """
+    job = await async_storage.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events(job):
+        last_update = None
+        idle = 0.0
+        while True:
+            if job.updated_at != last_update:
+                last_update = job.updated_at
+                idle = 0.0
+                yield f"event: {job.status.value}\ndata: {job.model_dump_json()}\n\n"
+                if job.status in FINISHED_STATUSES:
+                    return
+            elif idle >= JOB_EVENTS_KEEPALIVE_SECONDS:
+                # Comment line keeping proxies from closing an idle stream
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+            idle += JOB_EVENTS_POLL_SECONDS
+            job = await async_storage.get_job(job_id) or job
+
+    return StreamingResponse(
+        events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # ---------- Monitoring Endpoints ----------
 @app.get("/metrics")
 async def get_system_metrics():
@@ -459,10 +787,9 @@ async def get_system_metrics():
     try:
         today = datetime.now().strftime("%Y-%m-%d")
 
-        # Initialize orchestrator agent for metrics
-        orchestrator_agent = OrchestratorAgentV2()
         # Get today's execution status
-        status = orchestrator_agent.get_execution_status("DefaultBrand", today)
+        status = await run_in_threadpool(get_agent_registry().orchestrator_agent.get_execution_status,
+                                         "DefaultBrand", today)
 
         return {
             "timestamp": datetime.now().isoformat(),
@@ -470,7 +797,10 @@ async def get_system_metrics():
                 "executed": status["has_run"],
                 "posts_completed": status["posts_completed"],
                 "posts_failed": status["posts_failed"]
-            }
+            },
+            "storage": storage.get_cache_stats(),
+            "plan_responses": plan_responses.get_stats(),
+            "mirror": storage.mirror.get_stats() if isinstance(storage, StorageManager) else None
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -489,7 +819,8 @@ async def create_sample_strategy(
         startup_url: Startup URL for landing page analysis (default: https://example.com)
     """
     try:
-        plan = create_monthly_strategy(
+        plan = await run_in_threadpool(
+            create_monthly_strategy,
             brand_name="TestBrand",
             positioning="AI-powered platform connecting startups with sponsors",
             target_audience="Startups seeking funding and sponsors looking for innovation",
@@ -506,7 +837,8 @@ async def create_sample_strategy(
             cta_targets=["demo", "newsletter", "discord", "free_trial"],
             use_ai=True,
             startup_name=startup_name,
-            startup_url=startup_url
+            startup_url=startup_url,
+            agent=get_agent_registry().strategy_agent
         )
 
         # Note: startup_name and startup_url are already passed to create_monthly_strategy
@@ -536,14 +868,16 @@ async def test_orchestration(
         startup_url: Startup URL for landing page analysis (default: https://example.com)
     """
     try:
-        result = execute_daily_orchestration(
+        result = await run_in_threadpool(
+            execute_daily_orchestration,
             brand_name="TestBrand",
             execution_date=datetime.now().strftime("%Y-%m-%d"),
             force=True,
             dry_run=True,
             platforms=["LinkedIn"],
             startup_name=startup_name,
-            startup_url=startup_url
+            startup_url=startup_url,
+            agent=get_agent_registry().orchestrator_agent
         )
 
         return result
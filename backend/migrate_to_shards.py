@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Split the single orchestrator.db into per-brand (or hash bucket) shards
+
+Copies every brand's plans, plan history, posts (with their near-duplicate
+index and image references), metrics, rollups and mirror registrations into
+the brand's shard, verifies the copied row counts and deletes the moved rows
+from orchestrator.db. Unbranded data (orchestrator runs and state, posts
+recorded without a brand) stays in orchestrator.db.
+
+Stop the API and any orchestration jobs first, then start them again with
+STORAGE_SHARDING set to the same value passed to --sharding. With
+--keep-source the rows are only copied: reads across shards would then count
+them twice, so do not start the app sharded until the script was run again
+without it.
+"""
+
+import sys
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent))
+
+from agents.storage import StorageManager
+from agents.sharding import DEFAULT_SHARD
+
+# (table, filter on the rows of one brand, conflict clause). Order matters:
+# posts before the metrics whose rollup triggers look up their brand, image
+# blobs before the references whose triggers count them, raw metrics before
+# the stored rollups that replace the ones rebuilt by the triggers.
+BRAND_POSTS = "SELECT post_id FROM main.posted_content WHERE brand_name = :brand"
+BRAND_RECORDS = "SELECT id FROM main.posted_content WHERE brand_name = :brand"
+BRAND_PLANS = "SELECT id FROM main.monthly_plans WHERE brand_name = :brand"
+
+COPY_STEPS = [
+    ("brand_plan_versions", "brand_name = :brand", "OR IGNORE"),
+    ("monthly_plans", "brand_name = :brand", "OR IGNORE"),
+    ("calendar_posts", "brand_name = :brand", "OR IGNORE"),
+    ("plan_history", "brand_name = :brand", "OR IGNORE"),
+    ("posted_content", "brand_name = :brand", "OR IGNORE"),
+    ("content_signatures", f"record_id IN ({BRAND_RECORDS})", "OR IGNORE"),
+    ("content_lsh", f"record_id IN ({BRAND_RECORDS})", "OR IGNORE"),
+    ("image_blobs", f"sha256 IN (SELECT sha256 FROM main.post_images WHERE record_id IN ({BRAND_RECORDS}))",
+     "OR IGNORE"),
+    ("post_images", f"record_id IN ({BRAND_RECORDS})", "OR IGNORE"),
+    ("performance_metrics", f"post_id IN ({BRAND_POSTS})", "OR IGNORE"),
+    ("metric_rollups", f"post_id IN ({BRAND_POSTS})", "OR REPLACE"),
+    ("mirror_files", f"""
+        (kind = 'plan' AND ref_id IN ({BRAND_PLANS}))
+        OR (kind = 'post' AND ref_id IN ({BRAND_RECORDS}))
+        OR (kind = 'metrics' AND ref_id IN (
+            SELECT post_id || '|' || measured_at FROM main.performance_metrics
+            WHERE post_id IN ({BRAND_POSTS})
+        ))
+    """, "OR IGNORE"),
+]
+
+# Columns that are recomputed in the shard rather than copied
+RECOMPUTED = {"image_blobs": {"refcount"}}
+
+
+def list_brands(conn) -> List[str]:
+    """Brands with data in the source database"""
+    return [row[0] for row in conn.execute("""
+        SELECT brand_name FROM main.posted_content WHERE brand_name IS NOT NULL
+        UNION SELECT brand_name FROM main.monthly_plans WHERE brand_name IS NOT NULL
+        UNION SELECT brand_name FROM main.plan_history
+        UNION SELECT brand_name FROM main.brand_plan_versions
+        ORDER BY 1
+    """)]
+
+
+def columns(conn, table: str) -> List[str]:
+    """Copied columns of a table (every shard runs the same migrations)"""
+    skip = RECOMPUTED.get(table, set())
+    return [row[1] for row in conn.execute(f"PRAGMA main.table_info({table})") if row[1] not in skip]
+
+
+def copy_brand(conn, brand: str) -> Dict[str, int]:
+    """Copy one brand into the attached shard; returns rows matched in the source per table"""
+    counts = {}
+    for table, where, conflict in COPY_STEPS:
+        cols = ', '.join(columns(conn, table))
+        conn.execute(f"""
+            INSERT {conflict} INTO shard.{table} ({cols})
+            SELECT {cols} FROM main.{table} WHERE {where}
+        """, {'brand': brand})
+        counts[table] = conn.execute(f"SELECT COUNT(*) FROM main.{table} WHERE {where}",
+                                     {'brand': brand}).fetchone()[0]
+    return counts
+
+
+def verify_brand(conn, brand: str, counts: Dict[str, int]) -> List[str]:
+    """Tables whose rows were not all found in the shard"""
+    missing = []
+    for table, where, _ in COPY_STEPS:
+        shard_where = where.replace('main.', 'shard.')
+        found = conn.execute(f"SELECT COUNT(*) FROM shard.{table} WHERE {shard_where}",
+                             {'brand': brand}).fetchone()[0]
+        if found < counts[table]:
+            missing.append(f"{table} ({found}/{counts[table]})")
+    return missing
+
+
+def delete_brand(conn, brand: str):
+    """Delete a copied brand from the source (triggers drop signatures and image references)"""
+    # Steps that depend on the brand's posts run before the posts are deleted
+    for table, where, _ in reversed(COPY_STEPS):
+        if table not in ("content_signatures", "content_lsh", "post_images", "image_blobs"):
+            conn.execute(f"DELETE FROM main.{table} WHERE {where}", {'brand': brand})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split orchestrator.db into brand shards")
+    parser.add_argument("--data-path", default=None,
+                        help="Storage directory containing orchestrator.db (defaults to the app's)")
+    parser.add_argument("--sharding", default="brand", help="brand or hash:<buckets>")
+    parser.add_argument("--keep-source", action="store_true",
+                        help="Only copy: keep the rows in orchestrator.db (the app must not run sharded yet)")
+    args = parser.parse_args()
+
+    storage = StorageManager(base_path=args.data_path, mirror_mode="off", sharding=args.sharding)
+    if not storage.shards.enabled:
+        print("❌ --sharding must be 'brand' or 'hash:<buckets>'")
+        sys.exit(1)
+
+    conn = sqlite3.connect(str(storage.db_path), timeout=60, isolation_level=None)
+    brands = list_brands(conn)
+    print(f"\n📦 Splitting {storage.db_path} into {args.sharding} shards ({len(brands)} brands)")
+
+    failed = []
+    for brand in brands:
+        shard = storage.shards.shard_for(brand)
+        storage.shards.pool(shard)  # creates and migrates the shard file
+        conn.execute("ATTACH DATABASE ? AS shard", (str(storage.shards.path_for(shard)),))
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            counts = copy_brand(conn, brand)
+            missing = verify_brand(conn, brand, counts)
+            if missing:
+                conn.execute("ROLLBACK")
+                failed.append(brand)
+                print(f"❌ {brand} -> {shard}: missing rows in {', '.join(missing)}")
+                continue
+
+            if not args.keep_source:
+                delete_brand(conn, brand)
+            conn.execute("COMMIT")
+            moved = ', '.join(f"{table}={count}" for table, count in counts.items() if count)
+            print(f"✅ {brand} -> {shard}: {moved or 'no rows'}")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.execute("DETACH DATABASE shard")
+
+    conn.close()
+    storage.close()
+
+    if failed:
+        print(f"\n❌ {len(failed)} brands were not migrated: {', '.join(failed)}")
+        sys.exit(1)
+
+    if args.keep_source:
+        print(f"\n✅ {len(brands)} brands copied; the source rows are kept in {storage.db_path}")
+        print(f"⚠️  Do not start the app with STORAGE_SHARDING={args.sharding} yet: every brand's rows")
+        print("   would be read from both its shard and the default one. Rerun without --keep-source first.")
+        return
+
+    print(f"\n✅ {len(brands)} brands moved; unbranded data stays in {DEFAULT_SHARD} shard")
+    print(f"   Start the app with STORAGE_SHARDING={args.sharding}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Apply the retention policies once, or run the one-off database maintenance
+
+The API already applies the retention policies daily (RetentionScheduler);
+this script runs them on demand. --convert-auto-vacuum switches databases
+created before incremental auto-vacuum to it, so retention can return freed
+pages to the filesystem: it runs a full VACUUM of every shard, which rewrites
+the file under an exclusive lock, so stop the API and any orchestration jobs
+first.
+
+Examples:
+    python run_retention.py --days 60
+    python run_retention.py --convert-auto-vacuum
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent))
+
+from agents.storage import StorageManager
+from agents.retention import RetentionEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply the retention policies or convert databases")
+    parser.add_argument("--days", type=int, default=None,
+                        help="Days of data to keep for every non-fixed policy (defaults to each policy's)")
+    parser.add_argument("--convert-auto-vacuum", action="store_true",
+                        help="Only convert the databases to incremental auto-vacuum (full VACUUM)")
+    parser.add_argument("--data-path", default=None,
+                        help="Storage directory containing orchestrator.db (defaults to the app's)")
+    parser.add_argument("--sharding", default=None,
+                        help="Storage layout the app runs with (defaults to STORAGE_SHARDING)")
+    args = parser.parse_args()
+
+    storage = StorageManager(base_path=args.data_path, mirror_mode="off", sharding=args.sharding)
+    engine = RetentionEngine(storage)
+
+    try:
+        if args.convert_auto_vacuum:
+            print(f"\n🧹 Converting {storage.base_path} to incremental auto-vacuum")
+            converted = engine.convert_auto_vacuum()
+            if converted:
+                print(f"✅ Converted {len(converted)} databases: {', '.join(converted)}")
+            else:
+                print("✅ Every database already uses incremental auto-vacuum")
+            return
+
+        print(f"\n🧹 Applying retention policies to {storage.base_path}")
+        stats = engine.run(days_to_keep=args.days)
+        for key, value in stats.items():
+            if value:
+                print(f"   {key}: {value}")
+        print("✅ Retention run completed")
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,37 @@ apiClient.interceptors.response.use(
   }
 );
 
+// Suivi des jobs en arrière-plan (génération de stratégie, exécutions de l'orchestrateur)
+const JOB_POLL_INTERVAL_MS = 1000;
+const JOB_POLL_TIMEOUT_MS = 10 * 60 * 1000;
+const FINISHED_JOB_STATUSES = ['succeeded', 'failed', 'cancelled'];
+
+interface JobState {
+  status: string;
+  error?: string | null;
+  result?: any;
+}
+
+// Interroge statusUrl jusqu'à la fin du job et retourne son état final
+// (select extrait le job de la réponse, ex. { job } ou { run })
+async function waitForJob<T extends JobState>(statusUrl: string, select: (data: any) => T): Promise<T> {
+  const deadline = Date.now() + JOB_POLL_TIMEOUT_MS;
+  for (;;) {
+    const response = await apiClient.get(statusUrl);
+    const job = select(response.data);
+    if (FINISHED_JOB_STATUSES.includes(job.status)) {
+      if (job.status !== 'succeeded') {
+        throw new Error(job.error || `Job ${job.status}`);
+      }
+      return job;
+    }
+    if (Date.now() >= deadline) {
+      throw new Error('Le traitement prend trop de temps, réessayez plus tard');
+    }
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
+}
+
 // Types basés sur les modèles backend
 export interface BrandInfo {
   brand_name: string;
@@ -143,9 +174,10 @@ export const apiService = {
   // Strategy endpoints
   async generateStrategy(data: StrategyRequest): Promise<any> {
     const response = await apiClient.post('/strategy/generate', data);
-    // Le backend retourne un résumé, pas le plan complet
-    // Il faut ensuite récupérer le plan via getActiveStrategy
+    // Le backend met la génération en file (202) et retourne { job_id, status_url, events_url }
+    // Il faut attendre la fin du job puis récupérer le plan via getActiveStrategy
     if (response.data.success) {
+      await waitForJob(response.data.status_url, (body) => body.job);
       // Récupérer le plan complet après génération
       const plan = await this.getActiveStrategy(data.brand_name);
       return plan;
@@ -172,7 +204,9 @@ export const apiService = {
   // Orchestrator endpoints
   async executeDailyOrchestration(data: OrchestratorRequest): Promise<PostingResult[]> {
     const response = await apiClient.post('/orchestrator/daily', data);
-    return transformOrchestrationResponse(response.data);
+    // Le backend met l'exécution en file (202) et retourne { run_id, status_url, cancel_url }
+    const run = await waitForJob(response.data.status_url, (body) => body.run);
+    return transformOrchestrationResponse(run.result);
   },
 
   async getOrchestratorStatus() {
@@ -182,7 +216,8 @@ export const apiService = {
 
   async retryPost(date: string, platform: string): Promise<PostingResult> {
     const response = await apiClient.post(`/orchestrator/retry/${date}/${platform}`);
-    return response.data;
+    const run = await waitForJob(response.data.status_url, (body) => body.run);
+    return run.result;
   },
 
   // Analytics endpoints
@@ -262,7 +297,8 @@ export const apiService = {
       : `/orchestrator/retry/${date}/${platform}`;
 
     const response = await apiClient.post(url);
-    return response.data;
+    const run = await waitForJob(response.data.status_url, (body) => body.run);
+    return run.result;
   }
 };
 